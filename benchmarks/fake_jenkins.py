@@ -0,0 +1,858 @@
+"""Lightweight, in-process stand-in for a Jenkins master used by benchmarks and load tests
+
+The server exposes the subset of the Jenkins REST API used by PyJen, backed by a generated
+data model of configurable size, so concurrency and caching features can be exercised against
+masters with thousands of jobs without launching a real Jenkins instance. The following
+endpoints are supported for the dashboard, views, jobs, builds and nodes:
+
+* ``api/python`` and ``api/json``, including ``tree`` projections with ``{m,n}`` ranges
+* ``config.xml`` for jobs and views (GET and POST)
+* ``consoleText`` and ``logText/progressiveText`` for builds
+* ``build``, ``enable``, ``disable``, ``doDelete``, ``createItem``, ``createView``,
+  ``quietDown``, ``cancelQuietDown`` and ``toggleOffline``
+* ``crumbIssuer/api/python`` and ``crumbIssuer/api/json``, when CSRF protection is enabled.
+  Like Jenkins 2.176.2 and newer, crumbs are only valid within the web session they were
+  issued to, as identified by the ``JSESSIONID`` cookie.
+
+Like Jenkins, large responses are gzip compressed for clients which accept it. Latency and
+error responses may be injected to simulate a slow or overloaded master.
+
+**Example:** ::
+
+    from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel
+    from pyjen.jenkins import Jenkins
+
+    with FakeJenkinsServer(JenkinsModel(num_jobs=10000), latency=0.02) as server:
+        jenkins = Jenkins.easy_connect(server.url)
+        print(len(jenkins.all_job_names))
+
+The server can also be run stand alone ::
+
+    python -m benchmarks.fake_jenkins --jobs 10000 --port 8080
+"""
+from __future__ import print_function
+import argparse
+import gzip
+import io
+import json
+import random
+import threading
+import time
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlparse, parse_qs, unquote
+
+# Version of Jenkins reported by the fake server
+JENKINS_VERSION = "2.60.3"
+
+# Name of the HTTP header carrying the CSRF crumb
+CRUMB_FIELD = "Jenkins-Crumb"
+
+# Name of the cookie identifying the web session of a client
+SESSION_COOKIE = "JSESSIONID"
+
+# Size, in bytes, above which responses are compressed for clients which accept it
+MIN_COMPRESS_SIZE = 1024
+
+# Configuration file used for all generated jobs
+JOB_CONFIG_XML = "<?xml version='1.0' encoding='UTF-8'?>\n" \
+                 "<project><description></description><keepDependencies>false</keepDependencies>" \
+                 "<properties/><scm class=\"hudson.scm.NullSCM\"/><canRoam>true</canRoam>" \
+                 "<disabled>false</disabled><triggers/><concurrentBuild>false</concurrentBuild>" \
+                 "<builders/><publishers/><buildWrappers/></project>"
+
+# Names of the build references exposed by each job
+PERMALINKS = ("lastBuild", "lastCompletedBuild", "lastSuccessfulBuild", "lastFailedBuild",
+              "lastUnsuccessfulBuild", "lastStableBuild")
+
+
+class Entity(dict):
+    """API data for a Jenkins entity, such as a job or build
+
+    When an entity is nested inside the API data for another entity, and no tree projection
+    has been requested, only the properties named in :py:attr:`summary` are returned. This
+    mirrors the behavior of the Jenkins REST API at its default depth.
+    """
+    summary = ("_class", "name", "url")
+
+
+class JobEntity(Entity):
+    """API data for a Jenkins job"""
+    summary = ("_class", "name", "url", "color")
+
+
+class BuildEntity(Entity):
+    """API data for a Jenkins build"""
+    summary = ("_class", "number", "url")
+
+
+def parse_tree(tree):
+    """Parses a Jenkins 'tree' query parameter
+
+    :param str tree: the query to parse, such as ``jobs[name,builds[number]{0,5}]``
+    :returns:
+        mapping of property names to 2-tuples containing the parsed sub-tree for the
+        property, or None if no sub-tree was given, and the (start, end) range to select
+        from the property, or None if no range was given
+    :rtype: :class:`dict`
+    """
+    retval, _ = _parse_tree(tree, 0)
+    return retval
+
+
+def _parse_tree(tree, pos):
+    """Parses a comma separated list of properties from a Jenkins 'tree' query
+
+    :param str tree: the query to parse
+    :param int pos: offset within the query to start parsing from
+    :returns: the parsed properties and the offset of the first character not parsed
+    :rtype: :class:`tuple`
+    """
+    retval = {}
+    name = ""
+    subtree = None
+    selection = None
+    while pos < len(tree):
+        char = tree[pos]
+        if char == "[":
+            subtree, pos = _parse_tree(tree, pos + 1)
+        elif char == "{":
+            end = tree.index("}", pos)
+            bounds = tree[pos + 1:end].split(",")
+            start = int(bounds[0]) if bounds[0] else 0
+            stop = int(bounds[1]) if len(bounds) > 1 and bounds[1] else None
+            selection = (start, stop if len(bounds) > 1 else start + 1)
+            pos = end
+        elif char == "]":
+            break
+        elif char == ",":
+            if name:
+                retval[name] = (subtree, selection)
+            name, subtree, selection = "", None, None
+        else:
+            name += char
+        pos += 1
+    if name:
+        retval[name] = (subtree, selection)
+    return retval, pos
+
+
+def render(value, tree=None, nested=False):
+    """Generates the API data for a value, as the Jenkins REST API would return it
+
+    :param value: the data to render
+    :param dict tree: parsed tree projection, as generated by :py:func:`parse_tree`, or None
+    :param bool nested: True if the value is nested within another entity
+    :returns: the API data with any projection applied
+    """
+    if isinstance(value, list):
+        return [render(i, tree, nested) for i in value]
+    if not isinstance(value, dict):
+        return value
+
+    if tree is None:
+        keys = value.summary if nested and isinstance(value, Entity) else value.keys()
+        return dict((k, render(value[k], None, True)) for k in keys if k in value)
+
+    retval = {}
+    if "_class" in value:
+        retval["_class"] = value["_class"]
+    for key, (subtree, selection) in tree.items():
+        if key not in value:
+            continue
+        data = value[key]
+        if selection is not None and isinstance(data, list):
+            data = data[selection[0]:selection[1]]
+        retval[key] = render(data, subtree, True)
+    return retval
+
+
+class JenkinsModel(object):
+    """Generated data describing the jobs, builds, views and nodes managed by a Jenkins master"""
+
+    def __init__(self, num_jobs=100, builds_per_job=10, num_views=5, num_nodes=10, executors_per_node=2,
+                 console_lines=100, url="http://localhost:8080/", seed=0):
+        """
+        :param int num_jobs: number of jobs to generate
+        :param int builds_per_job: number of builds to generate for each job
+        :param int num_views: number of list views to generate, in addition to the 'all' view
+        :param int num_nodes: number of build agents to generate, in addition to the master node
+        :param int executors_per_node: number of executors on each node
+        :param int console_lines: number of lines of console output generated for each build
+        :param str url: root URL reported for the master in the generated API data
+        :param int seed: seed for the random number generator used to generate the model
+        """
+        self.lock = threading.RLock()
+        self.quieting_down = False
+        self._console_lines = console_lines
+        self._random = random.Random(seed)
+        self._executors_per_node = executors_per_node
+        self.jobs = {}
+        self.job_order = []
+        self.builds = {}
+        self.configs = {}
+        self.views = {}
+        self.view_configs = {}
+        self.nodes = {}
+        self.url = url
+
+        for i in range(num_jobs):
+            self.add_job("job{0:05d}".format(i), JOB_CONFIG_XML, builds_per_job)
+
+        self.add_view("all", "hudson.model.AllView")
+        for i in range(num_views):
+            view_name = "view{0}".format(i)
+            self.add_view(view_name, "hudson.model.ListView")
+            self.views[view_name]["jobs"] = [self.jobs[j] for j in self.job_order[i::max(num_views, 1)]]
+
+        self.add_node("master", executors_per_node)
+        for i in range(num_nodes):
+            self.add_node("agent{0}".format(i), executors_per_node)
+
+    def set_url(self, url):
+        """Changes the root URL reported in the generated API data
+
+        :param str url: the new root URL
+        """
+        with self.lock:
+            old_url = self.url
+            self.url = url.rstrip("/") + "/"
+            for collection in (self.jobs.values(), self.views.values(), self.builds.values()):
+                for entity in collection:
+                    entity["url"] = self.url + entity["url"][len(old_url):]
+
+    def _build_data(self, job_name, number, building=False):
+        """Generates the API data for a single build
+
+        :param str job_name: name of the job the build belongs to
+        :param int number: build number
+        :param bool building: True if the build is still running
+        :rtype: :class:`BuildEntity`
+        """
+        result = None if building else self._random.choice(["SUCCESS"] * 8 + ["FAILURE", "UNSTABLE"])
+        return BuildEntity(
+            _class="hudson.model.FreeStyleBuild",
+            number=number,
+            id=str(number),
+            url="{0}job/{1}/{2}/".format(self.url, job_name, number),
+            displayName="#{0}".format(number),
+            fullDisplayName="{0} #{1}".format(job_name, number),
+            building=building,
+            result=result,
+            timestamp=int((time.time() - 3600 * (100 - number)) * 1000),
+            duration=0 if building else self._random.randint(1000, 600000),
+            estimatedDuration=60000,
+            description=None,
+            builtOn="",
+            artifacts=[],
+            changeSet={"items": [], "kind": None},
+        )
+
+    def _update_job(self, job):
+        """Updates the summary properties of a job to reflect the state of its builds
+
+        :param JobEntity job: the job to update
+        """
+        builds = job["builds"]
+        completed = [b for b in builds if not b["building"]]
+
+        def first(items, results):
+            """Gets the most recent build with one of a given set of results"""
+            for cur_build in items:
+                if cur_build["result"] in results:
+                    return cur_build
+            return None
+
+        job["allBuilds"] = builds
+        job["firstBuild"] = builds[-1] if builds else None
+        job["lastBuild"] = builds[0] if builds else None
+        job["lastCompletedBuild"] = completed[0] if completed else None
+        job["lastSuccessfulBuild"] = first(completed, ("SUCCESS", "UNSTABLE"))
+        job["lastStableBuild"] = first(completed, ("SUCCESS",))
+        job["lastFailedBuild"] = first(completed, ("FAILURE",))
+        job["lastUnsuccessfulBuild"] = first(completed, ("FAILURE", "UNSTABLE", "ABORTED"))
+        job["nextBuildNumber"] = builds[0]["number"] + 1 if builds else 1
+
+        last = job["lastCompletedBuild"]
+        if job["disabled"]:
+            color = "disabled"
+        elif last is None:
+            color = "notbuilt"
+        else:
+            color = {"SUCCESS": "blue", "UNSTABLE": "yellow"}.get(last["result"], "red")
+        if builds and builds[0]["building"] and not job["disabled"]:
+            color += "_anime"
+        job["color"] = color
+        job["buildable"] = not job["disabled"]
+        score = 100 * len([b for b in completed[:5] if b["result"] == "SUCCESS"]) // max(len(completed[:5]), 1)
+        job["healthReport"] = [{"score": score, "description": "Build stability"}]
+
+    def add_job(self, job_name, config_xml, num_builds=0):
+        """Adds a new job to the model
+
+        :param str job_name: name of the new job
+        :param str config_xml: configuration of the new job
+        :param int num_builds: number of builds to generate for the job
+        :rtype: :class:`JobEntity`
+        """
+        with self.lock:
+            job = JobEntity(
+                _class="hudson.model.FreeStyleProject",
+                name=job_name,
+                displayName=job_name,
+                fullName=job_name,
+                url="{0}job/{1}/".format(self.url, job_name),
+                description="",
+                disabled="<disabled>true</disabled>" in config_xml,
+                inQueue=False,
+                upstreamProjects=[],
+                downstreamProjects=[],
+            )
+            builds = []
+            for number in range(1, num_builds + 1):
+                building = number == num_builds and self._random.random() < 0.1
+                builds.insert(0, self._build_data(job_name, number, building))
+            job["builds"] = builds
+            for cur_build in builds:
+                self.builds[(job_name, cur_build["number"])] = cur_build
+            self._update_job(job)
+            self.jobs[job_name] = job
+            self.job_order.append(job_name)
+            self.configs[job_name] = config_xml
+            if "all" in self.views:
+                self.views["all"]["jobs"].append(job)
+            return job
+
+    def delete_job(self, job_name):
+        """Removes a job from the model
+
+        :param str job_name: name of the job to remove
+        """
+        with self.lock:
+            job = self.jobs.pop(job_name)
+            self.job_order.remove(job_name)
+            del self.configs[job_name]
+            for cur_build in job["builds"]:
+                del self.builds[(job_name, cur_build["number"])]
+            for view in self.views.values():
+                view["jobs"] = [j for j in view["jobs"] if j is not job]
+
+    def start_build(self, job_name):
+        """Adds a new, completed build to a job
+
+        :param str job_name: name of the job to build
+        :rtype: :class:`BuildEntity`
+        """
+        with self.lock:
+            job = self.jobs[job_name]
+            new_build = self._build_data(job_name, job["nextBuildNumber"])
+            job["builds"].insert(0, new_build)
+            self.builds[(job_name, new_build["number"])] = new_build
+            self._update_job(job)
+            return new_build
+
+    def set_disabled(self, job_name, disabled):
+        """Enables or disables a job
+
+        :param str job_name: name of the job to update
+        :param bool disabled: True to disable the job, False to enable it
+        """
+        with self.lock:
+            job = self.jobs[job_name]
+            job["disabled"] = disabled
+            self._update_job(job)
+
+    def add_view(self, view_name, class_name):
+        """Adds a new, empty view to the model
+
+        :param str view_name: name of the new view
+        :param str class_name: Java class of the new view, such as 'hudson.model.ListView'
+        :returns: the API data for the new view
+        :rtype: :class:`Entity`
+        """
+        with self.lock:
+            jobs = [self.jobs[j] for j in self.job_order] if class_name == "hudson.model.AllView" else []
+            # As with a real master, the 'all' view is presented as the dashboard itself
+            if class_name == "hudson.model.AllView":
+                url = self.url
+            else:
+                url = "{0}view/{1}/".format(self.url, view_name)
+            view = Entity(_class=class_name, name=view_name, url=url, description=None, jobs=jobs)
+            self.views[view_name] = view
+            self.view_configs[view_name] = "<?xml version='1.0' encoding='UTF-8'?>\n" \
+                                           "<{0}><name>{1}</name></{0}>".format(class_name, view_name)
+            return view
+
+    def add_node(self, node_name, num_executors):
+        """Adds a new, idle build agent to the model
+
+        :param str node_name: name of the new node
+        :param int num_executors: number of executors on the node
+        """
+        with self.lock:
+            self.nodes[node_name] = {
+                "_class": "hudson.model.Hudson$MasterComputer" if node_name == "master"
+                          else "hudson.slaves.SlaveComputer",
+                "displayName": node_name,
+                "offline": False,
+                "temporarilyOffline": False,
+                "offlineCauseReason": "",
+                "idle": True,
+                "numExecutors": num_executors,
+                "executors": [{"idle": True} for _ in range(num_executors)],
+                "assignedLabels": [{"name": node_name}, {"name": "linux" if len(self.nodes) % 2 else "windows"}],
+            }
+
+    def toggle_offline(self, node_name, message):
+        """Toggles the online state of a node
+
+        :param str node_name: name of the node to toggle
+        :param str message: reason for taking the node offline
+        """
+        with self.lock:
+            node = self.nodes[node_name]
+            offline = not node["temporarilyOffline"]
+            node["temporarilyOffline"] = offline
+            node["offline"] = offline
+            node["offlineCauseReason"] = (message or "") if offline else ""
+
+    def console_text(self, job_name, number):
+        """Generates the console output for a build
+
+        :param str job_name: name of the job the build belongs to
+        :param int number: the build number
+        :rtype: :class:`str`
+        """
+        build = self.builds[(job_name, number)]
+        lines = ["Started by user admin"]
+        lines += ["[{0}] step {1} of build {2}".format(job_name, i, number) for i in range(self._console_lines)]
+        if not build["building"]:
+            lines.append("Finished: " + build["result"])
+        return "\n".join(lines) + "\n"
+
+    def root_data(self):
+        """Generates the API data for the dashboard
+
+        :rtype: :class:`dict`
+        """
+        with self.lock:
+            return {
+                "_class": "hudson.model.Hudson",
+                "url": self.url,
+                "nodeName": "",
+                "quietingDown": self.quieting_down,
+                "numExecutors": self._executors_per_node,
+                "jobs": [self.jobs[j] for j in self.job_order],
+                "views": list(self.views.values()),
+                "primaryView": self.views["all"],
+            }
+
+    def computer_data(self):
+        """Generates the API data for the set of all nodes
+
+        :rtype: :class:`dict`
+        """
+        with self.lock:
+            computers = list(self.nodes.values())
+            total = sum(i["numExecutors"] for i in computers)
+            busy = sum(len([e for e in i["executors"] if not e["idle"]]) for i in computers)
+            return {"_class": "hudson.model.ComputerSet", "displayName": "Nodes", "busyExecutors": busy,
+                    "totalExecutors": total, "computer": computers}
+
+
+class FakeJenkinsHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Processes HTTP requests sent to a :class:`FakeJenkinsServer`"""
+
+    # HTTP/1.1 allows clients to reuse connections between requests
+    protocol_version = "HTTP/1.1"
+
+    # Headers and body are written separately, so avoid delaying the body of each response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        pass
+
+    def do_GET(self):  # pylint: disable=C0103
+        self._process("GET")
+
+    def do_HEAD(self):  # pylint: disable=C0103
+        self._process("HEAD")
+
+    def do_POST(self):  # pylint: disable=C0103
+        self._process("POST")
+
+    def _process(self, method):
+        """Dispatches a request to the appropriate handler, applying any configured faults
+
+        :param str method: HTTP method of the request
+        """
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        server.record_request(method, self.path)
+
+        delay = server.next_latency()
+        if delay:
+            time.sleep(delay)
+        if server.next_error():
+            self._send(server.error_status, "Injected failure", "text/plain", method == "HEAD")
+            return
+
+        parsed = urlparse(self.path)
+        query = dict((k, v[0]) for k, v in parse_qs(parsed.query).items())
+        parts = [unquote(i) for i in parsed.path.split("/") if i]
+        crumb = server.crumb
+        if crumb is not None:
+            session = self._session()
+            if parts[:1] == ["crumbIssuer"] and method != "POST":
+                headers = None
+                if session is None:
+                    session = server.new_session()
+                    headers = {"Set-Cookie": "{0}={1}; Path=/".format(SESSION_COOKIE, session)}
+                data = {"_class": "hudson.security.csrf.DefaultCrumbIssuer", "crumb": crumb + "-" + session,
+                        "crumbRequestField": CRUMB_FIELD}
+                if parts[-1:] == ["json"]:
+                    self._send(200, json.dumps(data), "application/json", method == "HEAD", headers)
+                else:
+                    self._send(200, repr(data), "text/x-python", method == "HEAD", headers)
+                return
+            if method == "POST" and (session is None or self.headers.get(CRUMB_FIELD) != crumb + "-" + session):
+                self._send(403, "No valid crumb was included in the request", "text/plain")
+                return
+        try:
+            with server.model.lock:
+                kind, target, remainder = self._resolve(server.model, parts)
+                if method == "POST":
+                    self._post(server.model, kind, target, remainder, query, body)
+                else:
+                    self._get(server.model, kind, target, remainder, query, method == "HEAD")
+        except KeyError:
+            self._send(404, "Not found", "text/plain", method == "HEAD")
+
+    @staticmethod
+    def _resolve(model, parts):
+        """Locates the entity referred to by a URL path
+
+        :param JenkinsModel model: the data model to search
+        :param list parts: the components of the URL path
+        :returns:
+            3-tuple containing the kind of entity found, one of 'root', 'view', 'job', 'build',
+            'computers' or 'node', an identifier for the entity and the unprocessed path components
+        :rtype: :class:`tuple`
+        """
+        kind, target = "root", None
+        pos = 0
+        while pos < len(parts):
+            part = parts[pos]
+            if part == "job" and kind in ("root", "view") and pos + 1 < len(parts):
+                kind, target = "job", parts[pos + 1]
+                model.jobs[target]  # pylint: disable=W0104
+                pos += 2
+            elif part == "view" and kind in ("root", "view") and pos + 1 < len(parts):
+                kind, target = "view", parts[pos + 1]
+                model.views[target]  # pylint: disable=W0104
+                pos += 2
+            elif part == "computer" and kind == "root":
+                kind = "computers"
+                pos += 1
+            elif kind == "computers" and part not in ("api",):
+                name = "master" if part == "(master)" else part
+                model.nodes[name]  # pylint: disable=W0104
+                kind, target = "node", name
+                pos += 1
+            elif kind == "job" and (part.isdigit() or part in PERMALINKS):
+                job = model.jobs[target]
+                build = job[part] if part in PERMALINKS else model.builds[(target, int(part))]
+                if build is None:
+                    raise KeyError(part)
+                kind, target = "build", (target, build["number"])
+                pos += 1
+            else:
+                break
+        return kind, target, parts[pos:]
+
+    def _get(self, model, kind, target, remainder, query, head_only):
+        """Processes a GET or HEAD request
+
+        :param JenkinsModel model: the data model to query
+        :param str kind: kind of entity the request refers to
+        :param target: identifier of the entity the request refers to
+        :param list remainder: URL path components following the entity
+        :param dict query: query parameters of the request
+        :param bool head_only: True if the response body should be omitted
+        """
+        if remainder[:1] == ["api"] and len(remainder) == 2 and remainder[1] in ("python", "json"):
+            data = {"root": model.root_data,
+                    "computers": model.computer_data,
+                    "view": lambda: model.views[target],
+                    "job": lambda: model.jobs[target],
+                    "build": lambda: model.builds[target],
+                    "node": lambda: model.nodes[target]}[kind]()
+            tree = parse_tree(query["tree"]) if "tree" in query else None
+            rendered = render(data, tree)
+            if remainder[1] == "json":
+                self._send(200, json.dumps(rendered), "application/json", head_only)
+            else:
+                self._send(200, repr(rendered), "text/x-python", head_only)
+        elif remainder == ["config.xml"] and kind == "job":
+            self._send(200, model.configs[target], "application/xml", head_only)
+        elif remainder == ["config.xml"] and kind == "view":
+            self._send(200, model.view_configs[target], "application/xml", head_only)
+        elif remainder == ["consoleText"] and kind == "build":
+            self._send(200, model.console_text(*target), "text/plain", head_only)
+        elif remainder == ["logText", "progressiveText"] and kind == "build":
+            text = model.console_text(*target)
+            start = int(query.get("start", 0))
+            headers = {"X-Text-Size": str(len(text))}
+            if model.builds[target]["building"]:
+                headers["X-More-Data"] = "true"
+            self._send(200, text[start:], "text/plain", head_only, headers)
+        elif not remainder:
+            self._send(200, "<html><body>Jenkins</body></html>", "text/html", head_only)
+        else:
+            raise KeyError("/".join(remainder))
+
+    def _post(self, model, kind, target, remainder, query, body):
+        """Processes a POST request
+
+        :param JenkinsModel model: the data model to update
+        :param str kind: kind of entity the request refers to
+        :param target: identifier of the entity the request refers to
+        :param list remainder: URL path components following the entity
+        :param dict query: query parameters of the request
+        :param bytes body: content of the request
+        """
+        action = "/".join(remainder)
+        if kind == "job" and action == "config.xml":
+            model.configs[target] = body.decode("utf-8")
+        elif kind == "view" and action == "config.xml":
+            model.view_configs[target] = body.decode("utf-8")
+        elif kind == "job" and action == "build":
+            model.start_build(target)
+        elif kind == "job" and action in ("enable", "disable"):
+            model.set_disabled(target, action == "disable")
+        elif kind == "job" and action == "doDelete":
+            model.delete_job(target)
+        elif kind == "view" and action == "doDelete":
+            del model.views[target]
+            del model.view_configs[target]
+        elif kind == "node" and action == "toggleOffline":
+            model.toggle_offline(target, query.get("offlineMessage"))
+        elif kind == "root" and action == "createItem":
+            if query.get("mode") == "copy":
+                config = model.configs[query["from"]]
+            else:
+                config = body.decode("utf-8")
+            model.add_job(query["name"], config)
+        elif kind == "root" and action == "createView":
+            form = dict((k, v[0]) for k, v in parse_qs(body.decode("utf-8")).items())
+            model.add_view(form["name"], form["mode"])
+        elif kind == "root" and action in ("quietDown", "cancelQuietDown"):
+            model.quieting_down = action == "quietDown"
+        else:
+            raise KeyError(action)
+        self._send(200, "", "text/plain")
+
+    def _session(self):
+        """Gets the web session the request belongs to
+
+        :returns: the ID of the session, or None if the request is not part of a session
+        :rtype: :class:`str`
+        """
+        for cookie in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == SESSION_COOKIE and value:
+                return value
+        return None
+
+    def _send(self, status, text, content_type, head_only=False, headers=None):
+        """Sends a response to the client
+
+        :param int status: HTTP status code of the response
+        :param str text: content of the response
+        :param str content_type: MIME type of the response
+        :param bool head_only: True if the response body should be omitted
+        :param dict headers: optional additional headers to include in the response
+        """
+        data = text.encode("utf-8")
+        compress = len(data) >= MIN_COMPRESS_SIZE and "gzip" in self.headers.get("Accept-Encoding", "")
+        if compress:
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=1) as gz:
+                gz.write(data)
+            data = buf.getvalue()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + ";charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("X-Jenkins", JENKINS_VERSION)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(data)
+
+
+class FakeJenkinsServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """HTTP server simulating a Jenkins master, running in a background thread
+
+    Each request is processed in its own thread, so the server can be used to benchmark
+    concurrent clients. The server may be used as a context manager, which starts it on entry
+    and stops it on exit.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, model=None, latency=0.0, latency_jitter=0.0, error_rate=0.0, error_status=503,
+                 host="127.0.0.1", port=0, seed=0, crumb=None):
+        """
+        :param JenkinsModel model: data served by the fake master. Defaults to a small generated model.
+        :param float latency: time, in seconds, to delay each response by
+        :param float latency_jitter: maximum random time, in seconds, added to the delay of each response
+        :param float error_rate: fraction of requests, between 0 and 1, which fail with an error response
+        :param int error_status: HTTP status code returned by failed requests
+        :param str host: network interface to listen on
+        :param int port: port to listen on. Defaults to an arbitrary free port.
+        :param int seed: seed for the random number generator used to inject faults
+        :param str crumb:
+            CSRF crumb from which the crumb of each web session is derived, or None to disable CSRF
+            protection. May be changed while the server is running to simulate crumbs expiring.
+        """
+        BaseHTTPServer.HTTPServer.__init__(self, (host, port), FakeJenkinsHandler)
+        self.model = model if model is not None else JenkinsModel()
+        self.model.set_url(self.url)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.crumb = crumb
+        self._random = random.Random(seed)
+        self._fail_next = 0
+        self._num_sessions = 0
+        self._lock = threading.Lock()
+        self._requests = []
+        self._thread = None
+
+    @property
+    def url(self):
+        """Gets the root URL of the fake master
+
+        :rtype: :class:`str`
+        """
+        host, port = self.server_address[:2]
+        return "http://{0}:{1}/".format(host, port)
+
+    @property
+    def requests(self):
+        """Gets the requests processed so far
+
+        :returns: list of 2-tuples containing the HTTP method and path of each request
+        :rtype: :class:`list` of :class:`tuple`
+        """
+        with self._lock:
+            return list(self._requests)
+
+    def reset_requests(self):
+        """Discards the record of the requests processed so far"""
+        with self._lock:
+            self._requests = []
+
+    def record_request(self, method, path):
+        """Records a request received by the server
+
+        :param str method: HTTP method of the request
+        :param str path: path and query string of the request
+        """
+        with self._lock:
+            self._requests.append((method, path))
+
+    def new_session(self):
+        """Starts a new web session
+
+        :returns: the ID of the session
+        :rtype: :class:`str`
+        """
+        with self._lock:
+            self._num_sessions += 1
+            return "session{0}".format(self._num_sessions)
+
+    def fail_next(self, count=1):
+        """Forces the next few requests to fail, regardless of the configured error rate
+
+        :param int count: number of requests to fail
+        """
+        with self._lock:
+            self._fail_next += count
+
+    def next_latency(self):
+        """Gets the delay to apply to the next response
+
+        :rtype: :class:`float`
+        """
+        with self._lock:
+            jitter = self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0
+        return self.latency + jitter
+
+    def next_error(self):
+        """Checks whether the next response should be an injected failure
+
+        :rtype: :class:`bool`
+        """
+        with self._lock:
+            if self._fail_next:
+                self._fail_next -= 1
+                return True
+            return bool(self.error_rate) and self._random.random() < self.error_rate
+
+    def start(self):
+        """Starts processing requests in a background thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops processing requests and releases the listening socket"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def _get_args():
+    """Configures the command line parser
+
+    :returns: set of parameters provided by the user on the command line
+    """
+    parser = argparse.ArgumentParser(description="Runs a simulated Jenkins master for benchmarking PyJen")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--jobs", type=int, default=100, help="number of jobs to generate")
+    parser.add_argument("--builds", type=int, default=10, help="number of builds to generate per job")
+    parser.add_argument("--views", type=int, default=5, help="number of views to generate")
+    parser.add_argument("--nodes", type=int, default=10, help="number of nodes to generate")
+    parser.add_argument("--latency", type=float, default=0.0, help="delay, in seconds, applied to each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests which fail")
+    parser.add_argument("--crumb", help="CSRF crumb required by POST requests. Defaults to no CSRF protection.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _get_args()
+    jenkins_model = JenkinsModel(num_jobs=args.jobs, builds_per_job=args.builds, num_views=args.views,
+                                 num_nodes=args.nodes)
+    server = FakeJenkinsServer(jenkins_model, latency=args.latency, error_rate=args.error_rate, port=args.port,
+                               crumb=args.crumb)
+    print("Fake Jenkins master listening on " + server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
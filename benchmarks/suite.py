@@ -0,0 +1,367 @@
+"""Benchmark suite covering the most frequently used, and most expensive, PyJen operations
+
+Each benchmark is run against a :class:`~benchmarks.fake_jenkins.FakeJenkinsServer` populated
+with a generated model of the requested size, so results are reproducible and no network access
+is required. For every operation and size the suite records:
+
+* wall time, as the minimum, median and mean of several repetitions
+* the number of HTTP requests issued, as reported by :class:`~pyjen.utils.metrics.RequestMetrics`
+* the number of bytes transferred
+* peak memory allocated by Python while running the operation, when :mod:`tracemalloc` is available
+
+Results are written as JSON so separate runs can be compared. The traffic generated by the
+suite may also be recorded to a cassette and replayed later, which removes the cost of the
+fake server from the measurements.
+
+Usage ::
+
+    python -m benchmarks.suite --sizes 10 100 1000 10000 --output after.json
+    python -m benchmarks.suite --output after.json --compare before.json
+    python -m benchmarks.suite --record suite.cassette
+    python -m benchmarks.suite --replay suite.cassette
+"""
+from __future__ import print_function, division
+import argparse
+import json
+import platform
+import time
+from datetime import datetime, timedelta
+import pyjen
+from pyjen.build import Build
+from pyjen.jenkins import Jenkins
+from pyjen.job import Job
+from pyjen.plugins.allview import AllView
+from pyjen.utils import xmlbackend
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.jobxml import JobXML
+from pyjen.utils.metrics import RequestMetrics
+from pyjen.utils.pluginapi import find_plugin
+from pyjen.utils.transport import Cassette, RecordingTransport, ReplayTransport
+from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel, JOB_CONFIG_XML
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+# Number of jobs in the generated models used by default
+DEFAULT_SIZES = (10, 100, 1000)
+
+# Name of the job with one build per unit of benchmark size
+BIG_JOB = "big_job"
+
+# Plugin types looked up by the plugin lookup benchmark
+PLUGIN_TYPES = ("hudson.scm.NullSCM", "hudson.scm.SubversionSCM", "hudson.model.ListView", "unknown.Plugin")
+
+
+class Environment(object):
+    """Fake Jenkins master and PyJen objects used by the benchmarks for a particular size"""
+
+    def __init__(self, size, latency=0.0, cassette=None, replay=False):
+        """
+        :param int size: number of jobs to generate
+        :param float latency: time, in seconds, to delay each response by
+        :param cassette: optional cassette the traffic generated by the benchmarks is recorded to or replayed from
+        :type cassette: :class:`~pyjen.utils.transport.Cassette`
+        :param bool replay:
+            True to replay the traffic recorded in the cassette rather than
+            running the fake master, False otherwise
+        """
+        self.size = size
+        model = JenkinsModel(num_jobs=size, builds_per_job=3, num_views=max(1, size // 10), num_nodes=10,
+                             console_lines=100 * size)
+        model.add_job(BIG_JOB, JOB_CONFIG_XML, size)
+
+        # Link the jobs together as a binary tree of downstream dependencies
+        for i in range(size):
+            children = [model.jobs[model.job_order[j]] for j in (2 * i + 1, 2 * i + 2) if j < size]
+            model.jobs[model.job_order[i]]["downstreamProjects"] = children
+
+        url_key = "url:{0}".format(size)
+        if replay:
+            self.server = None
+            self.url = cassette.get_metadata(url_key)
+            if self.url is None:
+                raise ValueError("No traffic recorded for size {0}".format(size))
+            model.set_url(self.url)
+        else:
+            self.server = FakeJenkinsServer(model, latency=latency)
+            self.url = self.server.url
+            if cassette is not None:
+                cassette.set_metadata(url_key, self.url)
+        self.model = model
+        self.configs = [JOB_CONFIG_XML.encode("utf-8")] * size
+
+    def __enter__(self):
+        if self.server is not None:
+            self.server.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.server is not None:
+            self.server.stop()
+
+    def requester(self, path=""):
+        """Creates a connection to a URL on the fake master
+
+        :param str path: path relative to the root URL of the master
+        :rtype: :class:`~pyjen.utils.datarequester.DataRequester`
+        """
+        return DataRequester(self.url + path, None, None)
+
+    @property
+    def jenkins(self):
+        """Gets a connection to the dashboard of the fake master
+
+        :rtype: :class:`~pyjen.jenkins.Jenkins`
+        """
+        return Jenkins(self.requester())
+
+    def job(self, job_name):
+        """Gets a connection to a job on the fake master
+
+        :param str job_name: name of the job
+        :rtype: :class:`~pyjen.job.Job`
+        """
+        return Job._create(self.requester("job/" + job_name), self.jenkins, job_name)  # pylint: disable=W0212
+
+
+def bench_jenkins_views(env):
+    """Loads all views on the dashboard"""
+    return lambda: env.jenkins.views
+
+
+def bench_view_jobs(env):
+    """Loads all jobs in the 'all' view"""
+    view = AllView(env.requester("view/all"), env.jenkins)
+    return lambda: view.jobs
+
+
+def bench_job_all_builds(env):
+    """Loads all builds of a job with one build per unit of size"""
+    job = env.job(BIG_JOB)
+    return lambda: job.all_builds
+
+
+def bench_builds_in_time_range(env):
+    """Finds the builds of a job started within the last day"""
+    job = env.job(BIG_JOB)
+    end = datetime.now()
+    start = end - timedelta(days=1)
+    return lambda: job.get_builds_in_time_range(start, end)
+
+
+def bench_all_downstream_jobs(env):
+    """Loads the full tree of jobs triggered by the first job"""
+    job = env.job(env.model.job_order[0])
+    return lambda: job.all_downstream_jobs
+
+
+def bench_console_output(env):
+    """Loads the console output of a build, with 100 lines per unit of size, all at once"""
+    build = Build(env.requester("job/{0}/1".format(BIG_JOB)))
+    return lambda: len(build.console_output)
+
+
+def bench_iter_console_output(env):
+    """Streams the console output of a build, with 100 lines per unit of size"""
+    build = Build(env.requester("job/{0}/1".format(BIG_JOB)))
+    return lambda: sum(len(i) for i in build.iter_console_output())
+
+
+def bench_jobxml_parsing(env):
+    """Parses one job configuration file per unit of size"""
+    def run():
+        for cur_config in env.configs:
+            JobXML(cur_config).scm  # pylint: disable=W0106
+    return run
+
+
+def bench_plugin_lookup(env):
+    """Looks up one plugin type per unit of size"""
+    def run():
+        for i in range(env.size):
+            find_plugin(PLUGIN_TYPES[i % len(PLUGIN_TYPES)])
+    return run
+
+
+# Benchmarks included in the suite, keyed by the name of the operation being measured
+BENCHMARKS = [
+    ("Jenkins.views", bench_jenkins_views),
+    ("View.jobs", bench_view_jobs),
+    ("Job.all_builds", bench_job_all_builds),
+    ("Job.get_builds_in_time_range", bench_builds_in_time_range),
+    ("Job.all_downstream_jobs", bench_all_downstream_jobs),
+    ("Build.console_output", bench_console_output),
+    ("Build.iter_console_output", bench_iter_console_output),
+    ("JobXML parsing", bench_jobxml_parsing),
+    ("plugin lookup", bench_plugin_lookup),
+]
+
+
+def measure(func, repeat):
+    """Measures the cost of running a benchmark
+
+    :param func: the operation to measure, taking no parameters
+    :param int repeat: number of times to time the operation
+    :returns: the measurements for the operation
+    :rtype: :class:`dict`
+    """
+    metrics = RequestMetrics()
+    DataRequester.add_observer(metrics)
+    try:
+        DataRequester.clear()
+        func()
+    finally:
+        DataRequester.remove_observer(metrics)
+    endpoints = metrics.endpoints.values()
+
+    times = []
+    for _ in range(repeat):
+        DataRequester.clear()
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    times.sort()
+
+    peak_memory = None
+    if tracemalloc is not None:
+        DataRequester.clear()
+        tracemalloc.start()
+        try:
+            func()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "wall_time": {"min": times[0], "median": times[len(times) // 2], "mean": sum(times) / len(times)},
+        "requests": metrics.network_request_count,
+        "bytes": sum(i.total_bytes for i in endpoints),
+        "peak_memory": peak_memory,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=3, names=None, latency=0.0, log=None, cassette=None, replay=False):
+    """Runs the benchmark suite
+
+    :param sizes: number of jobs in each of the generated models to benchmark against
+    :param int repeat: number of times to time each operation
+    :param names: optional list of the names of the benchmarks to run. Defaults to all benchmarks.
+    :param float latency: time, in seconds, the fake master delays each response by
+    :param log: optional callable used to report progress
+    :param cassette: optional cassette to record the generated traffic to, or replay it from
+    :type cassette: :class:`~pyjen.utils.transport.Cassette`
+    :param bool replay: True to replay the traffic recorded in the cassette, False to record it
+    :returns: JSON compatible description of the results
+    :rtype: :class:`dict`
+    """
+    if cassette is not None:
+        DataRequester.set_transport(ReplayTransport(cassette) if replay else RecordingTransport(cassette))
+    results = []
+    try:
+        for size in sizes:
+            with Environment(size, latency, cassette, replay) as env:
+                for name, factory in BENCHMARKS:
+                    if names and name not in names:
+                        continue
+                    result = measure(factory(env), repeat)
+                    result.update({"name": name, "size": size})
+                    results.append(result)
+                    if log is not None:
+                        log(format_result(result))
+    finally:
+        DataRequester.set_transport(None)
+
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "pyjen_version": pyjen.__version__,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "xml_backend": xmlbackend.get_backend(),
+            "repeat": repeat,
+            "latency": latency,
+            "replay": cassette is not None and replay,
+        },
+        "results": results,
+    }
+
+
+def format_result(result):
+    """Generates a one line summary of the results of a benchmark
+
+    :param dict result: results of a single benchmark, as generated by :py:func:`run_suite`
+    :rtype: :class:`str`
+    """
+    memory = result["peak_memory"]
+    return "{0:<30}{1:>7}{2:>10.4f}s{3:>8} req{4:>12} B{5:>12}".format(
+        result["name"], result["size"], result["wall_time"]["median"], result["requests"], result["bytes"],
+        "" if memory is None else "{0} B".format(memory))
+
+
+def compare_results(baseline, current):
+    """Compares the results of two runs of the suite
+
+    :param dict baseline: results of the earlier run, as generated by :py:func:`run_suite`
+    :param dict current: results of the later run, as generated by :py:func:`run_suite`
+    :returns:
+        one entry per benchmark present in both runs, containing the name and size of the
+        benchmark followed by the ratio of the current to the baseline median wall time,
+        request count and bytes transferred. Ratios are None where the baseline value is 0.
+    :rtype: :class:`list` of :class:`tuple`
+    """
+    def ratio(new, old):
+        """Calculates the ratio between two measurements"""
+        return new / old if old else None
+
+    old_results = dict(((i["name"], i["size"]), i) for i in baseline["results"])
+    retval = []
+    for cur in current["results"]:
+        old = old_results.get((cur["name"], cur["size"]))
+        if old is None:
+            continue
+        retval.append((cur["name"], cur["size"],
+                       ratio(cur["wall_time"]["median"], old["wall_time"]["median"]),
+                       ratio(cur["requests"], old["requests"]),
+                       ratio(cur["bytes"], old["bytes"])))
+    return retval
+
+
+def _get_args():
+    """Configures the command line parser
+
+    :returns: set of parameters provided by the user on the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks PyJen operations against a simulated Jenkins master")
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="number of jobs in each generated model")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="number of times to time each operation")
+    parser.add_argument("-b", "--benchmark", action="append", dest="names",
+                        help="name of a benchmark to run. May be repeated. Defaults to all benchmarks.")
+    parser.add_argument("-l", "--latency", type=float, default=0.0,
+                        help="time, in seconds, the fake master delays each response by")
+    parser.add_argument("-o", "--output", help="file to write the results to, in JSON format")
+    parser.add_argument("-c", "--compare", help="results of an earlier run to compare against")
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--record", help="cassette file to record the traffic generated by the suite to")
+    recording.add_argument("--replay", help="cassette file to replay previously recorded traffic from")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _get_args()
+    suite_cassette = None
+    if args.record or args.replay:
+        suite_cassette = Cassette(args.record or args.replay)
+    data = run_suite(args.sizes, args.repeat, args.names, args.latency, print, suite_cassette, bool(args.replay))
+    if args.output:
+        with open(args.output, "w") as out_file:
+            json.dump(data, out_file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as in_file:
+            previous = json.load(in_file)
+        print("\nRatio of current to baseline (time, requests, bytes):")
+        for row in compare_results(previous, data):
+            print("{0:<30}{1:>7}".format(row[0], row[1]) +
+                  "".join("{0:>10}".format("n/a" if i is None else "{0:.2f}".format(i)) for i in row[2:]))
@@ -0,0 +1,92 @@
+"""Benchmark comparing the cost of parsing Jenkins config.xml files with each XML backend
+
+Configuration files are loaded from one or more folders on disk, typically a recorded copy of
+the $JENKINS_HOME/jobs folder of a production master. Each file is parsed using every available
+XML backend, both fully via :class:`~pyjen.utils.jobxml.JobXML` and via the streaming, read-only
+extraction used for simple queries.
+
+Usage ::
+
+    python -m benchmarks.xml_parsing --repeat 20 /path/to/recorded/jobs
+"""
+from __future__ import print_function
+import argparse
+import os
+import timeit
+from pyjen.utils import xmlbackend
+from pyjen.utils.jobxml import JobXML
+
+# Folder containing the sample Jenkins configuration used by the functional tests
+DEFAULT_CONFIG_FOLDER = os.path.join(os.path.dirname(__file__), "..", "functional_tests", "jenkins_job_view")
+
+# Elements loaded by the read-only extraction benchmark
+PARTIAL_TAGS = ["scm", "assignedNode"]
+
+
+def load_configs(folders):
+    """Loads all job configuration files found under a set of folders
+
+    :param folders: list of folders to search recursively for 'config.xml' files
+    :returns: the raw contents of each job configuration file found
+    :rtype: :class:`list` of :class:`bytes`
+    """
+    retval = []
+    for folder in folders:
+        for (cur_folder, _, files) in os.walk(folder):
+            if "config.xml" not in files:
+                continue
+            with open(os.path.join(cur_folder, "config.xml"), "rb") as config_file:
+                data = config_file.read()
+            # only job configurations are of interest here
+            if xmlbackend.parse_root(data).tag == "project":
+                retval.append(data)
+    return retval
+
+
+def bench_configs(configs, repeat):
+    """Times the parsing of a set of configuration files with each available backend
+
+    :param configs: list of raw XML configurations to parse
+    :param int repeat: number of times to parse each file
+    :returns: mapping of benchmark names to the total time, in seconds, taken by each
+    :rtype: :class:`dict`
+    """
+    def full_parse():
+        for cur_config in configs:
+            JobXML(cur_config)
+
+    def partial_parse():
+        for cur_config in configs:
+            JobXML.partial(cur_config, PARTIAL_TAGS)
+
+    retval = {}
+    original_backend = xmlbackend.get_backend()
+    try:
+        for backend in xmlbackend.available_backends():
+            xmlbackend.set_backend(backend)
+            retval[backend + " full"] = timeit.timeit(full_parse, number=repeat)
+            retval[backend + " partial"] = timeit.timeit(partial_parse, number=repeat)
+    finally:
+        xmlbackend.set_backend(original_backend)
+    return retval
+
+
+def _get_args():
+    """Configures the command line parser
+
+    :returns: set of parameters provided by the user on the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the parsing of Jenkins job configuration files")
+    parser.add_argument("folders", nargs="*", default=[DEFAULT_CONFIG_FOLDER],
+                        help="folders to search recursively for config.xml files")
+    parser.add_argument("-r", "--repeat", type=int, default=100,
+                        help="number of times to parse each configuration file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _get_args()
+    all_configs = load_configs(args.folders)
+    print("Parsing {0} configuration files {1} times each".format(len(all_configs), args.repeat))
+    for name, duration in sorted(bench_configs(all_configs, args.repeat).items()):
+        print("{0:<25}{1:.4f}s".format(name, duration))
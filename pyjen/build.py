@@ -1,6 +1,8 @@
 """Primitives for interacting with Jenkins builds"""
 
 from pyjen.changeset import Changeset
+from pyjen.handles import BuildHandle
+from pyjen.utils.urls import identity_url, join_url
 from datetime import datetime
 
 
@@ -23,29 +25,33 @@ class Build(object):
         self._data_io = data_io_controller
     
     def __eq__(self, obj):
-        """Overrides the default equality operation"""
-        if isinstance(obj, Build):
-            data = self._data_io.get_api_data()
-            build_url = data['url']
-            obj_data = obj._data_io.get_api_data()
-            obj_build_url = obj_data["url"]
-            return build_url == obj_build_url
+        """Overrides the default equality operation
+
+        Builds are identified by their URL, so comparisons do not require any data to be
+        loaded from the server. Builds referenced through a permalink, such as 'lastBuild',
+        are therefore distinct from the same build referenced by its number. Builds compare
+        equal to any :class:`~.handles.BuildHandle` referencing the same build.
+        """
+        if isinstance(obj, (Build, BuildHandle)):
+            return self._identity == obj._identity
         return False
     
     def __ne__(self, obj):
         """Overrides the default not equal operation"""
-        if isinstance(obj, Build):
-            data = self._data_io.get_api_data()
-            build_url = data['url']
-            obj_data = obj._data_io.get_api_data()
-            obj_build_url = obj_data["url"]
-            return build_url != obj_build_url
-        return False
+        return not self.__eq__(obj)
 
     def __hash__(self):
         """ Allows the current object to be hashable
         """
-        return hash(self._data_io.get_api_data()['fullDisplayName'])
+        return hash(self._identity)
+
+    @property
+    def _identity(self):
+        """Gets the normalized URL used to identify this build
+
+        :rtype: :class:`str`
+        """
+        return identity_url(self._data_io.url)
         
     @property
     def number(self):
@@ -94,6 +100,24 @@ class Build(object):
         """
         return self._data_io.get_text("/consoleText")
 
+    def iter_console_output(self):
+        """Gets the raw console output for this build as a sequence of blocks of plain text
+
+        The output is streamed from the server as it is iterated over, rather than being
+        loaded all at once, which keeps memory use low for builds with very large logs.
+
+        When the master supports it the output is loaded from the 'logText/progressiveText'
+        endpoint. The headers of the returned stream then include 'X-Text-Size', the offset to
+        resume from, and 'X-More-Data', which is present while the build is still producing
+        output. Otherwise the output is loaded from the 'consoleText' endpoint.
+
+        :returns: generator yielding consecutive blocks of the console output
+        :rtype: :class:`~.utils.datarequester.TextStream`
+        """
+        if self._data_io.progressive_text:
+            return self._data_io.stream_text("/logText/progressiveText?start=0")
+        return self._data_io.stream_text("/consoleText")
+
     @property
     def result(self):
         """Gets the final status of this build
@@ -150,7 +174,7 @@ class Build(object):
         retval = []
 
         for node in artifacts_node:
-            url = self._data_io.url + "artifact/" + node['fileName']
+            url = join_url(self._data_io.url, "artifact/" + node['fileName'])
             retval.append(url)
 
         return retval
@@ -119,5 +119,87 @@ class JenkinsFlushFailure(PyJenError):
             msg += "URL: " + i + " Status: " + str(self._failed_items[i])
         return msg
 
+
+class RequestBudgetExceeded(PyJenError):
+    """Exception raised when a block of code issues more requests than its request budget allows"""
+    def __init__(self, request_count, limit, endpoint=None, counts=None):
+        """Constructor
+
+        :param int request_count: number of requests that were issued
+        :param int limit: maximum number of requests that were allowed
+        :param str endpoint:
+            URL template of the endpoint whose limit was exceeded, or None if the limit
+            on the total number of requests was exceeded
+        :param dict counts: number of requests issued to each endpoint, keyed by URL template
+        """
+        super(RequestBudgetExceeded, self).__init__()
+        self._request_count = request_count
+        self._limit = limit
+        self._endpoint = endpoint
+        self._counts = counts if counts is not None else {}
+
+    @property
+    def request_count(self):
+        return self._request_count
+
+    @property
+    def limit(self):
+        return self._limit
+
+    @property
+    def endpoint(self):
+        return self._endpoint
+
+    @property
+    def counts(self):
+        return self._counts
+
+    def __str__(self):
+        target = "requests" if self._endpoint is None else "requests to " + self._endpoint
+        msg = "Request budget exceeded: {0} {1} issued, limit is {2}".format(self._request_count, target,
+                                                                            self._limit)
+        for endpoint in sorted(self._counts):
+            msg += "\n\t{0}: {1}".format(endpoint, self._counts[endpoint])
+        return msg
+
+
+class InteractionNotRecordedError(PyJenError):
+    """Exception raised when replaying a recording which does not contain a response for a request"""
+    def __init__(self, request_key, cassette_path):
+        """Constructor
+
+        :param str request_key: description of the request which was not recorded
+        :param str cassette_path: location of the recording
+        """
+        super(InteractionNotRecordedError, self).__init__()
+        self._request_key = request_key
+        self._cassette_path = cassette_path
+
+    @property
+    def request_key(self):
+        return self._request_key
+
+    def __str__(self):
+        return "Request {0} not found in recording {1}".format(self._request_key, self._cassette_path)
+
+
+class CircuitOpenError(PyJenError):
+    """Exception raised when a request is refused because too many recent requests to the same server have failed"""
+    def __init__(self, host):
+        """Constructor
+
+        :param str host: the server requests are being refused for
+        """
+        super(CircuitOpenError, self).__init__()
+        self._host = host
+
+    @property
+    def host(self):
+        return self._host
+
+    def __str__(self):
+        return "Requests to {0} suspended after repeated failures".format(self._host)
+
+
 if __name__ == "__main__":  # pragma: no cover
     pass
@@ -0,0 +1,343 @@
+"""Primitives for querying the state of all build agents managed by a Jenkins master at once"""
+import time
+import logging
+from multiprocessing.pool import ThreadPool
+from six import string_types
+from pyjen.node import Node
+from pyjen.utils.capabilities import api_query
+from pyjen.utils.urls import join_url
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Properties loaded for each node in a fleet snapshot
+NODE_TREE = "displayName,offline,temporarilyOffline,offlineCauseReason,idle,numExecutors," \
+            "assignedLabels[name],executors[idle]"
+
+# Query used to load a snapshot of all nodes from the '/computer' API in a single request
+FLEET_TREE = "busyExecutors,totalExecutors,computer[" + NODE_TREE + "]"
+
+# Default number of nodes toggled concurrently by batch operations
+DEFAULT_MAX_WORKERS = 8
+
+
+class Fleet(object):
+    """Snapshot of the state of all build agents (aka: nodes) managed by a Jenkins master
+
+    All of the data exposed by this class is loaded from the master using a single request
+    and cached until :py:meth:`.refresh` is called, so it is safe to query the properties
+    of this object, and the :class:`~.node.Node` objects it produces, repeatedly without
+    generating additional load on the master.
+
+    Instances of this class are typically created using the :py:attr:`~.jenkins.Jenkins.fleet`
+    property on the Jenkins class.
+    """
+
+    def __init__(self, data_io_controller):
+        """
+        :param data_io_controller:
+            IO interface which manages interaction with the '/computer' endpoint
+            of the Jenkins master
+        :type data_io_controller: :class:`~.utils.datarequester.DataRequester`
+        """
+        self._data_io = data_io_controller
+        self._data = None
+
+    def refresh(self):
+        """Reloads the state of all nodes from the Jenkins master"""
+        self._data = self._data_io.get_api_data(query_params=api_query(self._data_io, FLEET_TREE, 2))
+
+    @property
+    def _snapshot(self):
+        """Gets the cached node data, loading it from the master if necessary
+
+        :rtype: :class:`dict`
+        """
+        if self._data is None:
+            self.refresh()
+        return self._data
+
+    @property
+    def _computers(self):
+        """Gets the raw data describing each node in the snapshot
+
+        :rtype: :class:`list` of :class:`dict`
+        """
+        return self._snapshot['computer']
+
+    def _node_url(self, node_name):
+        """Generates the URL of the API endpoint for a given node
+
+        :param str node_name: display name of the node
+        :rtype: :class:`str`
+        """
+        if node_name == 'master':
+            return join_url(self._data_io.url, '(master)')
+        return join_url(self._data_io.url, node_name)
+
+    @property
+    def nodes(self):
+        """Gets the list of nodes included in this snapshot
+
+        The returned nodes are pre-populated with the data from this snapshot so querying
+        them will not generate further requests to the master until their state is refreshed.
+
+        :rtype: :class:`list` of :class:`~.node.Node` objects
+        """
+        retval = []
+        for cur_node in self._computers:
+            node_data_io = self._data_io.clone(self._node_url(cur_node['displayName']))
+            retval.append(Node(node_data_io, cur_node))
+        return retval
+
+    @property
+    def node_names(self):
+        """Gets the names of all nodes included in this snapshot
+
+        :rtype: :class:`list` of :class:`str`
+        """
+        return [cur_node['displayName'] for cur_node in self._computers]
+
+    @property
+    def total_executors(self):
+        """Gets the total number of executors across all nodes
+
+        :rtype: :class:`int`
+        """
+        return self._snapshot['totalExecutors']
+
+    @property
+    def busy_executors(self):
+        """Gets the number of executors currently running builds across all nodes
+
+        :rtype: :class:`int`
+        """
+        return self._snapshot['busyExecutors']
+
+    @property
+    def idle_executors(self):
+        """Gets the number of executors not currently running builds across all nodes
+
+        :rtype: :class:`int`
+        """
+        return self.total_executors - self.busy_executors
+
+    @property
+    def executor_counts(self):
+        """Gets the number of busy and total executors for each node
+
+        :returns: mapping of node names to 2-tuples containing the busy and total executor counts
+        :rtype: :class:`dict`
+        """
+        retval = {}
+        for cur_node in self._computers:
+            executors = cur_node.get('executors', [])
+            busy = len([i for i in executors if not i['idle']])
+            retval[cur_node['displayName']] = (busy, len(executors))
+        return retval
+
+    @property
+    def idle_nodes(self):
+        """Gets the names of all nodes with no active builds
+
+        :rtype: :class:`list` of :class:`str`
+        """
+        return [cur_node['displayName'] for cur_node in self._computers if cur_node['idle']]
+
+    @property
+    def busy_nodes(self):
+        """Gets the names of all nodes with one or more active builds
+
+        :rtype: :class:`list` of :class:`str`
+        """
+        return [cur_node['displayName'] for cur_node in self._computers if not cur_node['idle']]
+
+    @property
+    def offline_nodes(self):
+        """Gets the names of all nodes that are currently offline
+
+        :rtype: :class:`list` of :class:`str`
+        """
+        return [cur_node['displayName'] for cur_node in self._computers if cur_node['offline']]
+
+    @property
+    def offline_reasons(self):
+        """Gets the reason each offline node was taken offline
+
+        :returns:
+            mapping of the names of all offline nodes to the reason they were taken offline.
+            Nodes that were taken offline without giving a reason map to an empty string.
+        :rtype: :class:`dict`
+        """
+        retval = {}
+        for cur_node in self._computers:
+            if cur_node['offline']:
+                retval[cur_node['displayName']] = cur_node.get('offlineCauseReason') or ""
+        return retval
+
+    @property
+    def labels(self):
+        """Gets the names of the nodes associated with each label
+
+        :returns: mapping of label names to the list of node names associated with each label
+        :rtype: :class:`dict`
+        """
+        retval = {}
+        for cur_node in self._computers:
+            for label in cur_node.get('assignedLabels', []):
+                retval.setdefault(label['name'], []).append(cur_node['displayName'])
+        return retval
+
+    @staticmethod
+    def _get_names(nodes):
+        """Converts a collection of nodes into a set of node names
+
+        :param nodes: collection of :class:`~.node.Node` objects or node names
+        :rtype: :class:`set` of :class:`str`
+        """
+        return set(i if isinstance(i, string_types) else i.name for i in nodes)
+
+    def _check_names(self, node_names):
+        """Makes sure every node in a set is managed by the Jenkins master, using the current snapshot
+
+        :param node_names: names of the nodes to check
+        :raises ValueError: if any of the nodes are not managed by the Jenkins master
+        """
+        unknown = set(node_names) - set(i['displayName'] for i in self._computers)
+        if unknown:
+            raise ValueError("Unknown nodes: " + ", ".join(sorted(unknown)))
+
+    def _toggle_nodes(self, node_names, message, max_workers):
+        """Toggles the online state of a set of nodes concurrently
+
+        :param node_names: names of the nodes to toggle
+        :param str message: optional message describing why the nodes are being taken offline
+        :param int max_workers: maximum number of nodes to toggle at the same time
+        """
+        if not node_names:
+            return
+
+        def toggle(node_name):
+            """Toggles a single node"""
+            log.debug("Toggling online state of node " + node_name)
+            Node(self._data_io.clone(self._node_url(node_name))).toggle_offline(message)
+
+        pool = ThreadPool(min(max_workers, len(node_names)))
+        try:
+            pool.map(toggle, sorted(node_names))
+        finally:
+            pool.close()
+            pool.join()
+        self._data = None
+
+    def take_offline(self, nodes, message=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Marks a set of nodes as offline, toggling them concurrently
+
+        Nodes that have already been marked as offline are left unchanged.
+
+        :param nodes: collection of :class:`~.node.Node` objects or node names to take offline
+        :param str message: optional message explaining why the nodes are being taken offline
+        :param int max_workers: maximum number of nodes to toggle at the same time
+        :returns: names of the nodes that were toggled
+        :rtype: :class:`list` of :class:`str`
+        :raises ValueError: if any of the nodes are not managed by the Jenkins master, in which case no nodes are toggled
+        """
+        names = self._get_names(nodes)
+        self.refresh()
+        self._check_names(names)
+        targets = [i['displayName'] for i in self._computers
+                   if i['displayName'] in names and not i.get('temporarilyOffline')]
+        self._toggle_nodes(targets, message, max_workers)
+        return sorted(targets)
+
+    def bring_online(self, nodes, max_workers=DEFAULT_MAX_WORKERS):
+        """Brings a set of nodes previously marked as offline back online, toggling them concurrently
+
+        Nodes that have not been marked as offline are left unchanged.
+
+        :param nodes: collection of :class:`~.node.Node` objects or node names to bring online
+        :param int max_workers: maximum number of nodes to toggle at the same time
+        :returns: names of the nodes that were toggled
+        :rtype: :class:`list` of :class:`str`
+        :raises ValueError: if any of the nodes are not managed by the Jenkins master, in which case no nodes are toggled
+        """
+        names = self._get_names(nodes)
+        self.refresh()
+        self._check_names(names)
+        targets = [i['displayName'] for i in self._computers
+                   if i['displayName'] in names and i.get('temporarilyOffline')]
+        self._toggle_nodes(targets, None, max_workers)
+        return sorted(targets)
+
+    def iter_idle(self, nodes, max_timeout=None, poll_interval=1):
+        """Waits for a set of nodes to become idle, reporting each one as soon as it does
+
+        The state of all nodes is polled using a single request per interval, regardless
+        of the number of nodes being waited on. Nodes which are removed from the master while
+        being waited on are never reported as idle, and are no longer waited on.
+
+        :param nodes: collection of :class:`~.node.Node` objects or node names to wait for
+        :param float max_timeout:
+            The maximum amount of time, in seconds, to wait for the nodes to become idle.
+            If this value is undefined, this method will block until all nodes are idle.
+        :param float poll_interval: time, in seconds, between polls of the node states
+        :returns: iterator producing the name of each node as it becomes idle
+        :raises ValueError: if any of the nodes are not managed by the Jenkins master
+        """
+        pending = self._get_names(nodes)
+        start_time = time.time()
+        self.refresh()
+        self._check_names(pending)
+        while pending:
+            current = set(i['displayName'] for i in self._computers)
+            for node_name in sorted(pending - current):
+                log.warning("Node " + node_name + " no longer exists. It will not be waited on.")
+                pending.discard(node_name)
+            for cur_node in self._computers:
+                if cur_node['displayName'] in pending and cur_node['idle']:
+                    pending.discard(cur_node['displayName'])
+                    yield cur_node['displayName']
+            if not pending:
+                break
+            if max_timeout is not None and time.time() - start_time >= max_timeout:
+                break
+            time.sleep(poll_interval)
+            self.refresh()
+
+    def wait_for_idle(self, nodes, max_timeout=None, poll_interval=1):
+        """Blocks execution until a set of nodes have all become idle
+
+        :param nodes: collection of :class:`~.node.Node` objects or node names to wait for
+        :param float max_timeout:
+            The maximum amount of time, in seconds, to wait for the nodes to become idle.
+            If this value is undefined, this method will block indefinitely.
+        :param float poll_interval: time, in seconds, between polls of the node states
+        :returns: mapping of node names to True if the node became idle before returning, otherwise False
+        :rtype: :class:`dict`
+        :raises ValueError: if any of the nodes are not managed by the Jenkins master
+        """
+        retval = dict((i, False) for i in self._get_names(nodes))
+        for node_name in self.iter_idle(retval.keys(), max_timeout, poll_interval):
+            retval[node_name] = True
+        return retval
+
+    def drain(self, nodes, message=None, max_timeout=None, poll_interval=1, max_workers=DEFAULT_MAX_WORKERS):
+        """Takes a set of nodes offline and waits for any builds running on them to complete
+
+        :param nodes: collection of :class:`~.node.Node` objects or node names to drain
+        :param str message: optional message explaining why the nodes are being taken offline
+        :param float max_timeout:
+            The maximum amount of time, in seconds, to wait for the nodes to become idle.
+            If this value is undefined, this method will block indefinitely.
+        :param float poll_interval: time, in seconds, between polls of the node states
+        :param int max_workers: maximum number of nodes to toggle at the same time
+        :returns: mapping of node names to True if the node became idle before returning, otherwise False
+        :rtype: :class:`dict`
+        :raises ValueError: if any of the nodes are not managed by the Jenkins master, in which case no nodes are toggled
+        """
+        names = self._get_names(nodes)
+        self.take_offline(names, message, max_workers)
+        return self.wait_for_idle(names, max_timeout, poll_interval)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,323 @@
+"""Lightweight references to Jenkins entities which defer loading their full state until needed
+
+Listing operations produce large numbers of entities, most of which are only ever queried for
+properties that are already known from the listing itself, such as their name or URL. The handle
+classes defined here hold just those properties and transparently upgrade themselves to the full
+PyJen object the first time any other attribute is requested. Assigning to any attribute of a
+handle other than its own internal state, such as a configuration property, also upgrades the
+handle and assigns the value on the full object.
+
+Handles compare equal to, and hash the same as, both other handles and full PyJen objects which
+refer to the same entity.
+
+Handles keep a reference to the connection of the entity which listed them, rather than a copy
+of it, so creating a handle allocates only the handle itself.
+"""
+from pyjen.utils.urls import identity_url
+
+
+def _negate(result):
+    """Inverts the result of an equality comparison, preserving :data:`NotImplemented`
+
+    :param result: the result of an :meth:`__eq__` method
+    :rtype: :class:`bool`
+    """
+    if result is NotImplemented:
+        return result
+    return not result
+
+
+class ViewHandle(object):
+    """Lightweight reference to a Jenkins view
+
+    The name, URL, type and child views of the view are available without further requests
+    to the Jenkins master. Accessing any other attribute of the handle loads the full
+    :class:`~.view.View` object, including its configuration, and forwards the request to it.
+    """
+    __slots__ = ("_controller", "_master", "_name", "_url", "_class_name", "_children", "_view")
+
+    def __init__(self, controller, jenkins_master, name, url, class_name=None, children=None):
+        """
+        :param controller: IO interface used to create the connection to the view when needed
+        :type controller: :class:`~.utils.datarequester.DataRequester`
+        :param jenkins_master: Jenkins instance containing this view
+        :type jenkins_master: :class:`~.jenkins.Jenkins`
+        :param str name: the name of the view
+        :param str url: absolute URL of the view
+        :param str class_name: Java class name of the view, as reported by the '_class' API property
+        :param list children:
+            handles for the sub-views contained within this view, or None if the children
+            of this view have not been loaded
+        """
+        self._controller = controller
+        self._master = jenkins_master
+        self._name = name
+        self._url = url
+        self._class_name = class_name
+        self._children = children
+        self._view = None
+
+    @property
+    def name(self):
+        """Gets the name of this view
+
+        :rtype: :class:`str`
+        """
+        return self._name
+
+    @property
+    def url(self):
+        """Gets the URL of this view
+
+        :rtype: :class:`str`
+        """
+        return self._url
+
+    @property
+    def type(self):
+        """Gets the PyJen plugin type of this view
+
+        When the Java class of the view is known the type is derived from it directly,
+        otherwise the view configuration will be loaded to determine it.
+
+        :rtype: :class:`str`
+        """
+        if self._class_name is not None:
+            # Jenkins escapes underscores in class names when generating XML tag names,
+            # which is what the PyJen plugin types are based on
+            return self._class_name.replace("_", "__")
+        return self.view.type
+
+    @property
+    def children(self):
+        """Gets handles for the sub-views contained within this view
+
+        :returns: the child views, or None if they have not been loaded
+        :rtype: :class:`list` of :class:`.ViewHandle`
+        """
+        return self._children
+
+    @property
+    def view(self):
+        """Gets the full PyJen object for this view, loading it if necessary
+
+        :rtype: :class:`~.view.View`
+        """
+        if self._view is None:
+            from pyjen.view import View
+            self._view = View.create(self._controller.clone(self._url), self._master)
+        return self._view
+
+    def __getattr__(self, item):
+        # Private attributes are never forwarded, which also prevents infinite recursion
+        # when this method is invoked on a partially initialized handle
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.view, item)
+
+    def __setattr__(self, key, value):
+        # Only the internal state of the handle is stored on the handle itself
+        if key in ViewHandle.__slots__:
+            object.__setattr__(self, key, value)
+        else:
+            setattr(self.view, key, value)
+
+    @property
+    def _identity(self):
+        """Gets the normalized URL used to identify this view
+
+        :rtype: :class:`str`
+        """
+        return identity_url(self._url)
+
+    def __eq__(self, other):
+        # Comparisons with full View objects are handled by the View class
+        if isinstance(other, ViewHandle):
+            return self._identity == other._identity
+        return NotImplemented
+
+    def __ne__(self, other):
+        return _negate(self.__eq__(other))
+
+    def __hash__(self):
+        return hash(self._identity)
+
+    def __repr__(self):
+        return "ViewHandle({0!r})".format(self._url)
+
+
+class JobHandle(object):
+    """Lightweight reference to a Jenkins job
+
+    The name and URL of the job are available without further requests to the Jenkins master.
+    Accessing any other attribute of the handle loads the full :class:`~.job.Job` object,
+    including its configuration, and forwards the request to it.
+    """
+    __slots__ = ("_controller", "_master", "_name", "_url", "_job")
+
+    def __init__(self, controller, jenkins_master, name, url):
+        """
+        :param controller: IO interface used to create the connection to the job when needed
+        :type controller: :class:`~.utils.datarequester.DataRequester`
+        :param jenkins_master: Jenkins instance containing this job
+        :type jenkins_master: :class:`~.jenkins.Jenkins`
+        :param str name: the name of the job, or None if it is not known
+        :param str url: absolute URL of the job
+        """
+        self._controller = controller
+        self._master = jenkins_master
+        self._name = name
+        self._url = url
+        self._job = None
+
+    @property
+    def name(self):
+        """Gets the name of this job
+
+        :rtype: :class:`str`
+        """
+        if self._name is None:
+            self._name = self.job.name
+        return self._name
+
+    @property
+    def url(self):
+        """Gets the URL of this job
+
+        :rtype: :class:`str`
+        """
+        return self._url
+
+    @property
+    def job(self):
+        """Gets the full PyJen object for this job, loading it if necessary
+
+        :rtype: :class:`~.job.Job`
+        """
+        if self._job is None:
+            from pyjen.job import Job
+            self._job = Job.create(self._controller.clone(self._url), self._master)
+        return self._job
+
+    def __getattr__(self, item):
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.job, item)
+
+    def __setattr__(self, key, value):
+        if key in JobHandle.__slots__:
+            object.__setattr__(self, key, value)
+        else:
+            setattr(self.job, key, value)
+
+    @property
+    def _identity(self):
+        """Gets the normalized URL used to identify this job
+
+        :rtype: :class:`str`
+        """
+        return identity_url(self._url)
+
+    def __eq__(self, other):
+        # Comparisons with full Job objects are handled by the Job class
+        if isinstance(other, JobHandle):
+            return self._identity == other._identity
+        return NotImplemented
+
+    def __ne__(self, other):
+        return _negate(self.__eq__(other))
+
+    def __hash__(self):
+        return hash(self._identity)
+
+    def __repr__(self):
+        return "JobHandle({0!r})".format(self._url)
+
+
+class BuildHandle(object):
+    """Lightweight reference to a single build of a Jenkins job
+
+    The number and URL of the build are available without further requests to the Jenkins
+    master. Accessing any other attribute of the handle creates the full :class:`~.build.Build`
+    object and forwards the request to it.
+    """
+    __slots__ = ("_controller", "_url", "_number", "_build")
+
+    def __init__(self, controller, url, number=None):
+        """
+        :param controller: IO interface used to create the connection to the build when needed
+        :type controller: :class:`~.utils.datarequester.DataRequester`
+        :param str url: absolute URL of the build
+        :param int number: the build number, or None if it is not known
+        """
+        self._controller = controller
+        self._url = url
+        self._number = number
+        self._build = None
+
+    @property
+    def number(self):
+        """Gets the sequence number of this build
+
+        :rtype: :class:`int`
+        """
+        if self._number is None:
+            self._number = self.build.number
+        return self._number
+
+    @property
+    def url(self):
+        """Gets the URL of this build
+
+        :rtype: :class:`str`
+        """
+        return self._url
+
+    @property
+    def build(self):
+        """Gets the full PyJen object for this build, creating it if necessary
+
+        :rtype: :class:`~.build.Build`
+        """
+        if self._build is None:
+            from pyjen.build import Build
+            self._build = Build(self._controller.clone(self._url))
+        return self._build
+
+    def __getattr__(self, item):
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.build, item)
+
+    def __setattr__(self, key, value):
+        if key in BuildHandle.__slots__:
+            object.__setattr__(self, key, value)
+        else:
+            setattr(self.build, key, value)
+
+    @property
+    def _identity(self):
+        """Gets the normalized URL used to identify this build
+
+        :rtype: :class:`str`
+        """
+        return identity_url(self._url)
+
+    def __eq__(self, other):
+        # Comparisons with full Build objects are handled by the Build class
+        if isinstance(other, BuildHandle):
+            return self._identity == other._identity
+        return NotImplemented
+
+    def __ne__(self, other):
+        return _negate(self.__eq__(other))
+
+    def __hash__(self):
+        return hash(self._identity)
+
+    def __repr__(self):
+        return "BuildHandle({0!r})".format(self._url)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
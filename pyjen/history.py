@@ -0,0 +1,390 @@
+"""Compact, column oriented storage of build histories for statistical analysis
+
+A :class:`BuildHistory` holds the number, start time, duration and result of every build of
+one or more jobs in contiguous arrays, rather than as individual :class:`~.build.Build`
+objects, and is loaded using a handful of paged requests rather than several requests per
+build. When the optional `NumPy <http://www.numpy.org/>`_ package is installed its arrays are
+used to compute aggregate statistics, otherwise equivalent pure Python implementations are used.
+
+**Example:** reporting on the reliability of a job ::
+
+    from pyjen.jenkins import Jenkins
+    from pyjen.history import BuildHistory
+
+    jenkins = Jenkins.easy_connect("http://localhost:8080")
+    history = BuildHistory.from_jobs([jenkins.find_job("my_job")], max_builds=5000)
+    print(history.success_rate(), history.flakiness(), history.mttr())
+    print(history.duration_quantiles((50, 90, 99)))
+"""
+from __future__ import division
+import logging
+from array import array
+from pyjen.utils import stats
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Number of builds loaded by each request when populating a history
+DEFAULT_PAGE_SIZE = 500
+
+# Numeric codes used to store the result of each build
+RESULT_BUILDING = -1
+RESULT_SUCCESS = 0
+RESULT_UNSTABLE = 1
+RESULT_FAILURE = 2
+RESULT_ABORTED = 3
+RESULT_NOT_BUILT = 4
+
+# Mapping of the build results reported by Jenkins to their numeric codes
+RESULT_CODES = {
+    "SUCCESS": RESULT_SUCCESS,
+    "UNSTABLE": RESULT_UNSTABLE,
+    "FAILURE": RESULT_FAILURE,
+    "ABORTED": RESULT_ABORTED,
+    "NOT_BUILT": RESULT_NOT_BUILT,
+}
+
+# Results of builds which ran to completion, and so count towards success rates
+FINISHED_RESULTS = (RESULT_SUCCESS, RESULT_UNSTABLE, RESULT_FAILURE)
+
+# Names and array type codes of the columns of the table
+# Time stamps and durations are stored as doubles, which represent milliseconds exactly
+COLUMNS = (("job", "l"), ("number", "l"), ("timestamp", "d"), ("duration", "d"), ("result", "b"))
+
+
+def result_code(result, building=False):
+    """Converts a build result reported by Jenkins to the code used to store it
+
+    :param str result: the result of the build, such as 'SUCCESS' or 'FAILURE'
+    :param bool building: True if the build is still running
+    :rtype: :class:`int`
+    """
+    if building:
+        return RESULT_BUILDING
+    return RESULT_CODES.get(result, RESULT_NOT_BUILT)
+
+
+class BuildHistory(object):
+    """Table of the builds of one or more jobs, stored as one contiguous array per property
+
+    The table has the following columns, one row per build, in the order the builds were added:
+
+    * 'job' - index of the job the build belongs to, within :py:attr:`.jobs`
+    * 'number' - build number
+    * 'timestamp' - time the build started, in milliseconds since the epoch
+    * 'duration' - time the build took, in milliseconds
+    * 'result' - outcome of the build, as one of the RESULT_* codes defined in this module
+
+    Unless stated otherwise only builds which ran to completion, successfully or not, are
+    included in statistics. Builds which are still running, were aborted or were never built
+    are ignored.
+    """
+
+    def __init__(self):
+        self._jobs = []
+        self._job_index = {}
+        self._columns = dict((name, array(typecode)) for name, typecode in COLUMNS)
+        self._arrays = None
+
+    @staticmethod
+    def from_jobs(jobs, max_builds=None, page_size=DEFAULT_PAGE_SIZE):
+        """Creates a table containing the build histories of several jobs
+
+        :param list jobs: the :class:`~.job.Job` objects to load the builds of
+        :param int max_builds: maximum number of builds to load per job, starting from the most recent. Defaults to all builds.
+        :param int page_size: number of builds to load with each request
+        :rtype: :class:`.BuildHistory`
+        """
+        retval = BuildHistory()
+        for cur_job in jobs:
+            retval.add_job(cur_job, max_builds, page_size)
+        return retval
+
+    def add_job(self, job, max_builds=None, page_size=DEFAULT_PAGE_SIZE):
+        """Loads the builds of a job into the table
+
+        Builds are loaded in pages, with each page loaded by a single request.
+
+        :param job: the job to load the builds of
+        :type job: :class:`~.job.Job`
+        :param int max_builds: maximum number of builds to load, starting from the most recent. Defaults to all builds.
+        :param int page_size: number of builds to load with each request
+        :returns: the number of builds loaded
+        :rtype: :class:`int`
+        """
+        job_name = job.name
+        loaded = 0
+        while max_builds is None or loaded < max_builds:
+            count = page_size if max_builds is None else min(page_size, max_builds - loaded)
+            page = job.builds_summary(count, loaded)
+            for cur_build in page:
+                self.append(job_name, cur_build["number"], cur_build["timestamp"], cur_build["duration"],
+                            result_code(cur_build["result"], cur_build["building"]))
+            loaded += len(page)
+            if len(page) < count:
+                break
+        log.debug("Loaded {0} builds of job {1}".format(loaded, job_name))
+        return loaded
+
+    def append(self, job_name, number, timestamp, duration, result):
+        """Adds a build to the table
+
+        :param str job_name: name of the job the build belongs to
+        :param int number: the build number
+        :param int timestamp: time the build started, in milliseconds since the epoch
+        :param int duration: time the build took, in milliseconds
+        :param int result: outcome of the build, as one of the RESULT_* codes defined in this module
+        """
+        index = self._job_index.get(job_name)
+        if index is None:
+            index = len(self._jobs)
+            self._job_index[job_name] = index
+            self._jobs.append(job_name)
+        self._columns["job"].append(index)
+        self._columns["number"].append(number)
+        self._columns["timestamp"].append(timestamp)
+        self._columns["duration"].append(duration)
+        self._columns["result"].append(result)
+        self._arrays = None
+
+    def __len__(self):
+        return len(self._columns["number"])
+
+    @property
+    def jobs(self):
+        """Gets the names of the jobs with builds in the table, in the order they were added
+
+        :rtype: :class:`list` of :class:`str`
+        """
+        return list(self._jobs)
+
+    def column(self, name):
+        """Gets all values of one column of the table
+
+        :param str name: name of the column
+        :returns: the values of the column as a NumPy array if NumPy is installed, otherwise as an :class:`array.array`
+        """
+        if numpy is None:
+            return self._columns[name]
+        if self._arrays is None:
+            self._arrays = dict((i, numpy.array(j)) for i, j in self._columns.items())
+        return self._arrays[name]
+
+    def _rows(self, job_name=None):
+        """Gets the values of all columns, optionally restricted to the builds of a single job
+
+        :param str job_name: name of the job to select the builds of, or None for all builds
+        :returns: mapping of column names to their values, as NumPy arrays or lists
+        :rtype: :class:`dict`
+        """
+        names = [i[0] for i in COLUMNS]
+        if job_name is None:
+            return dict((i, self.column(i)) for i in names)
+        index = self._job_index.get(job_name, -1)
+        if numpy is not None:
+            selected = self.column("job") == index
+            return dict((i, self.column(i)[selected]) for i in names)
+        rows = [i for i, j in enumerate(self._columns["job"]) if j == index]
+        return dict((i, [self._columns[i][j] for j in rows]) for i in names)
+
+    def success_rate(self, job_name=None):
+        """Gets the fraction of builds which succeeded
+
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns: the success rate between 0 and 1, or None if no builds have finished
+        :rtype: :class:`float`
+        """
+        results = self._rows(job_name)["result"]
+        if numpy is not None:
+            finished = int(numpy.isin(results, FINISHED_RESULTS).sum())
+            succeeded = int((results == RESULT_SUCCESS).sum())
+        else:
+            finished = sum(1 for i in results if i in FINISHED_RESULTS)
+            succeeded = sum(1 for i in results if i == RESULT_SUCCESS)
+        return succeeded / finished if finished else None
+
+    def bucket_counts(self, interval, job_name=None):
+        """Counts the builds started within consecutive periods of time
+
+        :param float interval: length of each period, in seconds
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns:
+            one 4-tuple per period, from the oldest to the most recent period containing a build,
+            with the start of the period in milliseconds since the epoch, the number of builds
+            started, the number of those which succeeded and the number which finished unsuccessfully.
+            Periods with no builds are included.
+        :rtype: :class:`list` of :class:`tuple`
+        """
+        rows = self._rows(job_name)
+        if not len(rows["timestamp"]):
+            return []
+        width = interval * 1000.0
+
+        if numpy is not None:
+            buckets = (rows["timestamp"] // width).astype(numpy.int64)
+            first = int(buckets.min())
+            offsets = buckets - first
+            size = int(offsets.max()) + 1
+            totals = numpy.bincount(offsets, minlength=size)
+            succeeded = numpy.bincount(offsets, weights=rows["result"] == RESULT_SUCCESS, minlength=size)
+            failed = numpy.bincount(offsets, weights=numpy.isin(rows["result"], (RESULT_UNSTABLE, RESULT_FAILURE)),
+                                    minlength=size)
+            return [((first + i) * width, int(totals[i]), int(succeeded[i]), int(failed[i])) for i in range(size)]
+
+        buckets = [int(i // width) for i in rows["timestamp"]]
+        first = min(buckets)
+        size = max(buckets) - first + 1
+        totals = [0] * size
+        succeeded = [0] * size
+        failed = [0] * size
+        for bucket, result in zip(buckets, rows["result"]):
+            totals[bucket - first] += 1
+            if result == RESULT_SUCCESS:
+                succeeded[bucket - first] += 1
+            elif result in FINISHED_RESULTS:
+                failed[bucket - first] += 1
+        return [((first + i) * width, totals[i], succeeded[i], failed[i]) for i in range(size)]
+
+    def windowed_success_rate(self, interval, job_name=None):
+        """Gets the fraction of builds which succeeded within consecutive periods of time
+
+        :param float interval: length of each period, in seconds
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns:
+            one 2-tuple per period, as described in :py:meth:`.bucket_counts`, with the start of
+            the period in milliseconds since the epoch and the success rate during the period,
+            or None if no builds finished during the period
+        :rtype: :class:`list` of :class:`tuple`
+        """
+        retval = []
+        for start, _, succeeded, failed in self.bucket_counts(interval, job_name):
+            finished = succeeded + failed
+            retval.append((start, succeeded / finished if finished else None))
+        return retval
+
+    def duration_quantiles(self, percentiles=(50, 90, 99), job_name=None):
+        """Gets percentiles of the durations of the builds
+
+        :param tuple percentiles: the percentiles to calculate, each between 0 and 100
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns:
+            mapping of each requested percentile to the corresponding duration in milliseconds,
+            interpolated linearly between builds, or to None if no builds have finished
+        :rtype: :class:`dict`
+        """
+        rows = self._rows(job_name)
+        if numpy is not None:
+            durations = rows["duration"][numpy.isin(rows["result"], FINISHED_RESULTS)]
+            if not len(durations):
+                return dict((i, None) for i in percentiles)
+            values = numpy.percentile(durations, percentiles)
+            return dict((i, float(j)) for i, j in zip(percentiles, values))
+
+        durations = sorted(i for i, j in zip(rows["duration"], rows["result"]) if j in FINISHED_RESULTS)
+        return dict((i, stats.percentile(durations, i)) for i in percentiles)
+
+    def _outcomes(self, job_name):
+        """Gets the finished builds of each job in the order they were run
+
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns:
+            one list per job of 4-tuples containing the build number, start time, end time and
+            a boolean which is True if the build succeeded, sorted by build number
+        :rtype: :class:`list` of :class:`list`
+        """
+        rows = self._rows(job_name)
+        per_job = {}
+        for job, number, timestamp, duration, result in zip(rows["job"], rows["number"], rows["timestamp"],
+                                                            rows["duration"], rows["result"]):
+            if result in FINISHED_RESULTS:
+                per_job.setdefault(int(job), []).append(
+                    (int(number), float(timestamp), float(timestamp + duration), result == RESULT_SUCCESS))
+        return [sorted(i) for i in per_job.values()]
+
+    def _sorted_outcomes(self, job_name):
+        """Gets the finished builds of each job in the order they were run, as NumPy arrays
+
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns:
+            4-tuple of arrays containing the job index, start time, end time and success of each
+            build, sorted by job and build number
+        :rtype: :class:`tuple`
+        """
+        rows = self._rows(job_name)
+        finished = numpy.isin(rows["result"], FINISHED_RESULTS)
+        jobs = rows["job"][finished]
+        order = numpy.lexsort((rows["number"][finished], jobs))
+        starts = rows["timestamp"][finished][order]
+        ends = starts + rows["duration"][finished][order]
+        return jobs[order], starts, ends, (rows["result"][finished] == RESULT_SUCCESS)[order]
+
+    def flakiness(self, job_name=None):
+        """Gets how often consecutive builds of the same job had different outcomes
+
+        A job which alternates between succeeding and failing is flaky, with a score of 1,
+        while a job whose builds always succeed, or always fail, has a score of 0.
+
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns:
+            the fraction of pairs of consecutive builds whose outcomes differ, between 0 and 1,
+            or None if no job has more than one finished build
+        :rtype: :class:`float`
+        """
+        if numpy is not None:
+            jobs, _, _, passed = self._sorted_outcomes(job_name)
+            same_job = jobs[1:] == jobs[:-1]
+            pairs = int(same_job.sum())
+            flips = int((same_job & (passed[1:] != passed[:-1])).sum())
+        else:
+            pairs = 0
+            flips = 0
+            for outcomes in self._outcomes(job_name):
+                for previous, current in zip(outcomes, outcomes[1:]):
+                    pairs += 1
+                    if previous[3] != current[3]:
+                        flips += 1
+        return flips / pairs if pairs else None
+
+    def mttr(self, job_name=None):
+        """Gets the mean time to recovery, the average time a job remained broken
+
+        A job is broken from the start of the first unsuccessful build following a successful
+        one, or the first build of the job, until the end of the next successful build.
+        Periods where a job is still broken are not included.
+
+        :param str job_name: name of the job to analyze, or None for all jobs
+        :returns: the average time to recover, in milliseconds, or None if no job has recovered from a failure
+        :rtype: :class:`float`
+        """
+        if numpy is not None:
+            jobs, starts, ends, passed = self._sorted_outcomes(job_name)
+            if not len(jobs):
+                return None
+            new_job = numpy.concatenate(([True], jobs[1:] != jobs[:-1]))
+            previous_passed = numpy.concatenate(([True], passed[:-1]))
+            broken = ~passed & (new_job | previous_passed)
+            recovered = passed & ~new_job & ~previous_passed
+            if not recovered.any():
+                return None
+            # Each recovery matches the most recent breakage, which always belongs to the same job
+            broken_index = numpy.maximum.accumulate(numpy.where(broken, numpy.arange(len(passed)), -1))
+            return float((ends[recovered] - starts[broken_index[recovered]]).mean())
+
+        durations = []
+        for outcomes in self._outcomes(job_name):
+            broken_at = None
+            for _, start, end, passed in outcomes:
+                if not passed and broken_at is None:
+                    broken_at = start
+                elif passed and broken_at is not None:
+                    durations.append(end - broken_at)
+                    broken_at = None
+        return sum(durations) / len(durations) if durations else None
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
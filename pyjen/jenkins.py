@@ -2,12 +2,18 @@
 import json
 from pyjen.view import View
 from pyjen.node import Node
+from pyjen.fleet import Fleet
 from pyjen.job import Job
 from pyjen.user import User
 from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.urls import join_url
 from pyjen.utils.user_params import JenkinsConfigParser
+from pyjen.utils.capabilities import Capabilities, UNKNOWN_VERSION, api_query
 from pyjen.exceptions import InvalidJenkinsURLError
 
+# Properties of each job loaded by Jenkins.jobs_summary
+JOBS_SUMMARY_TREE = "jobs[name,url,color,inQueue,lastBuild[number],lastCompletedBuild[number]]"
+
 
 class Jenkins(object):
     """Python wrapper managing the Jenkins primary dashboard
@@ -73,10 +79,11 @@ class Jenkins(object):
         username = None
         password = None
 
+        config = JenkinsConfigParser()
+        config.read(JenkinsConfigParser.get_default_configfiles())
+
         # If not explicit credentials provided, load credentials from any config files
         if not credentials:
-            config = JenkinsConfigParser()
-            config.read(JenkinsConfigParser.get_default_configfiles())
             credentials = config.get_credentials(url)
             
         # If explicit credentials have been found, use them rather than use anonymous access 
@@ -84,18 +91,24 @@ class Jenkins(object):
             username = credentials[0]
             password = credentials[1]
         
+        # Apply any limits on the load placed on the server defined in the config files
+        throttle = config.get_throttle(url)
+        if throttle is not None:
+            DataRequester.set_throttle(url, throttle)
+
         http_io = DataRequester(url, username, password)
         retval = Jenkins(http_io)
 
         # Sanity check: make sure the given IO object can 
         #    successfully query the Jenkins version number
+        #    This also caches the capabilities of the server for later use
         try:
             version = retval.version 
         except:
             raise InvalidJenkinsURLError("Invalid connection parameters provided to \
                 PyJen.Jenkins. Please check configuration.", http_io)
 
-        if version is None or version == "" or version == "Unknown":
+        if version is None or version == "" or version == UNKNOWN_VERSION:
             raise InvalidJenkinsURLError("Invalid connection parameters provided to \
                 PyJen.Jenkins. Please check configuration.", http_io)
         return retval
@@ -108,12 +121,22 @@ class Jenkins(object):
         :rtype: :class:`str`
             
         """
-        headers = self._controller.get_headers('/api/python')
-        
-        if not 'x-jenkins' in headers:
-            return "Unknown"
-        else:
-            return headers['x-jenkins']
+        return self.capabilities.version
+
+    @property
+    def capabilities(self):
+        """Gets the features supported by the Jenkins master
+
+        The master is only probed the first time this is called, after which the
+        profile is shared by all connections to the same master.
+
+        :rtype: :class:`~.utils.capabilities.Capabilities`
+        """
+        retval = DataRequester.get_capabilities(self._controller.url)
+        if retval is None:
+            retval = Capabilities.probe(self._controller)
+            DataRequester.set_capabilities(self._controller.url, retval)
+        return retval
         
     @property
     def is_shutting_down(self):
@@ -132,26 +155,25 @@ class Jenkins(object):
     @property
     def nodes(self):
         """gets the list of nodes (aka: agents) managed by this Jenkins master
-        
+
+        The state of all nodes is loaded using a single request, and the returned Node
+        objects are pre-populated with that data.
+
         :returns: list of 0 or more Node objects managed by this Jenkins master 
         :rtype: :class:`list` of :class:`~.node.Node` objects
         """
-        tmp_data_io = self._controller.clone(self._controller.url.rstrip("/") + "/computer")
-        data = tmp_data_io.get_api_data()
-                
-        nodes = data['computer']
-        retval = []
-        for cur_node in nodes:
-            if cur_node['displayName'] == 'master':
-                node_url = self._controller.url.rstrip("/") + '/computer/(master)'
-            else:
-                node_url = self._controller.url.rstrip("/") + '/computer/' + cur_node['displayName']
-            
-            node_data_io = self._controller.clone(node_url)
-            retval.append(Node(node_data_io))
-                        
-        return retval
-    
+        return self.fleet.nodes
+
+    @property
+    def fleet(self):
+        """Gets a snapshot of the state of all nodes (aka: agents) managed by this Jenkins master
+
+        :returns: object describing the executors and online state of all nodes, loaded from a single request
+        :rtype: :class:`~.fleet.Fleet`
+        """
+        tmp_data_io = self._controller.clone(join_url(self._controller.url, "computer"))
+        return Fleet(tmp_data_io)
+
     @property
     def default_view(self):
         """returns a reference to the primary / default Jenkins view
@@ -165,8 +187,7 @@ class Jenkins(object):
         data = self._controller.get_api_data()
 
         default_view = data['primaryView']
-        new_io_obj = self._controller.clone(default_view['url'].rstrip("/") +\
-                                          "/view/" + default_view['name'])
+        new_io_obj = self._controller.clone(self._view_url(default_view))
         return View.create(new_io_obj, self)
     
     @property
@@ -186,13 +207,7 @@ class Jenkins(object):
         retval = []
 
         for cur_view in raw_views:
-            # The default view will not have a valid view URL
-            # so we need to look for this and generate a corrected one
-            turl = cur_view['url']
-            if turl.find('view') == -1:
-                turl = turl.rstrip("/") + "/view/" + cur_view['name']
-                
-            new_io_obj = self._controller.clone(turl)
+            new_io_obj = self._controller.clone(self._view_url(cur_view))
             tview = View.create(new_io_obj, self)
             retval.append(tview)
             
@@ -265,6 +280,27 @@ class Jenkins(object):
 
         return retval
     
+    def jobs_summary(self):
+        """Gets the state of every job managed by this Jenkins instance, using a single request
+
+        :returns:
+            one dictionary per job containing its 'name', 'url', 'color' and whether it is
+            'inQueue', along with the numbers of its 'lastBuild' and 'lastCompletedBuild',
+            which are None if there are no such builds
+        :rtype: :class:`list` of :class:`dict`
+        """
+        data = self._controller.get_api_data(query_params=api_query(self._controller, JOBS_SUMMARY_TREE, 1))
+
+        retval = []
+        for tjob in data['jobs']:
+            summary = {'name': tjob['name'], 'url': tjob['url'], 'color': tjob.get('color'),
+                       'inQueue': tjob.get('inQueue', False)}
+            for link in ('lastBuild', 'lastCompletedBuild'):
+                summary[link] = tjob[link]['number'] if tjob.get(link) else None
+            retval.append(summary)
+
+        return retval
+
     def find_view(self, view_name):
         """Searches views directly managed by this Jenkins instance for a specific view
 
@@ -282,11 +318,7 @@ class Jenkins(object):
 
         for cur_view in raw_views:
             if cur_view['name'] == view_name:
-                turl = cur_view['url']
-                if turl.find('view') == -1:
-                    turl = turl.rstrip("/") + "/view/" + cur_view['name']
-
-                new_io_obj = self._controller.clone(turl)
+                new_io_obj = self._controller.clone(self._view_url(cur_view))
                 return View.create(new_io_obj, self)
                         
         return None
@@ -345,7 +377,7 @@ class Jenkins(object):
 
         self._controller.post("createItem", args)
 
-        temp_data_io = self._controller.clone(self._controller.url.rstrip("/") + "/job/" + job_name)
+        temp_data_io = self._controller.clone(join_url(self._controller.url, "job/" + job_name))
         new_job = Job.create(temp_data_io, self)
 
         # Sanity check - make sure the job actually exists by checking its name
@@ -399,12 +431,39 @@ class Jenkins(object):
         
         self._controller.post("createItem", args)
 
-        temp_data_io = self._controller.clone(self._controller.url.rstrip("/") + "/job/" + new_job_name)
+        temp_data_io = self._controller.clone(join_url(self._controller.url, "job/" + new_job_name))
         new_job = Job._create(temp_data_io, self, new_job_name)
         
         #disable the newly created job so it doesn't accidentally start running
         new_job.disable()
 
+    def partial_job(self, url, job_name):
+        """Creates an object for a job whose name and URL are already known, without loading its configuration
+
+        The type of the job is not determined, so the returned object only supports the operations
+        common to all jobs, such as querying its builds. Use :py:meth:`.find_job` to get an object
+        of the appropriate derived type.
+
+        :param str url: absolute URL of the job, as reported by :py:meth:`.jobs_summary`
+        :param str job_name: the name of the job
+        :rtype: :class:`~.job.Job`
+        """
+        return Job._create(self._controller.clone(url), self, job_name)
+
+    @staticmethod
+    def _view_url(raw_view):
+        """Gets the URL of a view described by the API data of the dashboard
+
+        The dashboard reports its own URL for the default view, so the URL of the view
+        is generated from its name in that case.
+
+        :param dict raw_view: API data describing the view, including its 'name' and 'url'
+        :rtype: :class:`str`
+        """
+        if "/view/" in raw_view['url']:
+            return raw_view['url']
+        return join_url(raw_view['url'], "view/" + raw_view['name'])
+
     def get_view(self, url):
         """Establishes a connection to a View based on an absolute URL
 
@@ -457,7 +516,7 @@ class Jenkins(object):
         :returns: reference to Jenkins object that manages this users information.
         :rtype: :class:`~.user.User` or None if user not found
         """
-        new_url = self._controller.url + "/user/" + username
+        new_url = join_url(self._controller.url, "user/" + username)
         new_io_obj = self._controller.clone(new_url)
         try:
             retval = User(new_io_obj)
@@ -488,7 +547,7 @@ class Jenkins(object):
         :returns: reference to Jenkins object that manages this node's information.
         :rtype: :class:`~.node.Node` or None if node not found
         """
-        new_url = self._controller.url + "/computer/" + nodename
+        new_url = join_url(self._controller.url, "computer/" + nodename)
         new_io_obj = self._controller.clone(new_url)
         try:
             retval = Node(new_io_obj)
@@ -1,9 +1,22 @@
 """Primitives for interacting with Jenkins jobs"""
 from pyjen.build import Build
+from pyjen.handles import BuildHandle, JobHandle
 from pyjen.utils.pluginapi import PluginBase, get_job_plugins, get_plugin_name, find_plugin, init_extension_plugin
 from pyjen.exceptions import PluginNotSupportedError
 from pyjen.utils.jobxml import JobXML
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
+from pyjen.utils.urls import identity_url, join_url
+from pyjen.utils.capabilities import api_query
+
+# Properties of each build loaded by Job.builds_summary
+BUILD_SUMMARY_FIELDS = ("number", "url", "result", "timestamp", "duration", "building", "description")
+
+# Names of the references to notable builds maintained by Jenkins for each job
+PERMALINKS = ("lastBuild", "lastCompletedBuild", "lastSuccessfulBuild", "lastFailedBuild",
+              "lastStableBuild", "lastUnstableBuild", "lastUnsuccessfulBuild")
+
+# Properties of each permalink loaded by Job.permalinks
+PERMALINKS_TREE = ",".join(i + "[number,url]" for i in PERMALINKS)
 
 
 class Job(PluginBase):
@@ -22,15 +35,32 @@ class Job(PluginBase):
 
     def __eq__(self, other):
         """ Compares an object to the current object and determines if they are the same
+
+        Jobs are identified by their URL, so comparisons do not require any data to be
+        loaded from the server. Jobs compare equal to any :class:`~.handles.JobHandle`
+        referencing the same job.
         """
-        if isinstance(other, Job):
-            return other.name == self._name
+        if isinstance(other, (Job, JobHandle)):
+            return self._identity == other._identity
         return False
 
+    def __ne__(self, other):
+        """ Overrides the default not equal operation
+        """
+        return not self.__eq__(other)
+
     def __hash__(self):
         """ Allows the current object to be hashable
         """
-        return hash(self.name)
+        return hash(self._identity)
+
+    @property
+    def _identity(self):
+        """Gets the normalized URL used to identify this job
+
+        :rtype: :class:`str`
+        """
+        return identity_url(self._controller.url)
 
     @staticmethod
     def create(controller, jenkins_master):
@@ -48,7 +78,7 @@ class Job(PluginBase):
         if plugin is not None:
             return plugin
 
-        node = ElementTree.fromstring(controller.config_xml)
+        node = xmlbackend.parse_root(controller.config_xml)
         plugin_name = get_plugin_name(node)
         raise PluginNotSupportedError("Job plugin {0} not found".format(plugin_name), plugin_name)
 
@@ -66,12 +96,7 @@ class Job(PluginBase):
         :return: An instance of the appropriate derived type for the given job
         :rtype: :class:`~.job.Job`
         """
-        class PartialJob(Job):
-            def __init__(self, local_controller, local_master):
-                super(PartialJob, self).__init__(local_controller, local_master)
-            type = "Undefined"
-
-        retval = PartialJob(controller, jenkins_master)
+        retval = _PartialJob(controller, jenkins_master)
         retval._name = job_name
         return retval
 
@@ -225,38 +250,83 @@ class Job(PluginBase):
         synonymous with the short list provided on the main info
         page for the job on the dashboard.
 
+        Builds are returned as lightweight handles, which only load the details of a build
+        when they are first requested.
+
         :returns: a list of the most recent builds for this job
-        :rtype: :class:`list` of :class:`~.build.Build` objects
+        :rtype: :class:`list` of :class:`~.handles.BuildHandle` objects
         """
         data = self._controller.get_api_data()
 
-        builds = data['builds']
-
-        retval = []
-        for cur_build in builds:
-            temp_data_io = self._controller.clone(cur_build['url'])
-            temp_build = Build(temp_data_io)
-            retval.append(temp_build)
-
-        return retval
+        return [BuildHandle(self._controller, i['url'], i.get('number')) for i in data['builds']]
 
     @property
     def all_builds(self):
         """Gets all recorded builds for this job
 
+        Builds are returned as lightweight handles, which only load the details of a build
+        when they are first requested.
+
         :returns: all recorded builds for this job
-        :rtype: :class:`list` of :class:`~.build.Build` objects
+        :rtype: :class:`list` of :class:`~.handles.BuildHandle` objects
         """
-        data = self._controller.get_api_data(query_params="tree=allBuilds[url]")
+        if not self._controller.tree_queries:
+            # Masters predating 'tree' queries list every build in the default data
+            data = self._controller.get_api_data()
+            return [BuildHandle(self._controller, i['url'], i.get('number')) for i in data['builds']]
+
+        data = self._controller.get_api_data(query_params="tree=allBuilds[number,url]")
+
+        return [BuildHandle(self._controller, i['url'], i.get('number')) for i in data['allBuilds']]
+
+    def builds_summary(self, count, start=0):
+        """Gets the most commonly used properties of the most recent builds of this job
 
-        builds = data['allBuilds']
+        All of the data is loaded using a single request, which is much faster than loading
+        the properties of each :class:`~.build.Build` individually. Long build histories
+        may be loaded a page at a time by increasing `start` on each call.
+
+        :param int count: maximum number of builds to summarize, starting with the most recent
+        :param int start: number of builds to skip, starting with the most recent
+        :returns:
+            one dictionary per build, ordered from the most recent build to the oldest, each
+            containing the 'number', 'url', 'result', 'timestamp', 'duration', 'building' and
+            'description' of the build. Time stamps and durations are in milliseconds.
+        :rtype: :class:`list` of :class:`dict`
+        """
+        if self._controller.tree_queries:
+            query = "tree=allBuilds[{0}]{{{1},{2}}}".format(",".join(BUILD_SUMMARY_FIELDS), start, start + count)
+            builds = self._controller.get_api_data(query_params=query)['allBuilds'][:count]
+        else:
+            # Masters predating 'tree' queries can not select a range of builds
+            builds = self._controller.get_api_data(query_params="depth=1")['builds'][start:start + count]
 
         retval = []
         for cur_build in builds:
-            temp_data_io = self._controller.clone(cur_build['url'])
-            temp_build = Build(temp_data_io)
-            retval.append(temp_build)
+            retval.append(dict((i, cur_build.get(i)) for i in BUILD_SUMMARY_FIELDS))
+        return retval
 
+    @property
+    def permalinks(self):
+        """Gets references to all notable builds of this job, such as the last successful build
+
+        All references are loaded using a single request, so this is more efficient than
+        using several of the individual properties such as :py:meth:`.last_good_build`.
+        Builds are returned as lightweight handles, which only load the build they
+        reference if an attribute other than the number or URL is accessed.
+
+        :returns:
+            mapping of the names of the permalinks as used by Jenkins, such as 'lastBuild',
+            'lastSuccessfulBuild' and 'lastFailedBuild', to the build they refer to. Permalinks
+            which do not refer to any build, because no such build exists, map to None.
+        :rtype: :class:`dict` of :class:`~.handles.BuildHandle`
+        """
+        data = self._controller.get_api_data(query_params=api_query(self._controller, PERMALINKS_TREE))
+
+        retval = {}
+        for name in PERMALINKS:
+            link = data.get(name)
+            retval[name] = BuildHandle(self._controller, link['url'], link.get('number')) if link else None
         return retval
 
     @property
@@ -463,7 +533,7 @@ class Job(PluginBase):
             If such a build does not exist, returns None
         :rtype: :class:`~.build.Build`
         """
-        temp_data_io = self._controller.clone(self._controller.url + str(build_number))
+        temp_data_io = self._controller.clone(join_url(self._controller.url, str(build_number)))
 
         # Lets try loading data from the given URL to see if it is valid.
         # If it's not valid we'll assume a build with the given number doesn't exist
@@ -480,8 +550,8 @@ class Job(PluginBase):
 
             :param datetime start_time: starting time index for range of builds to find
             :param datetime end_time: ending time index for range of builds to find
-            :returns: a list of 0 or more builds
-            :rtype: :class:`list` of :class:`~.build.Build` objects
+            :returns: a list of 0 or more builds, as lightweight handles
+            :rtype: :class:`list` of :class:`~.handles.BuildHandle` objects
         """
         if start_time > end_time:
             tmp = end_time
@@ -523,6 +593,11 @@ class Job(PluginBase):
         return jxml.builders
 
 
+class _PartialJob(Job):
+    """Job whose type is not known, used internally to operate on jobs without loading their configuration"""
+    type = "Undefined"
+
+
 if __name__ == "__main__":  # pragma: no cover
     for i in Job.supported_types():
         print(i)
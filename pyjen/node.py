@@ -16,7 +16,7 @@ class Node(object):
     methods on the Jenkins class, such as :py:meth:`~.jenkins.Jenkins.find_node`
     """
 
-    def __init__(self, data_io_controller):
+    def __init__(self, data_io_controller, node_data=None):
         """To instantiate an instance of this class using auto-generated
         configuration parameters, see the :py:func:`easy_connect` method
 
@@ -24,8 +24,27 @@ class Node(object):
             class capable of handling common HTTP IO requests sent by this
             object to the Jenkins REST API
         :type data_io_controller: :class:`~.utils.datarequester.DataRequester`
+        :param dict node_data:
+            optional set of node properties pre-loaded from the Jenkins '/computer' API.
+            When provided, the properties of this Node are read from this data rather
+            than from the live server until :py:meth:`.refresh` is called.
         """
         self._data_io = data_io_controller
+        self._data = node_data
+
+    def _get_data(self):
+        """Gets the properties describing this node
+
+        :returns: the pre-loaded node properties if available, otherwise the live data from the server
+        :rtype: :class:`dict`
+        """
+        if self._data is not None:
+            return self._data
+        return self._data_io.get_api_data()
+
+    def refresh(self):
+        """Discards any pre-loaded node properties so subsequent queries load live data from the server"""
+        self._data = None
 
     @property
     def name(self):
@@ -34,7 +53,7 @@ class Node(object):
         :returns: the name of this Node
         :rtype: :class:`str`
         """
-        data = self._data_io.get_api_data()
+        data = self._get_data()
 
         return data['displayName']
 
@@ -45,7 +64,7 @@ class Node(object):
         :returns: True if this Node is offline otherwise False
         :rtype: :class:`bool`
         """
-        data = self._data_io.get_api_data()
+        data = self._get_data()
 
         return data['offline']
 
@@ -58,7 +77,7 @@ class Node(object):
             moment otherwise returns False
         :rtype: :class:`bool`
         """
-        data = self._data_io.get_api_data()
+        data = self._get_data()
         return data['idle']
     
     def toggle_offline(self, message=None):
@@ -78,6 +97,7 @@ class Node(object):
             post_cmd = "/toggleOffline"
 
         self._data_io.post(post_cmd)
+        self.refresh()
 
     def wait_for_idle(self, max_timeout=None):
         """Blocks execution until this Node enters an idle state
@@ -93,6 +113,7 @@ class Node(object):
         :rtype: :class:`bool`
         """
         sleep_duration = 1
+        self.refresh()
 
         if max_timeout is None:
             while not self.is_idle:
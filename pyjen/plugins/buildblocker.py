@@ -1,5 +1,5 @@
 """Interfaces for interacting with Build Blockers job property plugin"""
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
 from pyjen.utils.pluginapi import PluginBase
 
 
@@ -39,7 +39,7 @@ class BuildBlockerProperty(PluginBase):
         """
         node = self._root.find("blockingJobs")
         if node is None:
-            node = ElementTree.SubElement(self._root, 'blockingJobs')
+            node = xmlbackend.SubElement(self._root, 'blockingJobs')
         node.text = "\n".join(new_blockers)
 
     @property
@@ -56,14 +56,14 @@ class BuildBlockerProperty(PluginBase):
         """Enables this set of build blockers"""
         node = self._root.find("useBuildBlocker")
         if node is None:
-            node = ElementTree.SubElement(self._root, 'useBuildBlocker')
+            node = xmlbackend.SubElement(self._root, 'useBuildBlocker')
         node.text = "true"
 
     def disable(self):
         """Disables this set of build blockers"""
         node = self._root.find("useBuildBlocker")
         if node is None:
-            node = ElementTree.SubElement(self._root, 'useBuildBlocker')
+            node = xmlbackend.SubElement(self._root, 'useBuildBlocker')
         node.text = "false"
 
 
@@ -2,8 +2,46 @@
 from pyjen.view import View
 from pyjen.utils.viewxml import ViewXML
 from pyjen.exceptions import NestedViewCreationError
+from pyjen.handles import ViewHandle
+from pyjen.utils.capabilities import api_query
 import json
 
+# Default number of levels of sub-views loaded by a single request when walking the view tree
+DEFAULT_VIEW_TREE_DEPTH = 5
+
+
+def _view_tree_query(controller, depth):
+    """Generates the API query used to load a tree of nested views in a single request
+
+    :param controller: connection to the view at the root of the tree
+    :type controller: :class:`~.utils.datarequester.DataRequester`
+    :param int depth: number of levels of sub-views to load
+    :returns: the query parameters, or None if the default data contains the requested views
+    :rtype: :class:`str`
+    """
+    retval = "name,url,_class"
+    for _ in range(depth - 1):
+        retval = "name,url,_class,views[" + retval + "]"
+    return api_query(controller, "views[" + retval + "]", depth - 1)
+
+
+def _create_handles(controller, jenkins_master, raw_views):
+    """Converts the raw view tree loaded from the Jenkins API into view handles
+
+    :param controller: IO interface used to create connections to the views when needed
+    :param jenkins_master: Jenkins instance containing the views
+    :param list raw_views: view data loaded from the API
+    :rtype: :class:`list` of :class:`~.handles.ViewHandle`
+    """
+    retval = []
+    for cur_view in raw_views:
+        children = None
+        if 'views' in cur_view:
+            children = _create_handles(controller, jenkins_master, cur_view['views'])
+        retval.append(ViewHandle(controller, jenkins_master, cur_view['name'], cur_view['url'],
+                                 cur_view.get('_class'), children))
+    return retval
+
 
 class NestedView(View):
     """Interface to Jenkins views of type "NestedView"
@@ -93,21 +131,54 @@ class NestedView(View):
                 return True
         return False
 
+    def view_tree(self, max_depth=DEFAULT_VIEW_TREE_DEPTH):
+        """Loads the tree of views contained within this view using a single request
+
+        Views are returned as lightweight handles, which only load the configuration of
+        the view they reference if an attribute other than the name, URL, type or child
+        views is accessed.
+
+        :param int max_depth: maximum number of levels of sub-views to load
+        :returns:
+            handles for the views directly contained within this view. The children of views
+            that support sub-views are populated, up to the given depth.
+        :rtype: :class:`list` of :class:`~.handles.ViewHandle`
+        """
+        data = self._controller.get_api_data(query_params=_view_tree_query(self._controller, max_depth))
+        return _create_handles(self._controller, self._master, data['views'])
+
     @property
     def all_views(self):
         """Gets all views contained within this view and it's children, recursively
 
+        The view hierarchy is loaded using as few requests as possible, and the returned
+        views are lightweight handles which only load their configuration when needed.
+
         :returns: list of all views contained within this view and it's children, recursively
-        :rtype: :class:`list`
+        :rtype: :class:`list` of :class:`~.handles.ViewHandle`
         """
-        temp = self.views
+        return self._flatten(self.view_tree())
 
-        retval = []
-        for cur_view in temp:
-            if cur_view.type == self.type:
-                retval.extend(cur_view.all_views)
+    def _flatten(self, handles):
+        """Generates a flat list of all views from a tree of view handles
+
+        Any nested views at the bottom of the tree whose children were not loaded
+        will have their own sub-trees loaded as needed.
 
-        retval.extend(temp)
+        :param list handles: the handles to process
+        :rtype: :class:`list` of :class:`~.handles.ViewHandle`
+        """
+        retval = []
+        for cur_view in handles:
+            children = cur_view.children
+            if children is None and cur_view.type == self.type:
+                sub_view_io = self._controller.clone(cur_view.url)
+                data = sub_view_io.get_api_data(query_params=_view_tree_query(sub_view_io, DEFAULT_VIEW_TREE_DEPTH))
+                children = _create_handles(self._controller, self._master, data['views'])
+            if children is not None:
+                retval.extend(self._flatten(children))
+
+        retval.extend(handles)
         return retval
 
     def create_view(self, view_name, view_type):
@@ -1,6 +1,6 @@
 """Primitives for operating on Jenkins post-build publisher of type Parameterized Build Trigger"""
 from pyjen.utils.pluginapi import PluginBase
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
 import logging
 
 log = logging.getLogger(__name__)
@@ -29,7 +29,7 @@ class BuildTriggerConfig(object):
         node = self._root.find('projects')
 
         if node is None:
-            node = ElementTree.SubElement(self._root, 'projects')
+            node = xmlbackend.SubElement(self._root, 'projects')
 
         node.text = ",".join(triggered_jobs)
 
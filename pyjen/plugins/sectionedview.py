@@ -2,7 +2,7 @@
 from pyjen.view import View
 from pyjen.utils.viewxml import ViewXML
 from pyjen.utils.pluginapi import create_xml_plugin, PluginBase, get_plugin_name
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
 import logging
 
 log = logging.getLogger(__name__)  # pylint: disable=C0103
@@ -69,7 +69,7 @@ class ListViewSection(PluginBase):
         """
         regex_node = self._root.find("includeRegex")
         if regex_node is None:
-            regex_node = ElementTree.SubElement(self._root, 'includeRegex')
+            regex_node = xmlbackend.SubElement(self._root, 'includeRegex')
         regex_node.text = new_regex
 
 
@@ -0,0 +1,291 @@
+"""Detection of changes to the jobs and nodes managed by a Jenkins master
+
+Jenkins does not notify clients when its state changes, so tools which need to react to new
+builds or failing agents must poll the master. A :class:`Poller` periodically loads a compact
+:class:`Snapshot` of the master, using one request for the state of all jobs and one for the
+state of all nodes, compares it to the previous snapshot, and passes an :class:`Event` describing
+each change to every subscriber. Any number of subscribers may share a single poller, so
+the load placed on the master does not grow with the number of tools watching it.
+
+**Example:** printing the result of every build as it finishes ::
+
+    from pyjen.jenkins import Jenkins
+    from pyjen.poller import Poller, BUILD_FINISHED
+
+    def on_finished(event):
+        print(event.name, event.new, event.snapshot["color"])
+
+    jenkins = Jenkins.easy_connect("http://localhost:8080")
+    with Poller(jenkins, interval=30) as poller:
+        poller.subscribe(on_finished, [BUILD_FINISHED])
+        # ... do other work while events are delivered ...
+"""
+import time
+import logging
+import threading
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Types of events produced by a Poller
+JOB_ADDED = "job_added"
+JOB_REMOVED = "job_removed"
+BUILD_STARTED = "build_started"
+BUILD_FINISHED = "build_finished"
+COLOR_CHANGED = "color_changed"
+JOB_QUEUED = "job_queued"
+JOB_DEQUEUED = "job_dequeued"
+NODE_ADDED = "node_added"
+NODE_REMOVED = "node_removed"
+NODE_OFFLINE = "node_offline"
+NODE_ONLINE = "node_online"
+
+# Default time, in seconds, between polls of the master
+DEFAULT_INTERVAL = 60
+
+
+class Event(object):
+    """Description of a single change detected between two snapshots of a Jenkins master"""
+
+    def __init__(self, kind, name, old=None, new=None, snapshot=None):
+        """
+        :param str kind: type of change, such as :py:data:`BUILD_STARTED`
+        :param str name: name of the job or node which changed
+        :param old:
+            the previous value of the property which changed, such as the number of the last
+            build or the color of the job, or None for entities which were added
+        :param new: the new value of the property which changed, or None for entities which were removed
+        :param dict snapshot:
+            the current state of the job, as produced by :py:meth:`~.jenkins.Jenkins.jobs_summary`,
+            or of the node, as stored in a :class:`Snapshot`. For removed entities, this is their last known state.
+        """
+        self.kind = kind
+        self.name = name
+        self.old = old
+        self.new = new
+        self.snapshot = snapshot
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return False
+        return (self.kind, self.name, self.old, self.new) == (other.kind, other.name, other.old, other.new)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.kind, self.name, self.old, self.new))
+
+    def __repr__(self):
+        return "<Event {0} {1}: {2!r} -> {3!r}>".format(self.kind, self.name, self.old, self.new)
+
+
+def _is_newer_build(old, new):
+    """Checks whether a build number reported by a job refers to a more recent build than before
+
+    Build numbers decrease, or become None, when builds are deleted from the history of a
+    job, which must not be mistaken for a new build.
+
+    :param int old: the previous build number, or None if the job had no such build
+    :param int new: the current build number, or None if the job has no such build
+    :rtype: :class:`bool`
+    """
+    if new is None:
+        return False
+    return old is None or new > old
+
+
+class Snapshot(object):
+    """Compact description of the state of all jobs and nodes managed by a Jenkins master"""
+
+    def __init__(self, jobs, nodes=None, timestamp=None):
+        """
+        :param list jobs: state of each job, as produced by :py:meth:`~.jenkins.Jenkins.jobs_summary`
+        :param dict nodes:
+            mapping of node names to dictionaries describing whether each node is 'offline' and,
+            if so, the 'reason' it was taken offline. None if the state of the nodes is not tracked.
+        :param float timestamp: time the snapshot was taken, in seconds since the epoch. Defaults to now.
+        """
+        self.jobs = dict((i['name'], i) for i in jobs)
+        self.nodes = nodes
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @staticmethod
+    def load(jenkins, include_nodes=True):
+        """Loads the current state of a Jenkins master
+
+        :param jenkins: the master to query
+        :type jenkins: :class:`~.jenkins.Jenkins`
+        :param bool include_nodes: True to load the state of all nodes, which requires a second request
+        :rtype: :class:`.Snapshot`
+        """
+        nodes = None
+        if include_nodes:
+            fleet = jenkins.fleet
+            reasons = fleet.offline_reasons
+            nodes = dict((i, {'offline': i in reasons, 'reason': reasons.get(i, "")}) for i in fleet.node_names)
+        return Snapshot(jenkins.jobs_summary(), nodes)
+
+    def diff(self, newer):
+        """Gets the changes made to the master between this snapshot and a more recent one
+
+        Changes to nodes are only reported if both snapshots include the state of the nodes.
+        Builds are only reported as started or finished when the number of the last build
+        increases, so deleting builds from the history of a job does not produce any events.
+
+        :param newer: the more recent snapshot
+        :type newer: :class:`.Snapshot`
+        :returns: one event per change, with job events preceding node events
+        :rtype: :class:`list` of :class:`.Event`
+        """
+        retval = []
+        for name, old in self.jobs.items():
+            if name not in newer.jobs:
+                retval.append(Event(JOB_REMOVED, name, old=old['url'], snapshot=old))
+
+        for name, new in newer.jobs.items():
+            old = self.jobs.get(name)
+            if old is None:
+                retval.append(Event(JOB_ADDED, name, new=new['url'], snapshot=new))
+                continue
+            if _is_newer_build(old['lastBuild'], new['lastBuild']):
+                retval.append(Event(BUILD_STARTED, name, old['lastBuild'], new['lastBuild'], new))
+            if _is_newer_build(old['lastCompletedBuild'], new['lastCompletedBuild']):
+                retval.append(Event(BUILD_FINISHED, name, old['lastCompletedBuild'], new['lastCompletedBuild'], new))
+            if new['color'] != old['color']:
+                retval.append(Event(COLOR_CHANGED, name, old['color'], new['color'], new))
+            if new['inQueue'] != old['inQueue']:
+                retval.append(Event(JOB_QUEUED if new['inQueue'] else JOB_DEQUEUED, name,
+                                    old['inQueue'], new['inQueue'], new))
+
+        if self.nodes is None or newer.nodes is None:
+            return retval
+
+        for name, old in self.nodes.items():
+            if name not in newer.nodes:
+                retval.append(Event(NODE_REMOVED, name, snapshot=old))
+
+        for name, new in newer.nodes.items():
+            old = self.nodes.get(name)
+            if old is None:
+                retval.append(Event(NODE_ADDED, name, snapshot=new))
+                if new['offline']:
+                    retval.append(Event(NODE_OFFLINE, name, None, new['reason'], new))
+            elif new['offline'] != old['offline']:
+                if new['offline']:
+                    retval.append(Event(NODE_OFFLINE, name, None, new['reason'], new))
+                else:
+                    retval.append(Event(NODE_ONLINE, name, old['reason'], None, new))
+        return retval
+
+
+class Poller(object):
+    """Periodically checks a Jenkins master for changes, notifying subscribers of each change
+
+    The first poll records the initial state of the master without producing any events.
+    Polling may be driven explicitly, by calling :py:meth:`.poll`, or by a background thread
+    started with :py:meth:`.start`. Subscribers are called from the thread doing the polling,
+    and exceptions they raise are logged and otherwise ignored.
+    """
+
+    def __init__(self, jenkins, interval=DEFAULT_INTERVAL, include_nodes=True):
+        """
+        :param jenkins: the master to watch
+        :type jenkins: :class:`~.jenkins.Jenkins`
+        :param float interval: time, in seconds, between polls made by the background thread
+        :param bool include_nodes: True to watch the state of nodes as well as jobs
+        """
+        self._jenkins = jenkins
+        self.interval = interval
+        self._include_nodes = include_nodes
+        self._lock = threading.Lock()
+        self._subscribers = ()
+        self._snapshot = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def snapshot(self):
+        """Gets the state of the master loaded by the most recent poll
+
+        :returns: the most recent snapshot, or None if the master has not been polled yet
+        :rtype: :class:`.Snapshot`
+        """
+        return self._snapshot
+
+    def subscribe(self, callback, kinds=None):
+        """Registers a callback to be notified of changes to the master
+
+        :param callback: callable taking a single :class:`.Event` parameter
+        :param kinds: types of events to deliver to the callback, such as :py:data:`BUILD_FINISHED`. Defaults to all events.
+        """
+        kinds = None if kinds is None else frozenset(kinds)
+        with self._lock:
+            self._subscribers = self._subscribers + ((callback, kinds),)
+
+    def unsubscribe(self, callback):
+        """Unregisters a callback previously registered with :py:meth:`.subscribe`
+
+        :param callback: the callback to remove
+        """
+        with self._lock:
+            self._subscribers = tuple(i for i in self._subscribers if i[0] is not callback)
+
+    def poll(self):
+        """Loads the current state of the master and notifies subscribers of any changes
+
+        :returns: the changes detected since the previous poll
+        :rtype: :class:`list` of :class:`.Event`
+        """
+        newer = Snapshot.load(self._jenkins, self._include_nodes)
+        older, self._snapshot = self._snapshot, newer
+        if older is None:
+            return []
+
+        events = older.diff(newer)
+        subscribers = self._subscribers
+        for event in events:
+            for callback, kinds in subscribers:
+                if kinds is not None and event.kind not in kinds:
+                    continue
+                try:
+                    callback(event)
+                except Exception:  # pylint: disable=W0703
+                    log.exception("Event subscriber failed")
+        return events
+
+    def _run(self):
+        """Polls the master until the poller is stopped"""
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:  # pylint: disable=W0703
+                log.exception("Failed to poll the Jenkins master")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Starts polling the master from a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pyjen-poller")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread started by :py:meth:`.start`, waiting for any poll in progress to finish"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
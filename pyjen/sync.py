@@ -0,0 +1,226 @@
+"""Incremental synchronization of build histories
+
+Tools which collect metrics about builds periodically need to know which builds have been
+started, or have finished, since they last checked. A :class:`BuildSync` remembers the most
+recent build seen for each job, along with any builds which were still running, in a local
+database. Each synchronization then loads only the builds which are new or whose state may
+have changed, using range queries, and skips jobs with no new builds altogether.
+
+**Example:** collecting new builds every minute ::
+
+    import time
+    from pyjen.jenkins import Jenkins
+    from pyjen.sync import BuildSync
+
+    jenkins = Jenkins.easy_connect("http://localhost:8080")
+    sync = BuildSync(jenkins, "~/.pyjen_sync.db")
+    while True:
+        for job_name, builds in sync.sync().items():
+            for build in builds:
+                print(job_name, build["number"], build["result"])
+        time.sleep(60)
+"""
+import os
+import sqlite3
+import logging
+import threading
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Number of builds loaded by each request when synchronizing a job
+DEFAULT_PAGE_SIZE = 100
+
+
+class SyncState(object):
+    """Persistent record of the builds already seen for each job
+
+    The state is stored in a SQLite database. Instances of this class are safe to share between threads.
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        :param str path: location of the database file, which is created if it does not exist. Defaults to an in-memory database.
+        """
+        self._path = path if path == ":memory:" else os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self._path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS jobs (name TEXT PRIMARY KEY, high_water INTEGER)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS pending (job TEXT, number INTEGER, PRIMARY KEY (job, number))")
+        self._db.commit()
+
+    def load(self, job_name):
+        """Gets the builds already seen for a job
+
+        :param str job_name: name of the job
+        :returns:
+            2-tuple containing the number of the most recent build seen, or None if the job has
+            never been synchronized, and the set of numbers of the builds which were still running
+        :rtype: :class:`tuple`
+        """
+        with self._lock:
+            row = self._db.execute("SELECT high_water FROM jobs WHERE name = ?", (job_name,)).fetchone()
+            pending = self._db.execute("SELECT number FROM pending WHERE job = ?", (job_name,)).fetchall()
+        return (None if row is None else row[0]), set(i[0] for i in pending)
+
+    def save(self, job_name, high_water, pending):
+        """Records the builds seen for a job
+
+        :param str job_name: name of the job
+        :param int high_water: number of the most recent build seen, or 0 if the job has no builds
+        :param set pending: numbers of the builds which are still running
+        """
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO jobs (name, high_water) VALUES (?, ?)", (job_name, high_water))
+            self._db.execute("DELETE FROM pending WHERE job = ?", (job_name,))
+            self._db.executemany("INSERT INTO pending (job, number) VALUES (?, ?)",
+                                 [(job_name, i) for i in sorted(pending)])
+            self._db.commit()
+
+    def forget(self, job_name):
+        """Discards the record of the builds seen for a job
+
+        :param str job_name: name of the job
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE name = ?", (job_name,))
+            self._db.execute("DELETE FROM pending WHERE job = ?", (job_name,))
+            self._db.commit()
+
+    @property
+    def job_names(self):
+        """Gets the names of all jobs with a record of the builds seen
+
+        :rtype: :class:`set` of :class:`str`
+        """
+        with self._lock:
+            return set(i[0] for i in self._db.execute("SELECT name FROM jobs").fetchall())
+
+    def close(self):
+        """Closes the database backing this object"""
+        with self._lock:
+            self._db.close()
+
+
+class BuildSync(object):
+    """Loads the builds started or finished since the previous synchronization
+
+    Builds are described using the dictionaries produced by :py:meth:`~.job.Job.builds_summary`.
+    Builds which are still running when first seen are reported again once they finish, so
+    the final result of every build is reported exactly once.
+    """
+
+    def __init__(self, jenkins, state_path=":memory:", page_size=DEFAULT_PAGE_SIZE, initial_builds=None):
+        """
+        :param jenkins: the Jenkins master to load builds from
+        :type jenkins: :class:`~.jenkins.Jenkins`
+        :param str state_path: location of the database recording the builds already seen. Defaults to an in-memory database.
+        :param int page_size: maximum number of builds to load with each request
+        :param int initial_builds:
+            maximum number of builds to load for jobs which have never been synchronized,
+            starting from the most recent. Defaults to all builds.
+        """
+        self._jenkins = jenkins
+        self._state = SyncState(state_path)
+        self._page_size = page_size
+        self._initial_builds = initial_builds
+
+    @property
+    def state(self):
+        """Gets the record of the builds already seen for each job
+
+        :rtype: :class:`.SyncState`
+        """
+        return self._state
+
+    def sync(self):
+        """Loads the new and newly finished builds of every job on the master
+
+        The state of all jobs is loaded with a single request, after which only jobs with
+        new builds, or builds which were still running, are queried further. The records of
+        jobs which no longer exist are discarded.
+
+        :returns: mapping of the names of jobs with new or newly finished builds to a list of those builds, oldest first
+        :rtype: :class:`dict`
+        """
+        retval = {}
+        found = set()
+        for summary in self._jenkins.jobs_summary():
+            job_name = summary['name']
+            found.add(job_name)
+            high_water, pending = self._state.load(job_name)
+            last_build = summary['lastBuild'] or 0
+            if high_water is not None and last_build <= high_water and not pending:
+                continue
+
+            job = self._jenkins.partial_job(summary['url'], job_name)
+            builds = self.sync_job(job, last_build)
+            if builds:
+                retval[job_name] = builds
+
+        for job_name in self._state.job_names - found:
+            log.debug("Discarding synchronization state of deleted job " + job_name)
+            self._state.forget(job_name)
+        return retval
+
+    def sync_job(self, job, last_build=None):
+        """Loads the new and newly finished builds of a job
+
+        Builds are loaded from the most recent down to the oldest build which was still
+        running at the time of the previous synchronization, or to the most recent build
+        seen if none were running.
+
+        :param job: the job to synchronize
+        :type job: :class:`~.job.Job`
+        :param int last_build:
+            number of the most recent build of the job, if known, used to avoid loading
+            more builds than necessary
+        :returns: the new and newly finished builds, oldest first
+        :rtype: :class:`list` of :class:`dict`
+        """
+        job_name = job.name
+        high_water, pending = self._state.load(job_name)
+        floor = min(pending) if pending else high_water
+        limit = self._initial_builds if high_water is None else None
+
+        count = self._page_size
+        if floor is not None and last_build is not None:
+            count = max(1, min(count, last_build - floor + 1))
+
+        retval = []
+        still_pending = set()
+        new_high_water = high_water or 0
+        loaded = 0
+        done = False
+        while not done:
+            if limit is not None:
+                count = min(count, limit - loaded)
+                if count <= 0:
+                    break
+            page = job.builds_summary(count, loaded)
+            loaded += len(page)
+            for cur_build in page:
+                number = cur_build['number']
+                if floor is not None and number < floor:
+                    done = True
+                    break
+                new_high_water = max(new_high_water, number)
+                if cur_build['building']:
+                    still_pending.add(number)
+                if high_water is None or number > high_water:
+                    retval.append(cur_build)
+                elif number in pending and not cur_build['building']:
+                    retval.append(cur_build)
+                if number == floor:
+                    done = True
+                    break
+            if len(page) < count:
+                break
+            count = self._page_size
+
+        self._state.save(job_name, new_high_water, still_pending)
+        retval.reverse()
+        return retval
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
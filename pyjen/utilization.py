@@ -0,0 +1,364 @@
+"""Primitives for sampling the executor utilization of Jenkins build agents over time"""
+from __future__ import division
+import csv
+import json
+import time
+import threading
+import logging
+from array import array
+from pyjen.utils import stats
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+
+class RingBuffer(object):
+    """Fixed capacity circular buffer of numeric samples stored in a contiguous array
+
+    Once the buffer is full each new sample overwrites the oldest one.
+    """
+
+    def __init__(self, capacity, typecode="d"):
+        """
+        :param int capacity: maximum number of samples retained by the buffer
+        :param str typecode: :mod:`array` type code describing the type of the samples
+        """
+        self._data = array(typecode, [0]) * capacity
+        self._capacity = capacity
+        self._count = 0
+        self._next = 0
+
+    def append(self, value):
+        """Adds a new sample to the buffer, discarding the oldest sample if the buffer is full
+
+        :param value: the new sample
+        """
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    @property
+    def capacity(self):
+        """Gets the maximum number of samples retained by this buffer
+
+        :rtype: :class:`int`
+        """
+        return self._capacity
+
+    def __len__(self):
+        return self._count
+
+    def to_list(self):
+        """Gets the samples currently stored in the buffer
+
+        :returns: all samples in the buffer, ordered from oldest to newest
+        :rtype: :class:`list`
+        """
+        if self._count < self._capacity:
+            return self._data[:self._count].tolist()
+        return self._data[self._next:].tolist() + self._data[:self._next].tolist()
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+
+class UtilizationSeries(object):
+    """Time series of the busy and total executor counts for a node, a label, or an entire fleet"""
+
+    def __init__(self, capacity, padding=0):
+        """
+        :param int capacity: maximum number of samples retained by the series
+        :param int padding:
+            number of empty samples to pre-populate the series with, used to align
+            new series with those that have already been collecting samples
+        """
+        self._busy = RingBuffer(capacity, "l")
+        self._total = RingBuffer(capacity, "l")
+        for _ in range(min(padding, capacity)):
+            self.append(0, 0)
+
+    def append(self, busy, total):
+        """Records a new sample
+
+        :param int busy: number of executors running builds
+        :param int total: total number of executors available
+        """
+        self._busy.append(busy)
+        self._total.append(total)
+
+    @property
+    def busy(self):
+        """Gets the number of busy executors at each sample, from oldest to newest
+
+        :rtype: :class:`list` of :class:`int`
+        """
+        return self._busy.to_list()
+
+    @property
+    def total(self):
+        """Gets the total number of executors at each sample, from oldest to newest
+
+        :rtype: :class:`list` of :class:`int`
+        """
+        return self._total.to_list()
+
+    @property
+    def ratios(self):
+        """Gets the fraction of executors in use at each sample, from oldest to newest
+
+        :returns:
+            utilization ratios between 0 and 1. Samples taken while no executors
+            were available are reported as None.
+        :rtype: :class:`list` of :class:`float`
+        """
+        retval = []
+        for busy, total in zip(self._busy, self._total):
+            retval.append(busy / total if total else None)
+        return retval
+
+    def mean(self):
+        """Gets the average utilization across all samples
+
+        :returns: average utilization ratio, or None if no executors were available in any sample
+        :rtype: :class:`float`
+        """
+        values = [i for i in self.ratios if i is not None]
+        if not values:
+            return None
+        return sum(values) / len(values)
+
+    def percentile(self, pct):
+        """Gets a percentile of the utilization across all samples
+
+        :param float pct: the percentile to calculate, between 0 and 100
+        :returns: the requested percentile of the utilization ratio, or None if there is no data
+        :rtype: :class:`float`
+        """
+        return stats.percentile(sorted(i for i in self.ratios if i is not None), pct)
+
+    def rolling_average(self, window):
+        """Gets the average utilization over a trailing window ending at each sample
+
+        :param int window: number of samples to average over
+        :returns:
+            the average utilization ratio at each sample, from oldest to newest. Samples
+            for which there is no data in the window are reported as None
+        :rtype: :class:`list` of :class:`float`
+        """
+        retval = []
+        ratios = self.ratios
+        for i in range(len(ratios)):
+            values = [j for j in ratios[max(0, i - window + 1):i + 1] if j is not None]
+            retval.append(sum(values) / len(values) if values else None)
+        return retval
+
+
+class UtilizationSampler(object):
+    """Periodically samples the executor utilization of all nodes managed by a Jenkins master
+
+    Each sample is loaded using a single request via the :class:`~.fleet.Fleet` snapshot,
+    and recorded per node, per label and for the fleet as a whole in fixed capacity, array
+    backed ring buffers. Samples can be collected explicitly with :py:meth:`.sample` or
+    in a background thread using :py:meth:`.start` and :py:meth:`.stop`. Offline nodes are
+    recorded as having no executors, matching :py:meth:`~.fleet.Fleet.total_executors`.
+
+    **Example:** sample utilization once per minute for an hour ::
+
+        sampler = UtilizationSampler(jenkins.fleet, interval=60, capacity=60)
+        sampler.run(60)
+        print(sampler.labels['linux'].percentile(95))
+    """
+
+    def __init__(self, fleet, interval=60, capacity=1440):
+        """
+        :param fleet: object used to load the state of all nodes on the master
+        :type fleet: :class:`~.fleet.Fleet`
+        :param float interval: time, in seconds, between samples
+        :param int capacity: maximum number of samples to retain
+        """
+        self._fleet = fleet
+        self._interval = interval
+        self._capacity = capacity
+        self._timestamps = RingBuffer(capacity, "d")
+        self._fleet_series = UtilizationSeries(capacity)
+        self._nodes = {}
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def interval(self):
+        """Gets the time, in seconds, between samples
+
+        :rtype: :class:`float`
+        """
+        return self._interval
+
+    @property
+    def timestamps(self):
+        """Gets the time at which each sample was taken, from oldest to newest
+
+        :returns: sample times in seconds since the epoch
+        :rtype: :class:`list` of :class:`float`
+        """
+        return self._timestamps.to_list()
+
+    @property
+    def fleet(self):
+        """Gets the utilization of all executors across all nodes
+
+        :rtype: :class:`.UtilizationSeries`
+        """
+        return self._fleet_series
+
+    @property
+    def nodes(self):
+        """Gets the utilization of each node
+
+        :returns: mapping of node names to their utilization series
+        :rtype: :class:`dict`
+        """
+        return dict(self._nodes)
+
+    @property
+    def labels(self):
+        """Gets the utilization of all nodes associated with each label
+
+        :returns: mapping of label names to their utilization series
+        :rtype: :class:`dict`
+        """
+        return dict(self._labels)
+
+    @staticmethod
+    def _record(series_map, counts, capacity, padding):
+        """Appends a new sample to each series in a set, creating new series as needed
+
+        :param dict series_map: the series to update, keyed by name
+        :param dict counts: mapping of names to 2-tuples of busy and total executor counts
+        :param int capacity: capacity of any newly created series
+        :param int padding: number of samples already recorded by existing series
+        """
+        for name in counts:
+            if name not in series_map:
+                series_map[name] = UtilizationSeries(capacity, padding)
+        for name, series in series_map.items():
+            busy, total = counts.get(name, (0, 0))
+            series.append(busy, total)
+
+    def record(self, fleet, timestamp=None):
+        """Records the utilization described by a fleet snapshot
+
+        :param fleet: snapshot of the state of all nodes
+        :type fleet: :class:`~.fleet.Fleet`
+        :param float timestamp: time at which the snapshot was taken. Defaults to the current time.
+        """
+        # The executors of offline nodes can not be used, so they are excluded from all totals
+        offline = set(fleet.offline_nodes)
+        node_counts = dict((name, (0, 0) if name in offline else counts)
+                           for name, counts in fleet.executor_counts.items())
+        label_counts = {}
+        for label, node_names in fleet.labels.items():
+            busy = sum(node_counts[i][0] for i in node_names)
+            total = sum(node_counts[i][1] for i in node_names)
+            label_counts[label] = (busy, total)
+
+        with self._lock:
+            padding = len(self._timestamps)
+            self._timestamps.append(timestamp if timestamp is not None else time.time())
+            self._fleet_series.append(sum(i[0] for i in node_counts.values()),
+                                      sum(i[1] for i in node_counts.values()))
+            self._record(self._nodes, node_counts, self._capacity, padding)
+            self._record(self._labels, label_counts, self._capacity, padding)
+
+    def sample(self):
+        """Loads the current state of all nodes from the master and records their utilization"""
+        self._fleet.refresh()
+        self.record(self._fleet)
+
+    def run(self, count):
+        """Collects a fixed number of samples, blocking until they have all been collected
+
+        :param int count: number of samples to collect
+        """
+        next_sample = time.time()
+        for i in range(count):
+            self.sample()
+            if i == count - 1:
+                break
+            next_sample += self._interval
+            if self._stop_event.wait(max(0, next_sample - time.time())):
+                break
+
+    def start(self):
+        """Starts collecting samples in a background thread"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread started by :py:meth:`.start`, waiting for it to finish"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _sample_loop(self):
+        """Entry point for the background sampling thread"""
+        next_sample = time.time()
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception:  # pylint: disable=W0703
+                log.exception("Failed to sample node utilization")
+            next_sample += self._interval
+            self._stop_event.wait(max(0, next_sample - time.time()))
+
+    def to_csv(self, out_file):
+        """Writes all recorded samples to a file in CSV format
+
+        Each row describes one sample for one node, label or the fleet as a whole, with the
+        columns 'timestamp', 'kind', 'name', 'busy' and 'total'.
+
+        :param out_file: file-like object to write the CSV data to
+        """
+        writer = csv.writer(out_file)
+        writer.writerow(["timestamp", "kind", "name", "busy", "total"])
+        with self._lock:
+            timestamps = self._timestamps.to_list()
+            groups = [("fleet", {"": self._fleet_series}), ("node", self._nodes), ("label", self._labels)]
+            for kind, series_map in groups:
+                for name in sorted(series_map):
+                    series = series_map[name]
+                    for row in zip(timestamps, series.busy, series.total):
+                        writer.writerow([row[0], kind, name, row[1], row[2]])
+
+    def to_json(self):
+        """Generates a JSON document describing all recorded samples
+
+        :returns:
+            JSON encoded object with a 'timestamps' list, plus 'fleet', 'nodes' and 'labels'
+            entries containing lists of 'busy' and 'total' executor counts aligned with the timestamps
+        :rtype: :class:`str`
+        """
+        def encode(series):
+            """Converts a utilization series into a JSON compatible object"""
+            return {"busy": series.busy, "total": series.total}
+
+        with self._lock:
+            data = {
+                "interval": self._interval,
+                "timestamps": self._timestamps.to_list(),
+                "fleet": encode(self._fleet_series),
+                "nodes": dict((name, encode(i)) for name, i in self._nodes.items()),
+                "labels": dict((name, encode(i)) for name, i in self._labels.items()),
+            }
+        return json.dumps(data)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,186 @@
+"""Description of the features supported by a Jenkins master
+
+A :class:`Capabilities` profile is built when first connecting to a master, using inexpensive
+HEAD requests, and is cached for the lifetime of the process so that later operations can
+choose the most efficient way of communicating with the master without probing it again.
+
+**Example:** checking which features a master supports ::
+
+    from pyjen.jenkins import Jenkins
+
+    jenkins = Jenkins.easy_connect("http://localhost:8080")
+    caps = jenkins.capabilities
+    print(caps.version, caps.tree_queries, caps.crumb_required)
+"""
+import logging
+from requests.exceptions import HTTPError
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Value reported when the version of a master can not be determined
+UNKNOWN_VERSION = "Unknown"
+
+# First release supporting the 'tree' query parameter of the REST API. Every release of Jenkins
+# since it was forked from Hudson 1.396 also supports 'logText/progressiveText'.
+TREE_QUERY_MIN_VERSION = (1, 367)
+
+# Minimal query used to check whether the master provides the 'api/json' endpoint
+API_JSON_PROBE = "/api/json?tree=mode"
+
+
+def parse_version(version):
+    """Converts a Jenkins version number to a tuple of integers suitable for comparison
+
+    :param str version: version number, such as '2.60.3' or '2.89-SNAPSHOT'
+    :returns: the numeric components of the version, or an empty tuple if the version is unknown
+    :rtype: :class:`tuple` of :class:`int`
+    """
+    retval = []
+    for part in version.split("-", 1)[0].split("."):
+        if not part.isdigit():
+            break
+        retval.append(int(part))
+    return tuple(retval)
+
+
+class Capabilities(object):
+    """Features supported by a Jenkins master
+
+    Servers which do not identify themselves as Jenkins are assumed to support none of the
+    optional features.
+    """
+
+    def __init__(self, version=UNKNOWN_VERSION, crumb_required=False, url=None, api_json=None):
+        """
+        :param str version: version of Jenkins running on the master
+        :param bool crumb_required: True if the master requires a CSRF crumb to accompany POST requests
+        :param str url: root URL of the master, if known
+        :param bool api_json:
+            True if the master provides the 'api/json' endpoint. If not provided, every
+            Jenkins master is assumed to provide it.
+        """
+        self.version = version
+        self.crumb_required = crumb_required
+        self.url = url
+        self._api_json = api_json
+
+    @property
+    def version_info(self):
+        """Gets the version of Jenkins as a tuple of integers suitable for comparison
+
+        :rtype: :class:`tuple` of :class:`int`
+        """
+        return parse_version(self.version)
+
+    @property
+    def is_jenkins(self):
+        """Checks whether the master identified itself as a Jenkins instance
+
+        :rtype: :class:`bool`
+        """
+        return bool(self.version_info)
+
+    @property
+    def api_json(self):
+        """Checks whether the master provides the 'api/json' endpoint
+
+        :rtype: :class:`bool`
+        """
+        if self._api_json is None:
+            return self.is_jenkins
+        return self._api_json
+
+    @property
+    def progressive_text(self):
+        """Checks whether the master provides incremental console output through 'logText/progressiveText'
+
+        The endpoint only exists for individual builds, so it can not be probed when connecting
+        to the master. It is provided by every release of Jenkins.
+
+        :rtype: :class:`bool`
+        """
+        return self.is_jenkins
+
+    @property
+    def tree_queries(self):
+        """Checks whether the master supports the 'tree' query parameter for selecting parts of the REST API data
+
+        :rtype: :class:`bool`
+        """
+        return self.version_info >= TREE_QUERY_MIN_VERSION
+
+    def to_dict(self):
+        """Gets a summary of the profile suitable for serialization
+
+        :rtype: :class:`dict`
+        """
+        return {
+            "version": self.version,
+            "api_json": self.api_json,
+            "progressive_text": self.progressive_text,
+            "tree_queries": self.tree_queries,
+            "crumb_required": self.crumb_required,
+        }
+
+    def __repr__(self):
+        return "<Capabilities {0}>".format(self.to_dict())
+
+    @staticmethod
+    def probe(data_io):
+        """Determines the features supported by a Jenkins master
+
+        Up to three HEAD requests are sent, none of which requires the master to render more than
+        a single property: one to the dashboard to read the version of Jenkins from the 'X-Jenkins'
+        header, one to the CSRF crumb issuer which only exists when CSRF protection is enabled,
+        and one to the 'api/json' endpoint, which is only probed if the master is Jenkins.
+
+        :param data_io: connection to the root URL of the master
+        :type data_io: :class:`~.datarequester.DataRequester`
+        :rtype: :class:`.Capabilities`
+        """
+        headers = data_io.head()
+        version = headers.get("x-jenkins") or UNKNOWN_VERSION
+
+        try:
+            data_io.head("/crumbIssuer/api/python")
+            crumb_required = True
+        except HTTPError as err:
+            # The crumb issuer is only reachable when CSRF protection is enabled. Any other
+            # error, such as being denied access to it, suggests it exists.
+            crumb_required = err.response is None or err.response.status_code != 404
+
+        api_json = False
+        if parse_version(version):
+            try:
+                data_io.head(API_JSON_PROBE)
+                api_json = True
+            except HTTPError as err:
+                log.debug("The api/json endpoint of {0} is not available: {1}".format(data_io.url, err))
+
+        retval = Capabilities(version, crumb_required, data_io.url, api_json)
+        log.debug("Detected capabilities of {0}: {1}".format(data_io.url, retval))
+        return retval
+
+
+def api_query(data_io, tree, depth=0):
+    """Generates the query used to load part of the REST API data of an entity
+
+    Masters which do not support the 'tree' query parameter are asked for all of the data
+    of the entity down to the given depth instead, which includes the requested properties.
+
+    :param data_io: connection to the entity being queried
+    :type data_io: :class:`~.datarequester.DataRequester`
+    :param str tree: the properties to load, in the format used by the 'tree' query parameter
+    :param int depth: depth of the data which contains all of the requested properties
+    :returns: the query parameters, or None if the default data contains the requested properties
+    :rtype: :class:`str`
+    """
+    if data_io.tree_queries:
+        return "tree=" + tree
+    if depth:
+        return "depth={0}".format(depth)
+    return None
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -1,14 +1,16 @@
 """Primitives for handling direct IO with the Jenkins REST API"""
+import codecs
+import copy
+import functools
 import requests
-import sys
-from pyjen.exceptions import JenkinsFlushFailure
+from requests.exceptions import RequestException
+import time
+import threading
+from pyjen.exceptions import JenkinsFlushFailure, CircuitOpenError, RequestBudgetExceeded
+from pyjen.utils.metrics import RequestEvent, CACHE_HIT, CACHE_MISS
+from pyjen.utils.urls import canonical_url, canonical_host, join_url
 import logging
 
-if sys.version_info.major < 3:
-    from urlparse import urljoin
-else:
-    from urllib.parse import urljoin
-
 # Indicates whether prototype caching logic should be enabled or not
 # WARNING: Do not enable this in a production environment. The caching
 # behavior has not been sufficiently tested for this to be considered
@@ -17,6 +19,130 @@ ENABLE_CACHING = False
 
 log = logging.getLogger(__name__)  # pylint: disable=C0103
 
+# Size, in bytes, of the blocks read from the network by streamed requests
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _InFlightCall(object):
+    """State of a call being executed on behalf of one or more callers by :class:`_SingleFlight`"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _SingleFlight(object):
+    """Coalesces concurrent calls which share the same key into a single call
+
+    While a call for a given key is in progress, other threads requesting the same key
+    wait for it to complete and share its result, rather than repeating the call.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+        self._coalesced = 0
+
+    @property
+    def coalesced(self):
+        """Gets the number of calls which have been answered by sharing the result of another call
+
+        :rtype: :class:`int`
+        """
+        return self._coalesced
+
+    def do(self, key, func):
+        """Executes a function, unless a call with the same key is already in progress
+
+        :param key: hashable value identifying the call
+        :param func: function to call, taking no parameters
+        :returns:
+            2-tuple containing the result of the function, and a boolean which is True if the
+            result was shared from a call made by another thread
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            shared = call is not None
+            if shared:
+                self._coalesced += 1
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+
+        if shared:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class TextStream(object):
+    """Text response from the Jenkins REST API which is decoded incrementally as it is read
+
+    Iterating over a stream yields blocks of text as they are received from the server,
+    decompressed and decoded, so the full response never needs to be held in memory.
+    Streams may be used as context managers, which close the underlying connection on exit.
+    """
+
+    def __init__(self, response, chunk_size=DEFAULT_CHUNK_SIZE, on_close=None):
+        """
+        :param response: response to a request sent with streaming enabled
+        :type response: :class:`requests.Response`
+        :param int chunk_size: number of bytes to read from the network at a time
+        :param on_close:
+            optional callable invoked with the number of bytes of the decompressed body
+            read from the response, the first time the stream is closed
+        """
+        self._response = response
+        self._chunk_size = chunk_size
+        self._on_close = on_close
+        self._bytes_read = 0
+
+    @property
+    def headers(self):
+        """Gets the HTTP header attributes of the response
+
+        :rtype: :class:`dict`
+        """
+        return self._response.headers
+
+    def __iter__(self):
+        decoder = codecs.getincrementaldecoder(self._response.encoding or "utf-8")("replace")
+        try:
+            for chunk in self._response.iter_content(self._chunk_size):
+                self._bytes_read += len(chunk)
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b"", True)
+            if text:
+                yield text
+        finally:
+            self.close()
+
+    def close(self):
+        """Releases the connection used to read the response"""
+        self._response.close()
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close(self._bytes_read)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 class DataRequester (object):
     """Abstraction layer encapsulate all IO requests for the Jenkins REST API"""    
@@ -25,6 +151,17 @@ class DataRequester (object):
     _header_cache = dict()
     _configxml_cache = dict()
     _needs_flush = False
+    _disk_cache = None
+    _single_flight = _SingleFlight()
+    _observers = ()
+    _transport = None
+    _retry_policy = None
+    _circuit_breaker = None
+    _throttles = dict()
+    _capabilities = dict()
+    _crumbs = dict()
+    _sessions = dict()
+    _sessions_lock = threading.Lock()
 
     def __init__(self, jenkins_url, username, password):
         """
@@ -37,7 +174,7 @@ class DataRequester (object):
             for anonymous access.
         """
 
-        self._url = jenkins_url.rstrip("/\\") + "/"
+        self._url = canonical_url(jenkins_url)
         if not username or not password:
             self._credentials = None
         else:
@@ -52,6 +189,28 @@ class DataRequester (object):
         """
         return self._url
     
+    @property
+    def tree_queries(self):
+        """Checks whether the master supports the 'tree' query parameter of the REST API
+
+        Masters whose capabilities have not been detected are assumed to support it.
+
+        :rtype: :class:`bool`
+        """
+        capabilities = DataRequester.get_capabilities(self._url)
+        return capabilities is None or capabilities.tree_queries
+
+    @property
+    def progressive_text(self):
+        """Checks whether the master provides incremental console output through 'logText/progressiveText'
+
+        Masters whose capabilities have not been detected are assumed to provide it.
+
+        :rtype: :class:`bool`
+        """
+        capabilities = DataRequester.get_capabilities(self._url)
+        return capabilities is None or capabilities.progressive_text
+
     @property
     def credentials(self):
         """Gets the authentication credentials used for all IO operations on this object
@@ -69,16 +228,10 @@ class DataRequester (object):
         :returns: new DataRequester object, with settings cloned from this instance
         :rtype: :class:`~.datarequester.DataRequester`
         """
-        
+        retval = copy.copy(self)
         if new_url is not None:
-            clone_url = new_url
-        else:
-            clone_url = self._url
-
-        if self._credentials:
-            return DataRequester (clone_url, self._credentials[0], self._credentials[1])
-        else:
-            return DataRequester (clone_url, None, None)
+            retval._url = canonical_url(new_url)
+        return retval
         
     def get_text(self, path=None):
         """ gets the raw text data from a Jenkins URL
@@ -90,9 +243,7 @@ class DataRequester (object):
         :rtype: :class:`str`
         
         """
-        tmp = self._url
-        if path is not None:
-            tmp = urljoin(tmp, path.lstrip("/\\"))  
+        tmp = join_url(self._url, path)
         
         return self._get_raw_text(tmp)
     
@@ -104,11 +255,36 @@ class DataRequester (object):
         :rtype: :class:`str`
         """
         if url in DataRequester._text_cache:
-            return DataRequester._text_cache[url]
+            retval = DataRequester._text_cache[url]
+            self._notify("GET", url, num_bytes=len(retval), cache=CACHE_HIT)
+            return retval
+
+        # Requests are only shared between requesters using the same credentials, since the
+        # data returned by the server depends on the permissions of the user
+        retval, shared = DataRequester._single_flight.do(("text", url, self._credentials),
+                                                         lambda: self._load_text(url))
+        if shared:
+            self._notify("GET", url, num_bytes=len(retval), cache=CACHE_HIT, coalesced=True)
+        return retval
 
+    def _load_text(self, url):
+        """loads the raw text output from a specified HTTP URL, bypassing the in-memory cache
+
+        :param str url: the full HTTP URL to be polled
+        :returns:  Text returned from the given URL
+        :rtype: :class:`str`
+        """
         log.debug("Text cache miss: " + url)
 
-        req = requests.get(url, auth=self._credentials)
+        disk_cache = DataRequester._disk_cache
+        if disk_cache is not None:
+            retval = disk_cache.get(url)
+            if retval is not None:
+                log.debug("Disk cache hit: " + url)
+                self._notify("GET", url, num_bytes=len(retval), cache=CACHE_HIT)
+                return retval
+
+        req = self._send("GET", url)
         
         if req.status_code != 200:
             log.debug("Error getting raw text from URL: " + url)
@@ -119,11 +295,184 @@ class DataRequester (object):
             log.debug("Details: " + str(req))
             req.raise_for_status()
 
+        # Decoding the response is costly for large payloads, so make sure it is only done once
+        retval = req.text
+
         if ENABLE_CACHING:
-            DataRequester._text_cache[url] = req.text
+            DataRequester._text_cache[url] = retval
+
+        if disk_cache is not None:
+            disk_cache.store(url, retval)
+
+        return retval
 
-        return req.text
+    def stream_text(self, path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Gets the raw text data from a Jenkins URL, without loading the whole response into memory
+
+        Unlike :py:meth:`.get_text`, responses are never cached, and are decoded a block at a
+        time as they are read from the network. This is best suited to very large responses,
+        such as the console output of long running builds. The request is reported to
+        observers once the stream is closed, when the size of the body read is known.
+
+        :param str path: optional extension path to append to the root URL managed by this object
+            when performing the get operation
+        :param int chunk_size: number of bytes to read from the network at a time
+        :returns: stream which yields the text loaded from this objects' URL
+        :rtype: :class:`.TextStream`
+        """
+        tmp = join_url(self._url, path)
+
+        req, report = self._send_deferred("GET", tmp, stream=True)
+        if req.status_code != 200:
+            log.debug("Error streaming text from URL: " + tmp)
+            report(len(req.content))
+            req.close()
+            req.raise_for_status()
+        return TextStream(req, chunk_size, report)
         
+    def _send(self, method, url, **kwargs):
+        """Sends a request to the Jenkins REST API, reporting it to all registered observers
+
+        :param str method: HTTP method to use, such as 'GET' or 'POST'
+        :param str url: the full HTTP URL to send the request to
+        :param kwargs: additional parameters for the request, such as 'data' and 'headers'
+        :returns: the response from the server
+        :rtype: :class:`requests.Response`
+        """
+        req, report = self._send_deferred(method, url, **kwargs)
+        report(len(req.content))
+        return req
+
+    def _send_deferred(self, method, url, **kwargs):
+        """Sends a request to the Jenkins REST API, leaving it to the caller to report the response
+
+        Requests which fail with a transient error are retried according to the configured
+        retry policy, and are refused without being sent if the configured circuit breaker
+        has suspended requests to the server. Each attempt waits for the throttle configured
+        for the server, if any, before being sent. Requests which fail without a response are
+        reported to all registered observers immediately.
+
+        :param str method: HTTP method to use, such as 'GET' or 'POST'
+        :param str url: the full HTTP URL to send the request to
+        :param kwargs: additional parameters for the request, such as 'data' and 'headers'
+        :returns:
+            the response from the server, and a callable which reports the request to all
+            registered observers when given the size of the decompressed body read from it
+        :rtype: :class:`tuple` of :class:`requests.Response` and :class:`callable`
+        """
+        policy = self._retry_policy
+        breaker = self._circuit_breaker
+        host = canonical_host(url)
+        throttle = self._throttles.get(host)
+        start = time.time()
+        retries = 0
+        while True:
+            if breaker is not None and not breaker.allow(host):
+                self._notify(method, url, latency=time.time() - start, retries=retries)
+                raise CircuitOpenError(host)
+
+            req = None
+            try:
+                if throttle is None:
+                    req = self._send_once(method, url, **kwargs)
+                else:
+                    throttle.acquire(method)
+                    try:
+                        req = self._send_once(method, url, **kwargs)
+                    finally:
+                        throttle.release(method)
+            except RequestException as err:
+                if breaker is not None:
+                    breaker.record_failure(host)
+                delay = None
+                if policy is not None:
+                    delay = policy.next_delay(retries, method, url, time.time() - start, error=err)
+                if delay is None:
+                    self._notify(method, url, latency=time.time() - start, retries=retries)
+                    raise
+                log.debug("Error sending request to {0}, retrying in {1:.2f}s: {2}".format(url, delay, err))
+            except Exception:
+                # Unexpected errors, such as those raised by a custom transport, must still
+                # complete any trial request, or the circuit would never leave the half open state
+                if breaker is not None:
+                    breaker.record_failure(host)
+                raise
+            else:
+                if breaker is not None:
+                    if breaker.is_failure(response=req):
+                        breaker.record_failure(host)
+                    else:
+                        breaker.record_success(host)
+                delay = None
+                if policy is not None:
+                    delay = policy.next_delay(retries, method, url, time.time() - start, response=req)
+                if delay is None:
+                    return req, functools.partial(self._report_response, method, url, req.status_code,
+                                                  start, retries)
+                log.debug("Status {0} from {1}, retrying in {2:.2f}s".format(req.status_code, url, delay))
+                # Release the connection held by the discarded response, which is never
+                # returned to the pool when the body of a streamed response is left unread
+                req.close()
+
+            retries += 1
+            policy.sleep(delay)
+
+    def _report_response(self, method, url, status, start, retries, num_bytes):
+        """Reports a request which received a response to all registered observers
+
+        :param str method: HTTP method of the request
+        :param str url: the full URL of the request
+        :param int status: HTTP status code of the response
+        :param float start: time at which the first attempt to send the request was made
+        :param int retries: number of times the request was retried before completing
+        :param int num_bytes: size of the decompressed body read from the response, in bytes
+        """
+        self._notify(method, url, status=status, num_bytes=num_bytes, latency=time.time() - start,
+                     cache=CACHE_MISS, retries=retries)
+
+    def _send_once(self, method, url, session=None, **kwargs):
+        """Sends a single request using the configured transport
+
+        :param str method: HTTP method to use, such as 'GET' or 'POST'
+        :param str url: the full HTTP URL to send the request to
+        :param session:
+            optional session to send the request with, so it shares cookies with other requests
+            sent using the same session. Ignored when a custom transport has been configured.
+        :type session: :class:`requests.Session`
+        :param kwargs: additional parameters for the request, such as 'data' and 'headers'
+        :returns: the response from the server
+        :rtype: :class:`requests.Response`
+        """
+        transport = self._transport
+        if transport is not None:
+            return transport.send(method, url, auth=self._credentials, **kwargs)
+        if session is not None:
+            return getattr(session, method.lower())(url, auth=self._credentials, **kwargs)
+        return getattr(requests, method.lower())(url, auth=self._credentials, **kwargs)
+
+    @classmethod
+    def _notify(cls, method, url, **kwargs):
+        """Reports a request to all registered observers
+
+        :param str method: HTTP method of the request
+        :param str url: the full URL of the request
+        :param kwargs: additional properties of the request, as supported by :class:`~.metrics.RequestEvent`
+        :raises:
+            :class:`~.exceptions.RequestBudgetExceeded` if the request exceeds an active
+            :class:`~.metrics.RequestBudget`. Other errors raised by observers are logged and ignored.
+        """
+        observers = cls._observers
+        if not observers:
+            return
+        event = RequestEvent(method, url, **kwargs)
+        for observer in observers:
+            try:
+                observer(event)
+            except RequestBudgetExceeded:
+                raise
+            except Exception:  # pylint: disable=W0703
+                log.exception("Request observer failed")
+
     def get_data(self, path=None):
         """Convenience method to convert text data loaded from a Jenkins URL to Python data types
         
@@ -146,13 +495,19 @@ class DataRequester (object):
             with the given URL.
         :rtype: :class:`object`
         """
-        temp_url = urljoin(self._url, "api/python")
+        temp_url = join_url(self._url, "api/python")
         if query_params is not None:
             temp_url += "?" + query_params
 
-        txt = self._get_raw_text(temp_url)
-        
-        return eval(txt)
+        # Concurrent requests for the same data share both the download and the parsed result.
+        # Each caller that shares the result gets its own copy so changes made by one caller
+        # are not visible to the others.
+        retval, shared = DataRequester._single_flight.do(("api", temp_url, self._credentials),
+                                                         lambda: eval(self._get_raw_text(temp_url)))
+        if shared:
+            self._notify("GET", temp_url, cache=CACHE_HIT, coalesced=True)
+            retval = copy.deepcopy(retval)
+        return retval
     
     def get_headers(self, path=None):
         """gets the HTTP header attributes from a Jenkins URL
@@ -165,16 +520,15 @@ class DataRequester (object):
         :rtype: :class:`dict`
         """
         
-        temp_path = self._url
-        if path is not None:
-            temp_path = urljoin(temp_path, path.lstrip("/\\"))    
+        temp_path = join_url(self._url, path)
 
         if temp_path in DataRequester._header_cache:
+            self._notify("GET", temp_path, cache=CACHE_HIT)
             return DataRequester._header_cache[temp_path]
 
         log.debug("Header cache miss: " + temp_path)
 
-        req = requests.get(temp_path, auth=self._credentials)
+        req = self._send("GET", temp_path)
             
         if req.status_code != 200:
             req.raise_for_status()
@@ -184,6 +538,26 @@ class DataRequester (object):
 
         return req.headers
     
+    def head(self, path=None):
+        """gets the HTTP header attributes from a Jenkins URL using a HEAD request
+
+        Unlike :py:meth:`.get_headers`, the server does not generate or send the content
+        associated with the URL, which makes this much cheaper for large pages.
+
+        :param str path:
+            optional extension path to append to the root
+            URL managed by this object when performing the
+            head operation
+        :returns: dictionary of HTTP header attributes with their associated values
+        :rtype: :class:`dict`
+        """
+        temp_path = join_url(self._url, path)
+
+        req = self._send("HEAD", temp_path, allow_redirects=True)
+        if req.status_code != 200:
+            req.raise_for_status()
+        return req.headers
+
     def post(self, path=None, args=None):
         """sends data to or triggers an operation via a Jenkins URL
         
@@ -202,14 +576,12 @@ class DataRequester (object):
 
         #TODO: If the cache is currently dirty, flush it
         #TODO: clear the existing cache because posting data of any kind to Jenkins server could potentially invalidate our cache
-        temp_path = self._url
-        if path is not None:
-            temp_path = urljoin(temp_path, path.lstrip("/\\"))
+        temp_path = join_url(self._url, path)
               
         if args is not None:
-            req = requests.post(temp_path, auth=self._credentials, **args)
+            req = self._send_post(temp_path, **args)
         else:
-            req = requests.post(temp_path, auth=self._credentials)
+            req = self._send_post(temp_path)
 
         if req.status_code != 200:
             log.debug("Failed posting Jenkins data to " + temp_path)
@@ -223,6 +595,133 @@ class DataRequester (object):
             log.debug("Details: " + str(req))
             req.raise_for_status()
 
+    def _send_post(self, url, **kwargs):
+        """Sends a POST request, including a CSRF crumb when the server requires one
+
+        Crumbs are requested once per server and reused for all subsequent requests. When the
+        server rejects a request, which happens when the crumb has expired, a new crumb is
+        requested and the request is sent again.
+
+        Since Jenkins 2.176.2 crumbs are only valid within the web session they were issued
+        to, so the request for a crumb and every request carrying it are sent using a single
+        :class:`requests.Session` per server and user, which keeps the session cookie. Crumbs
+        are also bound to the user they were issued to, so requesters using different credentials
+        never share a crumb or a session. Requests which are authenticated using an API token do
+        not need a crumb, but are unaffected by it.
+
+        :param str url: the full HTTP URL to send the request to
+        :param kwargs: additional parameters for the request, such as 'data' and 'headers'
+        :returns: the response from the server
+        :rtype: :class:`requests.Response`
+        """
+        crumb = self._get_crumb(url)
+        req = self._send("POST", url, **self._add_crumb(url, kwargs, crumb))
+        if req.status_code != 403:
+            return req
+
+        new_crumb = self._get_crumb(url, refresh=True)
+        if new_crumb is None or new_crumb == crumb:
+            return req
+        log.debug("Request rejected by server, retrying with a new crumb: " + url)
+        req.close()
+        return self._send("POST", url, **self._add_crumb(url, kwargs, new_crumb))
+
+    def _add_crumb(self, url, kwargs, crumb):
+        """Adds a CSRF crumb to the headers of a request
+
+        :param str url: the full HTTP URL the request is to be sent to
+        :param dict kwargs: additional parameters for the request, such as 'data' and 'headers'
+        :param tuple crumb: name of the header to send the crumb in, and the crumb itself, or None
+        :returns:
+            a copy of the request parameters, including the crumb and the session the crumb
+            was issued to
+        :rtype: :class:`dict`
+        """
+        if crumb is None:
+            return kwargs
+        retval = dict(kwargs)
+        headers = dict(retval.get("headers") or {})
+        headers[crumb[0]] = crumb[1]
+        retval["headers"] = headers
+        retval["session"] = self._get_session(url)
+        return retval
+
+    def _session_key(self, url):
+        """Gets the key identifying the web session, and CSRF crumb, of this requester on a server
+
+        :param str url: the full HTTP URL of any resource on the server
+        :returns: the canonical host of the server, and the credentials of this requester
+        :rtype: :func:`tuple`
+        """
+        return canonical_host(url), self._credentials
+
+    def _get_session(self, url):
+        """Gets the web session used to request CSRF crumbs from a server, and to send them back
+
+        :param str url: the full HTTP URL of any resource on the server
+        :rtype: :class:`requests.Session`
+        """
+        key = self._session_key(url)
+        retval = DataRequester._sessions.get(key)
+        if retval is not None:
+            return retval
+        with DataRequester._sessions_lock:
+            retval = DataRequester._sessions.get(key)
+            if retval is None:
+                retval = requests.Session()
+                sessions = dict(DataRequester._sessions)
+                sessions[key] = retval
+                DataRequester._sessions = sessions
+        return retval
+
+    def _get_crumb(self, url, refresh=False):
+        """Gets the CSRF crumb to send with POST requests to a server
+
+        :param str url: the full HTTP URL the crumb is to be sent to
+        :param bool refresh:
+            True to request a new crumb from the server. False to use the cached crumb, requesting
+            one only if the capabilities of the server show that it requires one.
+        :returns: name of the header to send the crumb in, and the crumb itself, or None if no crumb is needed
+        :rtype: :func:`tuple`
+        """
+        key = self._session_key(url)
+        if not refresh:
+            if key in DataRequester._crumbs:
+                return DataRequester._crumbs[key]
+            capabilities = DataRequester.get_capabilities(url)
+            if capabilities is None or not capabilities.crumb_required:
+                return None
+
+        # Concurrent requests for a new crumb only need one of them to contact the server
+        retval, _ = DataRequester._single_flight.do(("crumb",) + key, lambda: self._load_crumb(url))
+        return retval
+
+    def _load_crumb(self, url):
+        """Requests a new CSRF crumb from a server
+
+        :param str url: the full HTTP URL the crumb is to be sent to
+        :returns: name of the header to send the crumb in, and the crumb itself, or None if no crumb is available
+        :rtype: :func:`tuple`
+        """
+        capabilities = DataRequester.get_capabilities(url)
+        if capabilities is not None and capabilities.url:
+            root_url = capabilities.url
+        else:
+            # Canonical URLs take the form 'scheme://host/path/'
+            root_url = "/".join(canonical_url(url).split("/")[:3]) + "/"
+
+        req = self._send("GET", join_url(root_url, "crumbIssuer/api/python"), session=self._get_session(url))
+        if req.status_code != 200:
+            log.debug("Unable to get a crumb from {0}: {1}".format(root_url, req.status_code))
+            return None
+
+        data = eval(req.text)
+        retval = (data["crumbRequestField"], data["crumb"])
+        crumbs = dict(DataRequester._crumbs)
+        crumbs[self._session_key(url)] = retval
+        DataRequester._crumbs = crumbs
+        return retval
+
     @property
     def config_xml(self):
         """Configuration file used to manage the Jenkins entity backed by this object
@@ -247,12 +746,10 @@ class DataRequester (object):
         :param str new_xml: The new configuration data for this object
         """
         # This is by far the most risky method here
-        # The most problematic issue is that here we assume that unique URLs on Jenkins represent unique entities, which is not always the case
+        # Here we assume that unique URLs on Jenkins represent unique entities, which is not always the case
         # for example, jobs may exist on multiple views, and can be accessed as sub-components of the view URL, and thus may be accessed
-        #       by multiple URLs. If one were to access the same job from different URLs and update the config.xml for each, this caching
-        #       mechanism would certainly break down.
-        #       Potential Solution: make sure to reduce every URL for every entity to it's shortest form to ensure consistent URL usage
-        #       TODO: Figure out whether this multiplicity problem affects anything other than jobs. It may not.
+        #       by multiple URLs. To keep the cache consistent, every URL given to this class is reduced to its canonical
+        #       form by canonical_url(), which maps view-relative job URLs back to the URL of the job itself.
         # Another potential problem here would be if calls to other methods on this class may invalidate the content of the cached
         # config.xml. For example, maybe if someone renames a job, the cached URL would be invalidated. Maybe there is no way for this
         # to be exploited in practice, but care would need to be taken to ensure this fact
@@ -283,8 +780,8 @@ class DataRequester (object):
             args = dict()
             args['data'] = DataRequester._configxml_cache[cache_item]
             args['headers'] = headers
-            temp_path = cache_item + "/config.xml"
-            req = requests.post(temp_path, auth=self._credentials, **args)
+            temp_path = join_url(cache_item, "config.xml")
+            req = self._send_post(temp_path, **args)
             if req.status_code != 200:
                 failed_items[cache_item] = req
 
@@ -302,16 +799,150 @@ class DataRequester (object):
         """
         return DataRequester._needs_flush
 
+    @classmethod
+    def set_disk_cache(cls, disk_cache):
+        """Configures a persistent cache to be used by all subsequent requests
+
+        Responses loaded from the Jenkins REST API are stored in this cache according to
+        its cache policy, and subsequent requests for the same data are served from the
+        cache without contacting the server.
+
+        :param disk_cache: the cache to use, or None to disable the persistent cache
+        :type disk_cache: :class:`~.diskcache.DiskCache`
+        """
+        cls._disk_cache = disk_cache
+
+    @classmethod
+    def set_transport(cls, transport):
+        """Configures the transport used to send all subsequent requests
+
+        :param transport:
+            object providing a `send(method, url, **kwargs)` method, such as those defined in
+            :mod:`~.utils.transport`, or None to send requests directly using the `requests` library
+        """
+        cls._transport = transport
+
+    @classmethod
+    def set_retry_policy(cls, policy):
+        """Configures how all subsequent requests recover from transient failures
+
+        :param policy: the retry policy to use, or None to disable retries
+        :type policy: :class:`~.retry.RetryPolicy`
+        """
+        cls._retry_policy = policy
+
+    @classmethod
+    def set_circuit_breaker(cls, breaker):
+        """Configures a circuit breaker used to suspend requests to servers which are consistently failing
+
+        :param breaker: the circuit breaker to use, or None to always send requests
+        :type breaker: :class:`~.retry.CircuitBreaker`
+        """
+        cls._circuit_breaker = breaker
+
+    @classmethod
+    def set_throttle(cls, url, throttle):
+        """Configures limits on the rate and concurrency of all subsequent requests to a Jenkins master
+
+        :param str url: URL of the Jenkins master, or of any entity it manages
+        :param throttle: the limits to apply to requests sent to the master, or None to remove its limits
+        :type throttle: :class:`~.throttle.Throttle`
+        """
+        host = canonical_host(url)
+        throttles = dict(cls._throttles)
+        if throttle is None:
+            throttles.pop(host, None)
+        else:
+            throttles[host] = throttle
+        cls._throttles = throttles
+
+    @classmethod
+    def get_throttle(cls, url):
+        """Gets the limits applied to requests sent to a Jenkins master
+
+        :param str url: URL of the Jenkins master, or of any entity it manages
+        :returns: the limits configured using :py:meth:`.set_throttle`, or None if requests are not limited
+        :rtype: :class:`~.throttle.Throttle`
+        """
+        return cls._throttles.get(canonical_host(url))
+
+    @classmethod
+    def set_capabilities(cls, url, capabilities):
+        """Stores the features supported by a Jenkins master for use by all subsequent requests
+
+        :param str url: URL of the Jenkins master, or of any entity it manages
+        :param capabilities: the features supported by the master, or None to discard the stored profile
+        :type capabilities: :class:`~.capabilities.Capabilities`
+        """
+        host = canonical_host(url)
+        profiles = dict(cls._capabilities)
+        if capabilities is None:
+            profiles.pop(host, None)
+        else:
+            profiles[host] = capabilities
+        cls._capabilities = profiles
+
+    @classmethod
+    def get_capabilities(cls, url):
+        """Gets the features supported by a Jenkins master, as stored by :py:meth:`.set_capabilities`
+
+        :param str url: URL of the Jenkins master, or of any entity it manages
+        :returns: the features supported by the master, or None if they have not been determined yet
+        :rtype: :class:`~.capabilities.Capabilities`
+        """
+        return cls._capabilities.get(canonical_host(url))
+
+    @classmethod
+    def add_observer(cls, observer):
+        """Registers a callback to be notified of every request made through any DataRequester
+
+        Observers are called with a :class:`~.metrics.RequestEvent` describing each request,
+        including requests answered from a cache. Exceptions raised by observers are logged
+        and otherwise ignored.
+
+        :param observer: callable taking a single :class:`~.metrics.RequestEvent` parameter
+        """
+        cls._observers = cls._observers + (observer,)
+
+    @classmethod
+    def remove_observer(cls, observer):
+        """Unregisters a callback previously registered with :py:meth:`.add_observer`
+
+        :param observer: the callback to remove
+        """
+        cls._observers = tuple(i for i in cls._observers if i is not observer)
+
+    @classmethod
+    def coalesced_request_count(cls):
+        """Gets the number of requests which were answered by sharing the result of an identical request
+
+        Concurrent requests for the same URL are coalesced such that only one of them contacts
+        the Jenkins server while the others wait for, and reuse, its result.
+
+        :rtype: :class:`int`
+        """
+        return cls._single_flight.coalesced
+
     @classmethod
     def clear(cls):
         """Deletes all cached data so subsequent operations will reload from source
 
         WARNING: Make sure to call flush() before clear() if there are potentially
         unwritten changes in the cache
+
+        The persistent cache configured by :py:meth:`.set_disk_cache`, which only holds data
+        that never changes, is not affected by this method.
         """
         cls._configxml_cache = dict()
         cls._header_cache = dict()
         cls._text_cache = dict()
+        cls._capabilities = dict()
+        cls._crumbs = dict()
+        with cls._sessions_lock:
+            sessions = cls._sessions
+            cls._sessions = dict()
+        for session in sessions.values():
+            session.close()
         cls._needs_flush = False
 
     def __del__(self):
@@ -0,0 +1,259 @@
+"""Persistent, size limited cache for Jenkins REST API responses
+
+Data describing a Jenkins build never changes once the build has finished, so API data,
+console logs and change sets for completed builds can be cached on disk indefinitely and
+reused across restarts of the tools that use PyJen. Other responses may optionally be
+cached for a limited time.
+
+**Example:** enabling the disk cache for all requests ::
+
+    from pyjen.utils.datarequester import DataRequester
+    from pyjen.utils.diskcache import DiskCache
+
+    DataRequester.set_disk_cache(DiskCache("~/.pyjen_cache.db"))
+"""
+import os
+import re
+import ast
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Default maximum size, in bytes, of the compressed data stored in the cache
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Splits URLs referring to a specific build into the build URL and the remaining path
+_BUILD_URL = re.compile(r"^(.*/job/[^/]+/\d+/)(.*)$")
+
+
+
+class CachePolicy(object):
+    """Rules describing which API responses will never change and may be cached permanently
+
+    Responses are considered permanent if they describe a build that has finished executing.
+    This includes the API data for the build itself, once it reports that it is no longer
+    building, and any other data associated with a build, such as its console output, once
+    the API data for the build has been found to be permanent.
+    """
+
+    @staticmethod
+    def build_url(url):
+        """Gets the URL of the build associated with a given URL
+
+        :param str url: the URL to process
+        :returns: the URL of the build the given URL refers to, or None if it does not refer to a build
+        :rtype: :class:`str`
+        """
+        match = _BUILD_URL.match(url)
+        if match is None:
+            return None
+        return match.group(1)
+
+    def is_permanent(self, url, text, cache):
+        """Checks to see whether a response may be cached permanently
+
+        :param str url: the URL the response was loaded from
+        :param str text: the content of the response
+        :param cache: the cache the response is to be stored in
+        :type cache: :class:`.DiskCache`
+        :rtype: :class:`bool`
+        """
+        build_url = self.build_url(url)
+        if build_url is None:
+            return False
+
+        path = url[len(build_url):]
+        if path.startswith("api/"):
+            return self._is_finished(path[len("api/"):], text)
+
+        return cache.is_finished_build(build_url)
+
+    @staticmethod
+    def _is_finished(api_format, text):
+        """Checks whether the API data for a build shows that it has finished executing
+
+        Only the top level 'building' property is considered, since the data for a running
+        build may include finished sub-builds, such as the runs of a matrix build.
+
+        :param str api_format: format of the API data, such as 'python' or 'json?depth=1'
+        :param str text: the API data
+        :rtype: :class:`bool`
+        """
+        try:
+            if api_format.startswith("python"):
+                data = ast.literal_eval(text)
+            elif api_format.startswith("json"):
+                data = json.loads(text)
+            else:
+                return False
+        except (ValueError, SyntaxError):
+            return False
+        return isinstance(data, dict) and data.get("building") is False
+
+
+class DiskCache(object):
+    """Persistent cache of API responses backed by a SQLite database
+
+    Responses are stored compressed. When the total size of the stored data exceeds the
+    configured limit the least recently used responses are evicted. Instances of this
+    class are safe to share between threads.
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE, default_ttl=None, policy=None):
+        """
+        :param str path: location of the database file to store cached data in
+        :param int max_size: maximum size, in bytes, of the compressed data stored in the cache
+        :param float default_ttl:
+            time, in seconds, to cache responses which are not considered permanent. If not
+            provided, only permanent responses are cached.
+        :param policy: rules describing which responses may be cached permanently
+        :type policy: :class:`.CachePolicy`
+        """
+        self._path = os.path.expanduser(path)
+        self._max_size = max_size
+        self._default_ttl = default_ttl
+        self._policy = policy if policy is not None else CachePolicy()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self._path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS entries "
+                         "(url TEXT PRIMARY KEY, data BLOB, size INTEGER, expires REAL, accessed REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS finished_builds (url TEXT PRIMARY KEY)")
+        self._db.commit()
+
+    @property
+    def path(self):
+        """Gets the location of the database file backing this cache
+
+        :rtype: :class:`str`
+        """
+        return self._path
+
+    @property
+    def size(self):
+        """Gets the total size, in bytes, of the compressed data stored in the cache
+
+        :rtype: :class:`int`
+        """
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, url):
+        """Loads a response from the cache
+
+        :param str url: the URL the response was loaded from
+        :returns: the cached response text, or None if no valid response was found in the cache
+        :rtype: :class:`str`
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT data, expires FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE url = ?", (now, url))
+            self._db.commit()
+        return zlib.decompress(bytes(row[0])).decode("utf-8")
+
+    def put(self, url, text, permanent=False, ttl=None):
+        """Stores a response in the cache
+
+        :param str url: the URL the response was loaded from
+        :param str text: the content of the response
+        :param bool permanent: True if the response never expires, False otherwise
+        :param float ttl:
+            time, in seconds, to cache non-permanent responses for. Defaults to the time
+            configured for the cache. If neither is defined the response is not stored.
+        """
+        if ttl is None:
+            ttl = self._default_ttl
+        if not permanent and ttl is None:
+            return
+
+        expires = None if permanent else time.time() + ttl
+        data = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO entries (url, data, size, expires, accessed) "
+                             "VALUES (?, ?, ?, ?, ?)",
+                             (url, sqlite3.Binary(data), len(data), expires, time.time()))
+            self._evict()
+            self._db.commit()
+
+    def store(self, url, text):
+        """Stores a response in the cache, applying the cache policy to determine how long to keep it
+
+        :param str url: the URL the response was loaded from
+        :param str text: the content of the response
+        """
+        permanent = self._policy.is_permanent(url, text, self)
+        build_url = self._policy.build_url(url)
+        if permanent and build_url is not None:
+            with self._lock:
+                self._db.execute("INSERT OR IGNORE INTO finished_builds (url) VALUES (?)", (build_url,))
+                self._db.commit()
+        self.put(url, text, permanent)
+
+    def is_finished_build(self, build_url):
+        """Checks to see whether a build is known to have finished executing
+
+        :param str build_url: the URL of the build
+        :rtype: :class:`bool`
+        """
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM finished_builds WHERE url = ?", (build_url,)).fetchone()
+        return row is not None
+
+    def delete(self, url):
+        """Removes a response from the cache
+
+        :param str url: the URL the response was loaded from
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+
+    def clear(self):
+        """Removes all data from the cache"""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("DELETE FROM finished_builds")
+            self._db.commit()
+
+    def close(self):
+        """Closes the database backing this cache"""
+        with self._lock:
+            self._db.close()
+
+    def _evict(self):
+        """Removes the least recently used responses until the cache is within its size limit
+
+        Must be called with the cache lock held.
+        """
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self._max_size:
+            return
+
+        evicted = []
+        for url, size in self._db.execute("SELECT url, size FROM entries ORDER BY accessed ASC"):
+            if total <= self._max_size:
+                break
+            evicted.append((url,))
+            total -= size
+        log.debug("Evicting {0} entries from the disk cache".format(len(evicted)))
+        self._db.executemany("DELETE FROM entries WHERE url = ?", evicted)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
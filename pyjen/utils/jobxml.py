@@ -1,5 +1,5 @@
 """Abstractions for managing the raw config.xml for a Jenkins job"""
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
 from pyjen.utils.pluginapi import create_xml_plugin, get_plugin_name
 from pyjen.exceptions import PluginNotSupportedError
 import logging
@@ -19,10 +19,32 @@ class JobXML(object):
         :param str xml: Raw XML character string extracted from a Jenkins job.
         """
         
-        self._root = ElementTree.fromstring(xml)
+        self._root = xmlbackend.fromstring(xml)
+        self._partial = False
 
         assert self._root.tag == "project"
 
+    @classmethod
+    def partial(cls, xml, tags):
+        """Creates a read-only wrapper which only loads selected elements from a job configuration
+
+        Use this for queries against large configuration files that only need a few elements,
+        such as 'scm' or 'assignedNode'. The source XML is streamed and parsing stops as soon as
+        all the requested elements have been found.
+
+        :param str xml: Raw XML character string extracted from a Jenkins job.
+        :param tags: names of the top level configuration elements to load
+        :type tags: :class:`list` of :class:`str`
+        :returns: wrapper around the requested subset of the job configuration
+        :rtype: :class:`.JobXML`
+        """
+        retval = cls.__new__(cls)
+        retval._root = xmlbackend.extract_elements(xml, tags)
+        retval._partial = True
+
+        assert retval._root.tag == "project"
+        return retval
+
     def disable_custom_workspace(self):
         """Disables a jobs use of a custom workspace
         
@@ -57,7 +79,7 @@ class JobXML(object):
         node = self._root.find('customWorkspace')
 
         if node is None:
-            node = ElementTree.SubElement(self._root, 'customWorkspace')
+            node = xmlbackend.SubElement(self._root, 'customWorkspace')
 
         node.text = path
 
@@ -82,7 +104,7 @@ class JobXML(object):
         node = self._root.find('assignedNode')
 
         if node is None:
-            node = ElementTree.SubElement(self._root, 'assignedNode')
+            node = xmlbackend.SubElement(self._root, 'assignedNode')
 
         node.text = node_label
 
@@ -97,8 +119,8 @@ class JobXML(object):
         
         :rtype: :class:`str`
         """
-        retval = ElementTree.tostring(self._root, "UTF-8")
-        return retval.decode("utf-8")
+        assert not self._partial, "XML can not be exported from a partially loaded job configuration"
+        return xmlbackend.tostring(self._root)
 
     @property
     def scm(self):
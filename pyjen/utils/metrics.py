@@ -0,0 +1,481 @@
+"""Structured instrumentation of the requests made to the Jenkins REST API
+
+Every request made by :class:`~.datarequester.DataRequester`, including those answered from
+one of its caches, produces a :class:`RequestEvent` which is passed to each registered observer.
+Observers are simple callables, so events can be forwarded to any metrics pipeline. The
+:class:`RequestMetrics` observer provided here aggregates events per endpoint, which makes it
+easy to see which PyJen operations generate the most load on a Jenkins master.
+
+**Example:** finding the most expensive endpoints ::
+
+    from pyjen.utils.datarequester import DataRequester
+    from pyjen.utils.metrics import RequestMetrics
+
+    metrics = RequestMetrics()
+    DataRequester.add_observer(metrics)
+    # ... use the PyJen API ...
+    for template, stats in metrics.endpoints.items():
+        print(template, stats.count, stats.total_bytes, stats.latency.percentile(95))
+"""
+from __future__ import division
+import re
+import bisect
+import threading
+import logging
+from pyjen.exceptions import RequestBudgetExceeded
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Cache status reported for requests answered without contacting the server
+CACHE_HIT = "hit"
+# Cache status reported for requests sent to the server
+CACHE_MISS = "miss"
+
+# Upper bounds, in seconds, of the latency histogram buckets used by RequestMetrics
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments which are followed by the name of a Jenkins entity
+_NAMED_SEGMENTS = {"job": "{job}", "view": "{view}", "computer": "{node}", "user": "{user}"}
+
+# Matches the scheme and host portion of a URL
+_URL_ROOT = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://[^/]*")
+
+
+def url_template(url):
+    """Reduces a URL to a template describing the type of endpoint it refers to
+
+    The names of jobs, views, nodes and users, as well as build numbers, are replaced with
+    placeholders and the host and query string are removed, so that all requests for the
+    same kind of data share the same template. For example, the URL
+    ``http://jenkins/job/app/job/lib/12/api/python?tree=result`` produces the template
+    ``/job/{job}/job/{job}/{build}/api/python``.
+
+    :param str url: the URL to process
+    :rtype: :class:`str`
+    """
+    path = _URL_ROOT.sub("", url).split("?", 1)[0]
+    parts = path.split("/")
+    retval = []
+    placeholder = None
+    for part in parts:
+        if placeholder is not None and part:
+            retval.append(placeholder)
+            placeholder = None
+            continue
+        if part in _NAMED_SEGMENTS:
+            placeholder = _NAMED_SEGMENTS[part]
+        elif part.isdigit() and retval and retval[-1] == "{job}":
+            part = "{build}"
+        retval.append(part)
+    return "/".join(retval) or "/"
+
+
+class RequestEvent(object):
+    """Description of a single request made to the Jenkins REST API"""
+
+    def __init__(self, method, url, status=None, num_bytes=0, latency=0.0, cache=CACHE_MISS,
+                 retries=0, coalesced=False):
+        """
+        :param str method: HTTP method of the request, such as 'GET' or 'POST'
+        :param str url: the full URL of the request
+        :param int status:
+            HTTP status code of the response, or None if the request was answered from a
+            cache or no response was received
+        :param int num_bytes:
+            size of the response body, in bytes, after any content encoding such as gzip has
+            been removed. Streamed responses only count the part of the body which was read.
+        :param float latency: time, in seconds, taken to complete the request
+        :param str cache: :py:data:`CACHE_HIT` if the request was answered from a cache, otherwise :py:data:`CACHE_MISS`
+        :param int retries: number of times the request was retried before completing
+        :param bool coalesced: True if the request shared the result of an identical concurrent request
+        """
+        self.method = method
+        self.url = url
+        self.url_template = url_template(url)
+        self.status = status
+        self.bytes = num_bytes
+        self.latency = latency
+        self.cache = cache
+        self.retries = retries
+        self.coalesced = coalesced
+
+    @property
+    def cache_hit(self):
+        """Checks whether this request was answered without contacting the server
+
+        :rtype: :class:`bool`
+        """
+        return self.cache == CACHE_HIT
+
+    def to_dict(self):
+        """Converts this event into a dictionary suitable for serialization
+
+        :rtype: :class:`dict`
+        """
+        return {
+            "method": self.method,
+            "url": self.url,
+            "url_template": self.url_template,
+            "status": self.status,
+            "bytes": self.bytes,
+            "latency": self.latency,
+            "cache": self.cache,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+        }
+
+    def __repr__(self):
+        return "RequestEvent({0} {1} {2})".format(self.method, self.url, self.status)
+
+
+class Histogram(object):
+    """Distribution of values counted in buckets with fixed upper bounds"""
+
+    def __init__(self, bounds=DEFAULT_LATENCY_BUCKETS):
+        """
+        :param tuple bounds:
+            sorted upper bounds of the buckets. Values larger than the last bound are
+            counted in an additional overflow bucket.
+        """
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = None
+
+    def add(self, value):
+        """Records a new value
+
+        :param float value: the value to record
+        """
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    @property
+    def bounds(self):
+        """Gets the upper bounds of the buckets
+
+        :rtype: :class:`tuple` of :class:`float`
+        """
+        return self._bounds
+
+    @property
+    def counts(self):
+        """Gets the number of values in each bucket
+
+        :returns: one count per bucket bound, followed by the number of values exceeding the last bound
+        :rtype: :class:`list` of :class:`int`
+        """
+        return list(self._counts)
+
+    @property
+    def count(self):
+        """Gets the number of values recorded
+
+        :rtype: :class:`int`
+        """
+        return self._count
+
+    @property
+    def total(self):
+        """Gets the sum of all values recorded
+
+        :rtype: :class:`float`
+        """
+        return self._sum
+
+    @property
+    def max(self):
+        """Gets the largest value recorded, or None if no values have been recorded
+
+        :rtype: :class:`float`
+        """
+        return self._max
+
+    def mean(self):
+        """Gets the average of all values recorded, or None if no values have been recorded
+
+        :rtype: :class:`float`
+        """
+        if not self._count:
+            return None
+        return self._sum / self._count
+
+    def percentile(self, pct):
+        """Estimates a percentile of the recorded values
+
+        The estimate is the upper bound of the bucket containing the requested percentile,
+        or the largest recorded value if it falls in the overflow bucket.
+
+        :param float pct: the percentile to calculate, between 0 and 100
+        :returns: the estimated percentile, or None if no values have been recorded
+        :rtype: :class:`float`
+        """
+        if not self._count:
+            return None
+        rank = self._count * pct / 100.0
+        running = 0
+        for bound, count in zip(self._bounds, self._counts):
+            running += count
+            if running >= rank and running:
+                return min(bound, self._max)
+        return self._max
+
+    def to_dict(self):
+        """Converts this histogram into a dictionary suitable for serialization
+
+        :rtype: :class:`dict`
+        """
+        return {"bounds": list(self._bounds), "counts": self.counts, "count": self._count, "sum": self._sum}
+
+
+class EndpointStats(object):
+    """Aggregated statistics for all requests made to a single endpoint template"""
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        :param tuple latency_buckets: upper bounds, in seconds, of the latency histogram buckets
+        """
+        self.count = 0
+        self.errors = 0
+        self.total_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.methods = {}
+        self.latency = Histogram(latency_buckets)
+        self.size = Histogram((1024, 4096, 16384, 65536, 262144, 1048576, 4194304))
+
+    def add(self, event):
+        """Adds a request to the statistics
+
+        :param event: the request to add
+        :type event: :class:`.RequestEvent`
+        """
+        self.count += 1
+        self.methods[event.method] = self.methods.get(event.method, 0) + 1
+        self.retries += event.retries
+        if event.coalesced:
+            self.coalesced += 1
+        if event.cache_hit:
+            self.cache_hits += 1
+            return
+        self.cache_misses += 1
+        if event.status is None or event.status >= 400:
+            self.errors += 1
+        self.total_bytes += event.bytes
+        self.latency.add(event.latency)
+        self.size.add(event.bytes)
+
+    def to_dict(self):
+        """Converts these statistics into a dictionary suitable for serialization
+
+        :rtype: :class:`dict`
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.total_bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "methods": dict(self.methods),
+            "latency": self.latency.to_dict(),
+            "size": self.size.to_dict(),
+        }
+
+
+class RequestMetrics(object):
+    """Request observer which aggregates statistics for each endpoint template
+
+    Instances of this class may be registered with
+    :py:meth:`~.datarequester.DataRequester.add_observer` and are safe to use from multiple threads.
+    Latency and response size statistics only include requests sent to the server.
+    """
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        :param tuple latency_buckets: upper bounds, in seconds, of the latency histogram buckets
+        """
+        self._latency_buckets = latency_buckets
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def __call__(self, event):
+        """Records a request
+
+        :param event: the request to record
+        :type event: :class:`.RequestEvent`
+        """
+        with self._lock:
+            stats = self._endpoints.get(event.url_template)
+            if stats is None:
+                stats = EndpointStats(self._latency_buckets)
+                self._endpoints[event.url_template] = stats
+            stats.add(event)
+
+    @property
+    def endpoints(self):
+        """Gets the statistics collected for each endpoint
+
+        :returns: mapping of URL templates to the statistics for each
+        :rtype: :class:`dict` of :class:`.EndpointStats`
+        """
+        with self._lock:
+            return dict(self._endpoints)
+
+    @property
+    def request_count(self):
+        """Gets the total number of requests recorded across all endpoints
+
+        :rtype: :class:`int`
+        """
+        with self._lock:
+            return sum(i.count for i in self._endpoints.values())
+
+    @property
+    def network_request_count(self):
+        """Gets the number of requests which were sent to the server, across all endpoints
+
+        :rtype: :class:`int`
+        """
+        with self._lock:
+            return sum(i.cache_misses for i in self._endpoints.values())
+
+    def reset(self):
+        """Discards all statistics recorded so far"""
+        with self._lock:
+            self._endpoints = {}
+
+    def to_dict(self):
+        """Converts the statistics for all endpoints into a dictionary suitable for serialization
+
+        :returns: mapping of URL templates to the statistics for each
+        :rtype: :class:`dict`
+        """
+        with self._lock:
+            return dict((name, i.to_dict()) for name, i in self._endpoints.items())
+
+
+class RequestBudget(object):
+    """Context manager which counts, and optionally limits, the requests issued within a block of code
+
+    Requests are counted per endpoint template while the context is active. As soon as a
+    request takes the number of requests sent to the server over budget,
+    :class:`~.exceptions.RequestBudgetExceeded` is raised from the call which issued it, so the
+    block stops at the first request over budget. Requests answered from a cache are not counted
+    against the budget. This is primarily intended for regression tests which guard against operations
+    that accidentally issue one request per item in a collection.
+
+    Requests from all threads are counted, not just those made by the thread which
+    entered the context. The exception is raised in whichever thread issued the request
+    which exceeded the budget, and again when the block exits.
+
+    **Example:** asserting a listing operation uses a single request ::
+
+        with RequestBudget(max_requests=1) as budget:
+            jenkins.nodes
+        print(budget.by_endpoint)
+    """
+
+    def __init__(self, max_requests=None, endpoint_limits=None):
+        """
+        :param int max_requests:
+            maximum number of requests allowed within the block. If not provided the
+            number of requests is counted but not limited.
+        :param dict endpoint_limits:
+            optional maximum number of requests allowed for specific endpoints, keyed
+            by URL template as generated by :py:func:`url_template`
+        """
+        self._max_requests = max_requests
+        self._endpoint_limits = dict(endpoint_limits or {})
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._cache_hits = 0
+
+    def __call__(self, event):
+        """Records a request
+
+        :param event: the request to record
+        :type event: :class:`.RequestEvent`
+        :raises: :class:`~.exceptions.RequestBudgetExceeded` if the request exceeds any limit
+        """
+        with self._lock:
+            if event.cache_hit:
+                self._cache_hits += 1
+                return
+            self._counts[event.url_template] = self._counts.get(event.url_template, 0) + 1
+            counts = dict(self._counts)
+        self._check(counts)
+
+    def __enter__(self):
+        from pyjen.utils.datarequester import DataRequester
+        with self._lock:
+            self._counts = {}
+            self._cache_hits = 0
+        DataRequester.add_observer(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        from pyjen.utils.datarequester import DataRequester
+        DataRequester.remove_observer(self)
+        if exc_type is None:
+            self.check()
+
+    @property
+    def request_count(self):
+        """Gets the number of requests sent to the server so far
+
+        :rtype: :class:`int`
+        """
+        with self._lock:
+            return sum(self._counts.values())
+
+    @property
+    def by_endpoint(self):
+        """Gets the number of requests sent to each endpoint so far
+
+        :returns: mapping of URL templates to request counts
+        :rtype: :class:`dict`
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    @property
+    def cache_hits(self):
+        """Gets the number of requests answered from a cache so far
+
+        :rtype: :class:`int`
+        """
+        with self._lock:
+            return self._cache_hits
+
+    def check(self):
+        """Verifies that the requests recorded so far are within budget
+
+        :raises: :class:`~.exceptions.RequestBudgetExceeded` if any limit has been exceeded
+        """
+        self._check(self.by_endpoint)
+
+    def _check(self, counts):
+        """Verifies that the given request counts are within budget
+
+        :param dict counts: number of requests sent to each endpoint, keyed by URL template
+        :raises: :class:`~.exceptions.RequestBudgetExceeded` if any limit has been exceeded
+        """
+        total = sum(counts.values())
+        if self._max_requests is not None and total > self._max_requests:
+            raise RequestBudgetExceeded(total, self._max_requests, counts=counts)
+        for endpoint in sorted(self._endpoint_limits):
+            limit = self._endpoint_limits[endpoint]
+            if counts.get(endpoint, 0) > limit:
+                raise RequestBudgetExceeded(counts[endpoint], limit, endpoint, counts)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
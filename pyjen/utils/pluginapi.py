@@ -1,7 +1,7 @@
 """Primitives for interacting with the PyJen plugin API"""
 import os
 import logging
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
 from pyjen.utils.plugin_base import PluginBase
 
 # Path where all PyJen plugins are stored
@@ -129,7 +129,7 @@ def init_extension_plugin(dataio, jenkins_master):
     :returns: PyJen plugin pre-initialized with the source data, or None if no compatible plugin could be found
     :rtype: :class:`~.utils.pluginbase.PluginBase` derived object
     """
-    pluginxml = PluginXML(ElementTree.fromstring(dataio.config_xml))
+    pluginxml = PluginXML(xmlbackend.parse_root(dataio.config_xml))
     all_plugins = get_plugins()
     for plugin in all_plugins:
         if plugin.type == pluginxml.get_class_name():
@@ -0,0 +1,253 @@
+"""Policies controlling how requests to the Jenkins REST API recover from transient failures
+
+A :class:`RetryPolicy` retries requests which fail with a transient error, such as a 503 response
+from a reverse proxy, waiting an exponentially increasing, randomized amount of time between
+attempts. A :class:`CircuitBreaker` stops requests from being sent to a master which is
+consistently failing, so that many concurrent clients retrying at once do not overload it further.
+
+**Example:** enabling retries and a circuit breaker for all requests ::
+
+    from pyjen.utils.datarequester import DataRequester
+    from pyjen.utils.retry import RetryPolicy, CircuitBreaker
+
+    DataRequester.set_retry_policy(RetryPolicy(max_retries=5, max_elapsed=120))
+    DataRequester.set_circuit_breaker(CircuitBreaker(failure_threshold=10, reset_timeout=30))
+"""
+import time
+import random
+import logging
+import threading
+import requests
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# HTTP status codes which indicate a transient failure
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+# Suffixes of the URLs of POST operations which have the same effect no matter how often they are repeated
+DEFAULT_IDEMPOTENT_POSTS = ("/config.xml", "/enable", "/disable", "/quietDown", "/cancelQuietDown")
+
+# States of the circuit for a host
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+
+class RetryPolicy(object):
+    """Rules describing when, and how often, failed requests are retried
+
+    Requests are only retried if doing so is safe. GET and HEAD requests may always be retried,
+    as may POST requests for operations which are idempotent, such as updating the configuration
+    of a job. Other POST requests, such as triggering a build, are only retried if the connection
+    to the server could not be established, since the server can not have processed them.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30.0, max_elapsed=120.0, jitter=True,
+                 retry_statuses=DEFAULT_RETRY_STATUSES, idempotent_posts=DEFAULT_IDEMPOTENT_POSTS):
+        """
+        :param int max_retries: maximum number of times to retry a request
+        :param float backoff_factor: time, in seconds, to wait before the first retry. Doubles on each retry.
+        :param float max_backoff: maximum time, in seconds, to wait between attempts
+        :param float max_elapsed:
+            maximum total time, in seconds, to spend on a request including all retries.
+            Retries which would exceed this limit are not attempted.
+        :param bool jitter:
+            True to wait a random time between 0 and the calculated backoff, which spreads out
+            retries from concurrent clients. False to always wait the full backoff.
+        :param tuple retry_statuses: HTTP status codes which indicate a transient failure
+        :param tuple idempotent_posts: suffixes of the URLs of POST operations which are safe to repeat
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+        self.idempotent_posts = tuple(idempotent_posts)
+        self._random = random.Random()
+
+    def is_idempotent(self, method, url):
+        """Checks whether a request may safely be sent more than once
+
+        :param str method: HTTP method of the request
+        :param str url: the full URL of the request
+        :rtype: :class:`bool`
+        """
+        if method.upper() in ("GET", "HEAD"):
+            return True
+        path = url.split("?", 1)[0].rstrip("/")
+        return any(path.endswith(i) for i in self.idempotent_posts)
+
+    def backoff(self, attempt):
+        """Calculates the time to wait before a retry
+
+        :param int attempt: number of retries already made
+        :returns: the time to wait, in seconds
+        :rtype: :class:`float`
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = self._random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def _retry_after(response):
+        """Gets the delay requested by the server in the 'Retry-After' header of a response
+
+        :param response: the response to check
+        :returns: the requested delay in seconds, or None if no valid delay was given
+        :rtype: :class:`float`
+        """
+        value = response.headers.get("Retry-After") if response.headers else None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def next_delay(self, attempt, method, url, elapsed, response=None, error=None):
+        """Decides whether a failed request should be retried
+
+        :param int attempt: number of retries already made
+        :param str method: HTTP method of the request
+        :param str url: the full URL of the request
+        :param float elapsed: time, in seconds, spent on the request so far
+        :param response: the response received from the server, if any
+        :type response: :class:`requests.Response`
+        :param error: the error raised while sending the request, if any
+        :type error: :class:`requests.exceptions.RequestException`
+        :returns: the time, in seconds, to wait before retrying, or None if the request should not be retried
+        :rtype: :class:`float`
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if error is not None:
+            if not isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                return None
+            # The server can not have acted on a request it never received
+            if not self.is_idempotent(method, url) and not isinstance(error, requests.exceptions.ConnectTimeout):
+                return None
+            delay = self.backoff(attempt)
+        else:
+            if response.status_code not in self.retry_statuses or not self.is_idempotent(method, url):
+                return None
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = self.backoff(attempt)
+            delay = min(delay, self.max_backoff)
+
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+    @staticmethod
+    def sleep(delay):
+        """Waits before retrying a request
+
+        :param float delay: time to wait, in seconds
+        """
+        time.sleep(delay)
+
+
+class _Circuit(object):
+    """State of the circuit for a single host"""
+    def __init__(self):
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_progress = False
+
+
+class CircuitBreaker(object):
+    """Stops sending requests to hosts which are consistently failing
+
+    Each host is tracked independently. After a number of consecutive failures the circuit for
+    a host is opened and requests to it fail immediately with
+    :class:`~.exceptions.CircuitOpenError`. Once the reset timeout has elapsed a single trial
+    request is let through. If it succeeds the circuit is closed again, otherwise it stays open
+    for another timeout period. Instances of this class are safe to share between threads.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        :param int failure_threshold: number of consecutive failures which opens the circuit for a host
+        :param float reset_timeout: time, in seconds, to wait before sending a trial request to a failing host
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    @staticmethod
+    def is_failure(response=None, error=None):
+        """Checks whether the result of a request counts as a failure of the host
+
+        :param response: the response received from the server, if any
+        :type response: :class:`requests.Response`
+        :param error: the error raised while sending the request, if any
+        :type error: :class:`requests.exceptions.RequestException`
+        :rtype: :class:`bool`
+        """
+        if error is not None:
+            return True
+        return response.status_code >= 500 or response.status_code == 429
+
+    def state(self, host):
+        """Gets the state of the circuit for a host
+
+        :param str host: the host name, and optional port, of the server
+        :returns: one of :py:data:`CIRCUIT_CLOSED`, :py:data:`CIRCUIT_OPEN` or :py:data:`CIRCUIT_HALF_OPEN`
+        :rtype: :class:`str`
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None:
+                return CIRCUIT_CLOSED
+            if circuit.state == CIRCUIT_OPEN and time.time() - circuit.opened_at >= self.reset_timeout:
+                return CIRCUIT_HALF_OPEN
+            return circuit.state
+
+    def allow(self, host):
+        """Checks whether a request may be sent to a host
+
+        :param str host: the host name, and optional port, of the server
+        :rtype: :class:`bool`
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.state == CIRCUIT_CLOSED:
+                return True
+            if circuit.trial_in_progress or time.time() - circuit.opened_at < self.reset_timeout:
+                return False
+            circuit.state = CIRCUIT_HALF_OPEN
+            circuit.trial_in_progress = True
+            return True
+
+    def record_success(self, host):
+        """Records a successful request to a host, closing its circuit
+
+        :param str host: the host name, and optional port, of the server
+        """
+        with self._lock:
+            if host in self._circuits:
+                del self._circuits[host]
+
+    def record_failure(self, host):
+        """Records a failed request to a host, opening its circuit if too many requests have failed
+
+        :param str host: the host name, and optional port, of the server
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            circuit.failures += 1
+            circuit.trial_in_progress = False
+            if circuit.state == CIRCUIT_HALF_OPEN or circuit.failures >= self.failure_threshold:
+                if circuit.state != CIRCUIT_OPEN:
+                    log.warning("Too many failed requests to {0}, suspending requests for {1} seconds".format(
+                        host, self.reset_timeout))
+                circuit.state = CIRCUIT_OPEN
+                circuit.opened_at = time.time()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,22 @@
+"""Statistical helpers shared by the reporting primitives of PyJen"""
+from __future__ import division
+
+
+def percentile(values, pct):
+    """Calculates a percentile of a set of values using linear interpolation between data points
+
+    :param list values: the values to process, which must already be sorted
+    :param float pct: the percentile to calculate, between 0 and 100
+    :returns: the requested percentile, or None if there are no values
+    :rtype: :class:`float`
+    """
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
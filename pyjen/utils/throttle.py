@@ -0,0 +1,214 @@
+"""Limits on the rate and concurrency of requests sent to a Jenkins master
+
+A :class:`Throttle` combines a token bucket, which limits the average rate at which requests
+are sent while allowing short bursts, with a limit on the number of requests which may be in
+progress at the same time. Read-only requests (GET and HEAD) and mutating requests (POST) are
+limited independently, so that a slow stream of changes is not starved by a large number of
+queries. The time requests spend waiting on either limit is recorded, so the impact of the
+limits can be monitored.
+
+Throttles are configured per Jenkins master, either explicitly using
+:py:meth:`~.datarequester.DataRequester.set_throttle` or through the PyJen configuration
+file as described in :class:`~.user_params.JenkinsConfigParser`.
+
+**Example:** limiting the load placed on a master ::
+
+    from pyjen.utils.datarequester import DataRequester
+    from pyjen.utils.throttle import Throttle
+
+    throttle = Throttle(get_rate=20, max_in_flight_gets=4, post_rate=1, max_in_flight_posts=1)
+    DataRequester.set_throttle("http://localhost:8080", throttle)
+    # ... use the PyJen API ...
+    print(throttle.stats())
+"""
+import time
+import threading
+import logging
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Categories of requests which are limited independently
+READ_REQUESTS = "get"
+WRITE_REQUESTS = "post"
+
+
+def request_kind(method):
+    """Gets the category of limits which apply to a request
+
+    :param str method: HTTP method of the request
+    :returns: :py:data:`READ_REQUESTS` for requests which do not modify the server, otherwise :py:data:`WRITE_REQUESTS`
+    :rtype: :class:`str`
+    """
+    if method.upper() in ("GET", "HEAD"):
+        return READ_REQUESTS
+    return WRITE_REQUESTS
+
+
+class TokenBucket(object):
+    """Limits the average rate of an operation while allowing short bursts
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens per second. Each
+    operation consumes one token, waiting for the bucket to refill if it is empty. Callers
+    are served in the order they arrive. Instances of this class are safe to share between threads.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param float rate: average number of operations allowed per second
+        :param int burst: maximum number of operations which may be performed at once. Defaults to `rate`, or 1 if smaller.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero: " + str(rate))
+        if burst is None:
+            burst = max(1, int(rate))
+        if burst < 1:
+            raise ValueError("Burst must be at least 1: " + str(burst))
+        self.rate = float(rate)
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.time()
+
+    def acquire(self):
+        """Consumes a token, waiting for one to become available if necessary
+
+        :returns: the time, in seconds, spent waiting
+        :rtype: :class:`float`
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve a token now, even if it has yet to be refilled, so later callers queue behind us
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class _Limits(object):
+    """Limits, and counters, for a single category of requests"""
+    def __init__(self, rate, burst, max_in_flight):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.slots = threading.Semaphore(max_in_flight) if max_in_flight else None
+        self.max_in_flight = max_in_flight
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_time = 0.0
+        self.in_flight = 0
+
+
+class Throttle(object):
+    """Limits the rate and concurrency of requests sent to a Jenkins master
+
+    Limits which are not specified are not enforced. Instances of this class are safe to share
+    between threads.
+    """
+
+    def __init__(self, get_rate=None, get_burst=None, max_in_flight_gets=None,
+                 post_rate=None, post_burst=None, max_in_flight_posts=None):
+        """
+        :param float get_rate: average number of GET requests allowed per second
+        :param int get_burst: maximum number of GET requests which may be sent at once without waiting
+        :param int max_in_flight_gets: maximum number of GET requests which may be in progress at the same time
+        :param float post_rate: average number of POST requests allowed per second
+        :param int post_burst: maximum number of POST requests which may be sent at once without waiting
+        :param int max_in_flight_posts: maximum number of POST requests which may be in progress at the same time
+        """
+        self._lock = threading.Lock()
+        self._limits = {
+            READ_REQUESTS: _Limits(get_rate, get_burst, max_in_flight_gets),
+            WRITE_REQUESTS: _Limits(post_rate, post_burst, max_in_flight_posts),
+        }
+
+    def acquire(self, method):
+        """Waits until a request may be sent without exceeding any limits
+
+        Every call must be paired with a call to :py:meth:`.release` once the request completes.
+
+        :param str method: HTTP method of the request
+        :returns: the time, in seconds, spent waiting
+        :rtype: :class:`float`
+        """
+        limits = self._limits[request_kind(method)]
+        start = time.time()
+        waited = False
+        if limits.bucket is not None:
+            waited = limits.bucket.acquire() > 0
+        if limits.slots is not None and not limits.slots.acquire(False):
+            waited = True
+            limits.slots.acquire()
+        delay = time.time() - start if waited else 0.0
+
+        with self._lock:
+            limits.requests += 1
+            limits.in_flight += 1
+            if waited:
+                limits.throttled += 1
+                limits.throttled_time += delay
+        if waited:
+            log.debug("{0} request throttled for {1:.3f}s".format(method.upper(), delay))
+        return delay
+
+    def release(self, method):
+        """Records the completion of a request previously allowed by :py:meth:`.acquire`
+
+        :param str method: HTTP method of the request
+        """
+        limits = self._limits[request_kind(method)]
+        with self._lock:
+            limits.in_flight -= 1
+        if limits.slots is not None:
+            limits.slots.release()
+
+    @property
+    def throttled_time(self):
+        """Gets the total time, in seconds, requests have spent waiting on the limits
+
+        :rtype: :class:`float`
+        """
+        with self._lock:
+            return sum(i.throttled_time for i in self._limits.values())
+
+    @property
+    def throttled_count(self):
+        """Gets the number of requests which had to wait before being sent
+
+        :rtype: :class:`int`
+        """
+        with self._lock:
+            return sum(i.throttled for i in self._limits.values())
+
+    def stats(self):
+        """Gets counters describing the effect of the limits on each category of requests
+
+        :returns:
+            dictionary mapping :py:data:`READ_REQUESTS` and :py:data:`WRITE_REQUESTS` to dictionaries
+            containing the number of 'requests' sent, the number of those which were 'throttled',
+            the total 'throttled_time' in seconds, and the number of requests currently 'in_flight'
+        :rtype: :class:`dict`
+        """
+        retval = dict()
+        with self._lock:
+            for kind, limits in self._limits.items():
+                retval[kind] = {
+                    "requests": limits.requests,
+                    "throttled": limits.throttled,
+                    "throttled_time": limits.throttled_time,
+                    "in_flight": limits.in_flight,
+                }
+        return retval
+
+    def reset_stats(self):
+        """Resets the counters reported by :py:meth:`.stats`, except for the number of requests in flight"""
+        with self._lock:
+            for limits in self._limits.values():
+                limits.requests = 0
+                limits.throttled = 0
+                limits.throttled_time = 0.0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,311 @@
+"""Pluggable transports used by :class:`~.datarequester.DataRequester` to send HTTP requests
+
+By default requests are sent directly to the Jenkins master. Alternative transports may be
+configured using :py:meth:`~.datarequester.DataRequester.set_transport`, such as those defined
+here which capture live traffic to a cassette file and replay it later without contacting the
+master. Replaying a recording is deterministic and involves no network access, which makes it
+well suited to profiling and regression testing against traffic captured from a production master.
+
+**Example:** recording traffic from a live master, then replaying it ::
+
+    from pyjen.utils.datarequester import DataRequester
+    from pyjen.utils.transport import Cassette, RecordingTransport, ReplayTransport
+
+    DataRequester.set_transport(RecordingTransport(Cassette("traffic.cassette")))
+    # ... use the PyJen API against the live master ...
+
+    DataRequester.set_transport(ReplayTransport(Cassette("traffic.cassette")))
+    # ... the same operations now run against the recorded responses ...
+"""
+import json
+import zlib
+import hashlib
+import sqlite3
+import logging
+import threading
+import os
+import requests
+from requests.structures import CaseInsensitiveDict
+from six import text_type, binary_type
+from pyjen.exceptions import InteractionNotRecordedError
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+
+class Response(object):
+    """HTTP response loaded from a cassette, exposing the subset of the :class:`requests.Response` API used by PyJen"""
+
+    def __init__(self, url, status_code, headers, content):
+        """
+        :param str url: the URL the response was loaded from
+        :param int status_code: HTTP status code of the response
+        :param dict headers: HTTP headers of the response
+        :param bytes content: body of the response
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = "utf-8"
+
+    @property
+    def text(self):
+        """Gets the body of the response, decoded as text
+
+        :rtype: :class:`str`
+        """
+        return self.content.decode(self.encoding, "replace")
+
+    def iter_content(self, chunk_size=1):
+        """Iterates over the body of the response in blocks
+
+        :param int chunk_size: maximum number of bytes in each block
+        :returns: generator yielding blocks of the response body
+        """
+        for offset in range(0, len(self.content), chunk_size):
+            yield self.content[offset:offset + chunk_size]
+
+    def close(self):
+        """Releases the resources associated with the response, provided for compatibility with :class:`requests.Response`"""
+        pass
+
+    def raise_for_status(self):
+        """Raises an exception if the response describes an error
+
+        :raises: :class:`requests.exceptions.HTTPError` if the status code indicates an error
+        """
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError("{0} Error for url: {1}".format(self.status_code, self.url),
+                                                response=self)
+
+    def __repr__(self):
+        return "<Response [{0}]>".format(self.status_code)
+
+
+def _encode(value):
+    """Converts request data into a byte string suitable for hashing
+
+    :param value: the data to encode, as a string, byte string or dictionary
+    :rtype: :class:`bytes`
+    """
+    if value is None:
+        return b""
+    if isinstance(value, binary_type):
+        return value
+    if isinstance(value, text_type):
+        return value.encode("utf-8")
+    return json.dumps(value, sort_keys=True).encode("utf-8")
+
+
+def request_key(method, url, params=None, data=None):
+    """Generates the key used to identify equivalent requests in a cassette
+
+    :param str method: HTTP method of the request
+    :param str url: the full URL of the request
+    :param dict params: query parameters sent in addition to those in the URL
+    :param data: body of the request
+    :rtype: :class:`str`
+    """
+    retval = method.upper() + " " + url
+    if params:
+        retval += " " + json.dumps(params, sort_keys=True)
+    if data:
+        retval += " " + hashlib.sha1(_encode(data)).hexdigest()
+    return retval
+
+
+class Cassette(object):
+    """File containing a recording of HTTP requests and their responses
+
+    Recordings are stored in a SQLite database, indexed by request, with response bodies
+    compressed. When the same request is recorded several times, for example when polling the
+    state of a build, the responses are replayed in the order they were recorded, with the
+    last response repeated once the others have been used. Instances of this class are safe to
+    share between threads.
+    """
+
+    def __init__(self, path):
+        """
+        :param str path: location of the cassette file, which is created if it does not exist
+        """
+        self._path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._positions = {}
+        self._db = sqlite3.connect(self._path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS interactions (key TEXT, seq INTEGER, status INTEGER, "
+                         "headers TEXT, body BLOB, PRIMARY KEY (key, seq))")
+        self._db.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+    @property
+    def path(self):
+        """Gets the location of the cassette file
+
+        :rtype: :class:`str`
+        """
+        return self._path
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def record(self, key, response):
+        """Adds a response to the recording
+
+        :param str key: key identifying the request, as generated by :py:func:`request_key`
+        :param response: the response to record
+        :type response: :class:`requests.Response`
+        """
+        body = sqlite3.Binary(zlib.compress(response.content or b""))
+        headers = json.dumps(dict(response.headers))
+        with self._lock:
+            seq = self._db.execute("SELECT COUNT(*) FROM interactions WHERE key = ?", (key,)).fetchone()[0]
+            self._db.execute("INSERT INTO interactions (key, seq, status, headers, body) VALUES (?, ?, ?, ?, ?)",
+                             (key, seq, response.status_code, headers, body))
+            self._db.commit()
+
+    def play(self, key, url):
+        """Loads the next recorded response for a request
+
+        :param str key: key identifying the request, as generated by :py:func:`request_key`
+        :param str url: the URL of the request
+        :returns: the recorded response, or None if the request was never recorded
+        :rtype: :class:`.Response`
+        """
+        with self._lock:
+            seq = self._positions.get(key, 0)
+            row = self._db.execute("SELECT status, headers, body FROM interactions WHERE key = ? AND seq = ?",
+                                   (key, seq)).fetchone()
+            if row is not None:
+                self._positions[key] = seq + 1
+            elif seq > 0:
+                row = self._db.execute("SELECT status, headers, body FROM interactions WHERE key = ? AND seq = ?",
+                                       (key, seq - 1)).fetchone()
+        if row is None:
+            return None
+        return Response(url, row[0], json.loads(row[1]), zlib.decompress(bytes(row[2])))
+
+    def rewind(self):
+        """Restarts playback from the first response recorded for each request"""
+        with self._lock:
+            self._positions = {}
+
+    def get_metadata(self, name):
+        """Loads a value describing the recording
+
+        :param str name: name of the value
+        :returns: the stored value, or None if no value with the given name exists
+        :rtype: :class:`str`
+        """
+        with self._lock:
+            row = self._db.execute("SELECT value FROM metadata WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_metadata(self, name, value):
+        """Stores a value describing the recording
+
+        :param str name: name of the value
+        :param str value: the value to store
+        """
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)", (name, value))
+            self._db.commit()
+
+    def close(self):
+        """Closes the file backing this cassette"""
+        with self._lock:
+            self._db.close()
+
+
+class RequestsTransport(object):
+    """Transport which sends requests to the Jenkins master using the `requests` library
+
+    Connections are pooled and reused between requests.
+    """
+
+    def __init__(self):
+        self._session = requests.Session()
+
+    def send(self, method, url, **kwargs):
+        """Sends a request
+
+        :param str method: HTTP method of the request, such as 'GET' or 'POST'
+        :param str url: the full URL of the request
+        :param kwargs: additional parameters supported by :func:`requests.request`, such as 'auth' and 'data'
+        :rtype: :class:`requests.Response`
+        """
+        return self._session.request(method, url, **kwargs)
+
+
+class RecordingTransport(object):
+    """Transport which sends requests using another transport, recording each response to a cassette"""
+
+    def __init__(self, cassette, transport=None):
+        """
+        :param cassette: the cassette to record responses to
+        :type cassette: :class:`.Cassette`
+        :param transport: the transport used to send requests. Defaults to :class:`.RequestsTransport`.
+        """
+        self._cassette = cassette
+        self._transport = transport if transport is not None else RequestsTransport()
+
+    @property
+    def cassette(self):
+        """Gets the cassette responses are recorded to
+
+        :rtype: :class:`.Cassette`
+        """
+        return self._cassette
+
+    def send(self, method, url, **kwargs):
+        """Sends a request and records its response
+
+        :param str method: HTTP method of the request, such as 'GET' or 'POST'
+        :param str url: the full URL of the request
+        :param kwargs: additional parameters supported by :func:`requests.request`, such as 'auth' and 'data'
+        :rtype: :class:`requests.Response`
+        """
+        response = self._transport.send(method, url, **kwargs)
+        self._cassette.record(request_key(method, url, kwargs.get("params"), kwargs.get("data")), response)
+        return response
+
+
+class ReplayTransport(object):
+    """Transport which answers requests using the responses recorded in a cassette
+
+    No requests are sent to the Jenkins master, and responses are returned immediately.
+    """
+
+    def __init__(self, cassette):
+        """
+        :param cassette: the cassette to load responses from
+        :type cassette: :class:`.Cassette`
+        """
+        self._cassette = cassette
+
+    @property
+    def cassette(self):
+        """Gets the cassette responses are loaded from
+
+        :rtype: :class:`.Cassette`
+        """
+        return self._cassette
+
+    def send(self, method, url, **kwargs):
+        """Loads the recorded response for a request
+
+        :param str method: HTTP method of the request, such as 'GET' or 'POST'
+        :param str url: the full URL of the request
+        :param kwargs: additional parameters supported by :func:`requests.request`, such as 'auth' and 'data'
+        :rtype: :class:`.Response`
+        :raises: :class:`~.exceptions.InteractionNotRecordedError` if the request was never recorded
+        """
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("data"))
+        response = self._cassette.play(key, url)
+        if response is None:
+            raise InteractionNotRecordedError(key, self._cassette.path)
+        return response
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -0,0 +1,150 @@
+"""Canonical forms of the URLs of Jenkins entities
+
+Jenkins makes the same entity available through many URLs. A job may be reached through the
+dashboard or through any view containing it, host names are case insensitive, default ports
+may or may not be given, trailing slashes are optional and names may or may not be percent
+encoded. PyJen caches data, and identifies entities, by URL, so every URL is reduced to a single
+canonical form before it is used.
+
+**Example:** ::
+
+    from pyjen.utils.urls import canonical_url, join_url
+
+    canonical_url("HTTP://Jenkins:80/view/all/job/app")     # 'http://jenkins/job/app/'
+    canonical_url("http://jenkins/job/my job")              # 'http://jenkins/job/my%20job/'
+    join_url("http://jenkins/job/app/", "/config.xml")      # 'http://jenkins/job/app/config.xml'
+"""
+import sys
+
+from six import text_type
+
+if sys.version_info.major < 3:
+    from urlparse import urlsplit, urlunsplit
+    from urllib import quote, unquote
+else:
+    from urllib.parse import urlsplit, urlunsplit, quote, unquote
+
+# Ports implied by each URL scheme, which are omitted from canonical URLs
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Characters, in addition to letters, digits and '_.-', which are never percent encoded in
+# the path segments of canonical URLs
+SAFE_PATH_CHARS = "!$&'()*+,;=:@~"
+
+
+def _canonical_segment(segment):
+    """Normalizes the percent encoding of a single path segment of a URL
+
+    Encoded characters are decoded, then every character that is not safe is encoded again
+    using UTF-8, so a name produces the same segment whether or not it was already encoded.
+
+    :param str segment: the path segment to process, which may not contain slashes
+    :rtype: :class:`str`
+    """
+    if sys.version_info.major < 3 and isinstance(segment, text_type):
+        segment = segment.encode("utf-8")
+    return quote(unquote(segment), safe=SAFE_PATH_CHARS)
+
+
+def _canonical_path(path):
+    """Reduces the path of a URL to its canonical form
+
+    Empty segments are removed, as are view segments preceding a job, since jobs are
+    accessible through every view which contains them.
+
+    :param str path: path component of a URL
+    :returns: the canonical path, beginning and ending with a slash
+    :rtype: :class:`str`
+    """
+    parts = [_canonical_segment(i) for i in path.replace("\\", "/").split("/") if i]
+    retval = []
+    pos = 0
+    while pos < len(parts):
+        if parts[pos] == "view" and pos + 1 < len(parts):
+            # Skip past any chain of nested views to see whether it leads to a job
+            end = pos
+            while end + 1 < len(parts) and parts[end] == "view":
+                end += 2
+            if end < len(parts) and parts[end] == "job":
+                pos = end
+                continue
+        retval.append(parts[pos])
+        pos += 1
+    if not retval:
+        return "/"
+    return "/" + "/".join(retval) + "/"
+
+
+def canonical_url(url):
+    """Reduces the URL of a Jenkins entity to its canonical form
+
+    The scheme and host name are converted to lower case, default ports and fragments are
+    removed, duplicate slashes are collapsed, the percent encoding of each path segment is
+    normalized, view-relative job URLs are replaced with the URL of the job itself, and a
+    single trailing slash is added to the path unless the URL has a query string. Query
+    strings are preserved as given.
+
+    :param str url: URL to process
+    :rtype: :class:`str`
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if not scheme:
+        # Relative URLs only have their path normalized
+        return _canonical_path(parts.path) + ("?" + parts.query if parts.query else "")
+
+    netloc = parts.netloc.lower()
+    host, sep, port = netloc.rpartition(":")
+    if sep and "]" not in port and port.isdigit() and int(port) == DEFAULT_PORTS.get(scheme):
+        netloc = host
+    path = _canonical_path(parts.path)
+    if parts.query and path != "/":
+        # URLs with a query string refer to an endpoint, such as 'api/python', rather than an entity
+        path = path.rstrip("/")
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def join_url(base, path=None):
+    """Appends a relative path to the URL of a Jenkins entity
+
+    Unlike :func:`urljoin`, the path is always appended to the base URL, even if it begins
+    with a slash, and the last segment of the base URL is never replaced. Each segment of the
+    path is percent encoded as in :func:`canonical_url`, so raw names such as 'job/my job'
+    may be appended. Any query string following the path is preserved as given.
+
+    :param str base: URL of the entity
+    :param str path: path to append to the URL. If None, the base URL is returned unchanged.
+    :rtype: :class:`str`
+    """
+    if path is None:
+        return base
+    path, sep, query = path.lstrip("/\\").partition("?")
+    path = "/".join(_canonical_segment(i) for i in path.replace("\\", "/").split("/"))
+    return base.rstrip("/\\") + "/" + path + sep + query
+
+
+def canonical_host(url):
+    """Gets the canonical network location of the server hosting a Jenkins entity
+
+    State which applies to an entire server, such as its capabilities or request throttles,
+    is keyed by this value so every URL of the server shares the same state.
+
+    :param str url: URL of the server, or of any entity it manages
+    :returns: the host name, and the port if it is not the default port for the scheme
+    :rtype: :class:`str`
+    """
+    return urlsplit(canonical_url(url)).netloc
+
+
+def identity_url(url):
+    """Reduces the URL of a Jenkins entity to a form suitable for comparing entities
+
+    :param str url: URL to process
+    :returns: the canonical URL without its trailing slash
+    :rtype: :class:`str`
+    """
+    return canonical_url(url).rstrip("/")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
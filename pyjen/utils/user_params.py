@@ -3,6 +3,7 @@ import sys
 import os
 import platform
 from pyjen.exceptions import InvalidUserParamsError
+from pyjen.utils.throttle import Throttle
 
 if sys.version_info.major < 3:
     import ConfigParser as configparser
@@ -30,6 +31,18 @@ class JenkinsConfigParser(configparser.ConfigParser):
             username=
             password=
             
+            #Optional limits on the load placed on a server
+            #All limits are optional, and those not specified are not enforced
+            [http://busy_jenkins_url]
+            username=MyUserName
+            password=MyPassword
+            get_rate=20
+            get_burst=40
+            max_in_flight_gets=4
+            post_rate=1
+            post_burst=1
+            max_in_flight_posts=1
+            
         For more details on the general format of the config file see these links:
             https://wiki.python.org/moin/ConfigParserExamples
             https://docs.python.org/2/library/configparser.html
@@ -43,12 +56,7 @@ class JenkinsConfigParser(configparser.ConfigParser):
         :returns: username and password for the given URL. Will return None if no credentials found. 
         :rtype: :func:`tuple`
         """
-        section_name = None
-        for cur_section in self.sections():
-            if jenkins_url.startswith(cur_section):
-                section_name = cur_section
-                break
-            
+        section_name = self._find_section(jenkins_url)
         if not section_name:
             return None
         
@@ -68,6 +76,49 @@ class JenkinsConfigParser(configparser.ConfigParser):
             raise InvalidUserParamsError("No password specified for user " + temp_username + " under " + section_name)
         return temp_username, temp_password
 
+    def get_throttle(self, jenkins_url):
+        """Gets the limits on the rate and concurrency of requests for a given Jenkins URL
+
+        :param str jenkins_url: arbitrary URL to the Jenkins REST API to retrieve limits for
+            The limits will be matched based on the section headers in any of the associated config files
+        :returns: the configured limits. Will return None if no limits are configured.
+        :rtype: :class:`~.throttle.Throttle`
+        """
+        section_name = self._find_section(jenkins_url)
+        if not section_name:
+            return None
+
+        params = dict()
+        for option, converter in (("get_rate", float), ("get_burst", int), ("max_in_flight_gets", int),
+                                  ("post_rate", float), ("post_burst", int), ("max_in_flight_posts", int)):
+            if not self.has_option(section_name, option):
+                continue
+            value = self.get(section_name, option).strip()
+            if not value:
+                continue
+            try:
+                params[option] = converter(value)
+            except ValueError:
+                raise InvalidUserParamsError("Invalid value for " + option + " under " + section_name + ": " + value)
+            if params[option] <= 0:
+                raise InvalidUserParamsError(option + " must be greater than zero under " + section_name)
+
+        if not params:
+            return None
+        return Throttle(**params)
+
+    def _find_section(self, jenkins_url):
+        """Finds the section of the configuration which applies to a given Jenkins URL
+
+        :param str jenkins_url: arbitrary URL to the Jenkins REST API
+        :returns: name of the first section whose header is a prefix of the URL, or None if no section applies
+        :rtype: :class:`str`
+        """
+        for cur_section in self.sections():
+            if jenkins_url.startswith(cur_section):
+                return cur_section
+        return None
+
     @staticmethod
     def get_default_configfiles():
         """Gets a list of potential locations where PyJen config files may be found
@@ -1,5 +1,5 @@
 """Abstractions for managing the raw config.xml for a Jenkins view"""
-import xml.etree.ElementTree as ElementTree
+from pyjen.utils import xmlbackend
 
 
 class ViewXML(object):
@@ -13,7 +13,7 @@ class ViewXML(object):
         :param str xml: Raw XML character string extracted from a Jenkins job.
         """
         
-        self._root = ElementTree.fromstring(xml)
+        self._root = xmlbackend.fromstring(xml)
 
     @property
     def XML(self):
@@ -26,8 +26,7 @@ class ViewXML(object):
 
         :rtype: :class:`str`
         """
-        retval = ElementTree.tostring(self._root, "UTF-8")
-        return retval.decode("utf-8")
+        return xmlbackend.tostring(self._root)
 
     def rename(self, new_name):
         """Changes the name of the view
@@ -0,0 +1,193 @@
+"""Pluggable XML parsing backend used when processing Jenkins config.xml data
+
+When the optional `lxml <http://lxml.de/>`_ package is installed it will be used to parse and
+serialize configuration data, otherwise the ElementTree implementation from the Python standard
+library is used. Both backends expose the same element API so the rest of PyJen need not care
+which one is active.
+
+This module also provides streaming, read-only helpers built on top of `iterparse` which allow
+callers to extract a few elements from a large configuration file without building the entire
+element tree in memory.
+"""
+import io
+import re
+import logging
+import xml.etree.ElementTree as ElementTree
+from six import text_type
+from pyjen.exceptions import InvalidParameterError
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover
+    lxml_etree = None
+
+log = logging.getLogger(__name__)  # pylint: disable=C0103
+
+# Descriptive names of the supported XML backends
+BACKEND_LXML = "lxml"
+BACKEND_ELEMENTTREE = "elementtree"
+
+# Matches the XML declaration that may prefix a config.xml file
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+_backend = BACKEND_LXML if lxml_etree is not None else BACKEND_ELEMENTTREE
+
+
+def get_backend():
+    """Gets the name of the XML backend currently in use
+
+    :returns: one of :py:data:`BACKEND_LXML` or :py:data:`BACKEND_ELEMENTTREE`
+    :rtype: :class:`str`
+    """
+    return _backend
+
+
+def available_backends():
+    """Gets the list of XML backends supported by the current Python environment
+
+    :rtype: :class:`list` of :class:`str`
+    """
+    retval = [BACKEND_ELEMENTTREE]
+    if lxml_etree is not None:
+        retval.insert(0, BACKEND_LXML)
+    return retval
+
+
+def set_backend(backend_name):
+    """Selects the XML backend to use for all subsequent parsing operations
+
+    :param str backend_name: name of the backend to use, as reported by :py:func:`available_backends`
+    """
+    global _backend  # pylint: disable=W0603
+    if backend_name not in available_backends():
+        raise InvalidParameterError("XML backend {0} is not available".format(backend_name))
+    log.debug("Using XML backend " + backend_name)
+    _backend = backend_name
+
+
+def _to_stream(xml):
+    """Converts raw XML text into a binary stream suitable for incremental parsing
+
+    Any XML declaration is stripped from unicode input since the encoding it describes
+    no longer applies once the text has been decoded.
+
+    :param xml: raw XML data, as either encoded bytes or decoded text
+    :rtype: :class:`io.BytesIO`
+    """
+    if isinstance(xml, text_type):
+        xml = _XML_DECLARATION.sub("", xml, count=1).encode("utf-8")
+    return io.BytesIO(xml)
+
+
+def fromstring(xml):
+    """Parses an XML document using the active backend
+
+    :param xml: raw XML data, as either encoded bytes or decoded text
+    :returns: the root element of the parsed document
+    """
+    if _backend == BACKEND_LXML:
+        if isinstance(xml, text_type):
+            xml = _XML_DECLARATION.sub("", xml, count=1)
+        parser = lxml_etree.XMLParser(resolve_entities=False, huge_tree=True)
+        return lxml_etree.fromstring(xml, parser)
+    return ElementTree.fromstring(xml)
+
+
+def tostring(root):
+    """Serializes an element tree generated by :py:func:`fromstring` back to text
+
+    :param root: root element of the tree to serialize
+    :returns: UTF-8 encoded XML document, including the XML declaration
+    :rtype: :class:`str`
+    """
+    if lxml_etree is not None and isinstance(root, lxml_etree._Element):  # pylint: disable=W0212
+        retval = lxml_etree.tostring(root, encoding="UTF-8", xml_declaration=True)
+    else:
+        retval = ElementTree.tostring(root, "UTF-8")
+    return retval.decode("utf-8")
+
+
+def SubElement(parent, tag):  # pylint: disable=C0103
+    """Appends a new, empty child element to a node created by any of the supported backends
+
+    :param parent: the element to add the new child to
+    :param str tag: tag name for the new child element
+    :returns: the newly created child element
+    """
+    child = parent.makeelement(tag, {})
+    parent.append(child)
+    return child
+
+
+def _iterparse(xml, events):
+    """Incrementally parses an XML document using the active backend
+
+    :param xml: raw XML data, as either encoded bytes or decoded text
+    :param tuple events: the parser events to report
+    :returns: iterator over (event, element) pairs
+    """
+    stream = _to_stream(xml)
+    if _backend == BACKEND_LXML:
+        return lxml_etree.iterparse(stream, events=events, resolve_entities=False, huge_tree=True)
+    return ElementTree.iterparse(stream, events=events)
+
+
+def parse_root(xml):
+    """Gets the root node of an XML document without parsing the rest of the tree
+
+    The returned element will have its tag and attributes populated but will contain no children.
+    This is sufficient for detecting the plugin type associated with a job or view configuration.
+
+    :param xml: raw XML data, as either encoded bytes or decoded text
+    :returns: the root element of the document
+    """
+    for _, elem in _iterparse(xml, ("start",)):
+        return elem
+    return None
+
+
+def extract_elements(xml, tags):
+    """Streams through an XML document, keeping only selected direct children of the root node
+
+    Parsing stops as soon as every requested element has been found, so for read-only queries
+    against elements near the top of a large config.xml file only a small portion of the document
+    is ever processed. Elements that were not requested are discarded as soon as they are parsed.
+
+    :param xml: raw XML data, as either encoded bytes or decoded text
+    :param tags: tag names of the direct children of the root node to be extracted
+    :type tags: :class:`list` of :class:`str`
+    :returns:
+        The root element of the document, containing only those of the requested children
+        which were found in the source document
+    """
+    wanted = set(tags)
+    remaining = set(tags)
+    root = None
+    depth = 0
+    for event, elem in _iterparse(xml, ("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+        if elem.tag in remaining:
+            remaining.discard(elem.tag)
+            if not remaining:
+                break
+        else:
+            root.remove(elem)
+
+    # The parser may read ahead of the last event processed, so make sure
+    # nothing it found beyond that point is kept
+    for elem in list(root):
+        if elem.tag not in wanted:
+            root.remove(elem)
+    return root
+
+
+if __name__ == "__main__":  # pragma: no cover
+    pass
@@ -1,13 +1,20 @@
 """Primitives for interacting with Jenkins views"""
 from pyjen.job import Job
+from pyjen.handles import JobHandle, ViewHandle
 from pyjen.exceptions import PluginNotSupportedError
 from pyjen.utils.pluginapi import PluginBase, get_view_plugins, get_plugin_name, init_extension_plugin
 from pyjen.utils.viewxml import ViewXML
+from pyjen.utils import xmlbackend
+from pyjen.utils.capabilities import api_query
+from pyjen.utils.urls import identity_url
 import logging
-import xml.etree.ElementTree as ElementTree
 
 log = logging.getLogger(__name__)
 
+# Properties of each job loaded when computing view metrics
+VIEW_METRICS_TREE = "jobs[name,color,healthReport[score],lastBuild[number,duration,result,timestamp]," \
+                    "lastCompletedBuild[number,duration],lastSuccessfulBuild[number]]"
+
 
 class View(PluginBase):
     """ 'Abstract' base class used by all view classes, providing functionality common to them all"""
@@ -22,6 +29,35 @@ class View(PluginBase):
         self._controller = data_io_controller
         self._master = jenkins_master
 
+    def __eq__(self, other):
+        """ Compares an object to the current object and determines if they are the same
+
+        Views are identified by their URL, so comparisons do not require any data to be
+        loaded from the server. Views compare equal to any :class:`~.handles.ViewHandle`
+        referencing the same view.
+        """
+        if isinstance(other, (View, ViewHandle)):
+            return self._identity == other._identity
+        return False
+
+    def __ne__(self, other):
+        """ Overrides the default not equal operation
+        """
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """ Allows the current object to be hashable
+        """
+        return hash(self._identity)
+
+    @property
+    def _identity(self):
+        """Gets the normalized URL used to identify this view
+
+        :rtype: :class:`str`
+        """
+        return identity_url(self._controller.url)
+
     @staticmethod
     def create(controller, jenkins_master):
         """Factory method used to instantiate the appropriate view type for a given configuration
@@ -38,7 +74,7 @@ class View(PluginBase):
         if plugin is not None:
             return plugin
 
-        node = ElementTree.fromstring(controller.config_xml)
+        node = xmlbackend.parse_root(controller.config_xml)
         plugin_name = get_plugin_name(node)
         raise PluginNotSupportedError("View plugin {0} not found".format(plugin_name), plugin_name)
 
@@ -80,19 +116,15 @@ class View(PluginBase):
         that meet the requirements of the filter associated
         with this view.
 
+        Jobs are returned as lightweight handles, which only load the configuration of
+        a job when it is first needed.
+
         :returns: list of 0 or more jobs that are included in this view
-        :rtype:  :class:`list` of :class:`~.job.Job` objects
+        :rtype:  :class:`list` of :class:`~.handles.JobHandle` objects
         """
         data = self._controller.get_api_data()
 
-        view_jobs = data['jobs']
-
-        retval = []
-        for j in view_jobs:
-            temp_data_io = self._controller.clone(j['url'])
-            retval.append(Job.create(temp_data_io, self._master))
-
-        return retval
+        return [JobHandle(self._controller, self._master, j.get('name'), j['url']) for j in data['jobs']]
 
     @property
     def _light_jobs(self):
@@ -249,40 +281,79 @@ class View(PluginBase):
         
     def view_metrics(self):
         """Composes a report on the jobs contained within the view
-                
+
+        All metrics are computed from a single request to the view API. The returned
+        dictionary contains the following keys:
+
+        * 'job_count' - total number of jobs in the view
+        * 'broken_jobs', 'unstable_jobs', 'disabled_jobs', 'not_built_jobs', 'building_jobs' -
+          sorted lists of the names of the jobs in each state, along with a matching
+          '<state>_count' entry for each (ie: 'broken_jobs_count')
+        * 'average_health_score', 'min_health_score' - statistics for the job health scores
+          reported by Jenkins, or None if no jobs report a health score
+        * 'average_build_duration', 'max_build_duration' - statistics for the durations, in
+          milliseconds, of the last completed build of each job, or None if no jobs have been built
+        * 'last_build_timestamp' - time stamp, in milliseconds since the epoch, of the most recently
+          started build of any job in the view, or None if no jobs have been built
+        * 'failure_gaps' - mapping of the names of jobs whose last completed build was not successful
+          to the gap between the number of that build and the number of the last successful build,
+          or the number of the last completed build if the job has never succeeded. This is
+          computed from build numbers alone, so builds deleted from the history of the job, or
+          aborted, are counted as well, making it an upper bound on the number of failed builds.
+        * 'longest_failure_gap' - the largest value from 'failure_gaps', or 0 if there are none
+
         :return: Dictionary containing metrics about the view
         :rtype: :class:`dict`
         """
-        data = self._controller.get_api_data()
+        data = self._controller.get_api_data(query_params=api_query(self._controller, VIEW_METRICS_TREE, 2))
 
-        broken_jobs = []
-        disabled_jobs = []
-        unstable_jobs = []
-        broken_job_count = 0
-        disabled_jobs_count = 0
-        unstable_job_count = 0
+        states = {"broken_jobs": [], "unstable_jobs": [], "disabled_jobs": [], "not_built_jobs": [],
+                  "building_jobs": []}
+        color_states = {"red": "broken_jobs", "yellow": "unstable_jobs", "disabled": "disabled_jobs",
+                        "notbuilt": "not_built_jobs"}
+        health_scores = []
+        durations = []
+        timestamps = []
+        failure_gaps = {}
 
         for job in data["jobs"]:
+            color = job.get("color") or ""
+            if color.endswith("_anime"):
+                states["building_jobs"].append(job["name"])
+                color = color[:-len("_anime")]
+            if color in color_states:
+                states[color_states[color]].append(job["name"])
+
+            reports = job.get("healthReport") or []
+            if reports:
+                health_scores.append(min(i["score"] for i in reports))
+
+            last_build = job.get("lastBuild")
+            if last_build is not None:
+                timestamps.append(last_build["timestamp"])
+
+            last_completed = job.get("lastCompletedBuild")
+            if last_completed is not None:
+                durations.append(last_completed["duration"])
+                last_success = job.get("lastSuccessfulBuild")
+                gap = last_completed["number"] - (last_success["number"] if last_success else 0)
+                if gap > 0:
+                    failure_gaps[job["name"]] = gap
+
+        retval = {"job_count": len(data["jobs"])}
+        for state, names in states.items():
+            retval[state] = sorted(names)
+            retval[state + "_count"] = len(names)
+
+        retval["average_health_score"] = sum(health_scores) / float(len(health_scores)) if health_scores else None
+        retval["min_health_score"] = min(health_scores) if health_scores else None
+        retval["average_build_duration"] = sum(durations) / float(len(durations)) if durations else None
+        retval["max_build_duration"] = max(durations) if durations else None
+        retval["last_build_timestamp"] = max(timestamps) if timestamps else None
+        retval["failure_gaps"] = failure_gaps
+        retval["longest_failure_gap"] = max(failure_gaps.values()) if failure_gaps else 0
 
-            temp_data_io = self._controller.clone(job['url'])
-            temp_job = Job._create(temp_data_io, self._master, job['name'])
-
-            if job["color"] == "red":
-                broken_job_count += 1
-                broken_jobs.append(temp_job)
-            elif job["color"] == "disabled":
-                disabled_jobs_count += 1
-                disabled_jobs.append(temp_job)
-            elif job["color"] == "yellow":
-                unstable_job_count += 1
-                unstable_jobs.append(temp_job)
-
-        return {"broken_jobs_count": broken_job_count,
-                "disabled_jobs_count": disabled_jobs_count,
-                "unstable_jobs_count": unstable_job_count,
-                "broken_jobs": broken_jobs,
-                "unstable_jobs": unstable_jobs,
-                "disabled_jobs": disabled_jobs}
+        return retval
 
 if __name__ == "__main__":  # pragma: no cover
 
@@ -0,0 +1,30 @@
+import unittest
+import json
+import pytest
+from benchmarks.suite import run_suite, compare_results
+
+
+class benchmark_suite_tests(unittest.TestCase):
+    def test_run(self):
+        data = run_suite(sizes=[10], repeat=1, names=["Job.all_builds", "JobXML parsing"])
+
+        self.assertEqual([(i["name"], i["size"]) for i in data["results"]],
+                         [("Job.all_builds", 10), ("JobXML parsing", 10)])
+        self.assertEqual(data["results"][0]["requests"], 1)
+        self.assertGreater(data["results"][0]["bytes"], 0)
+        self.assertEqual(data["results"][1]["requests"], 0)
+        # results must be serializable so runs can be compared
+        json.dumps(data)
+
+    def test_compare(self):
+        def result(median, requests):
+            return {"name": "op", "size": 10, "wall_time": {"median": median}, "requests": requests, "bytes": 0}
+
+        baseline = {"results": [result(2.0, 10)]}
+        current = {"results": [result(1.0, 5), dict(result(1.0, 1), name="new")]}
+
+        self.assertEqual(compare_results(baseline, current), [("op", 10, 0.5, 0.5, None)])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
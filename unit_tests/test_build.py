@@ -51,6 +51,26 @@ class build_tests(unittest.TestCase):
         self.assertEqual(b.console_output, expected_console_output)
         mock_data_io.get_text.assert_called_once_with("/consoleText")
 
+    def test_iter_console_output(self):
+        mock_data_io = MagicMock()
+        mock_data_io.progressive_text = True
+        mock_data_io.stream_text.return_value = iter(["Some sample ", "console output"])
+
+        b = Build(mock_data_io)
+
+        self.assertEqual("".join(b.iter_console_output()), "Some sample console output")
+        mock_data_io.stream_text.assert_called_once_with("/logText/progressiveText?start=0")
+
+    def test_iter_console_output_without_progressive_text(self):
+        mock_data_io = MagicMock()
+        mock_data_io.progressive_text = False
+        mock_data_io.stream_text.return_value = iter(["Some sample console output"])
+
+        b = Build(mock_data_io)
+
+        self.assertEqual("".join(b.iter_console_output()), "Some sample console output")
+        mock_data_io.stream_text.assert_called_once_with("/consoleText")
+
     def test_get_build_time(self):
         mock_data_io = MagicMock()
         #Build date: 12:03:17am Nov. 30, 2013
@@ -89,20 +109,28 @@ class build_tests(unittest.TestCase):
 
     def test_build_equality(self):
         mock_data_io = MagicMock()
-        mock_data_io.get_api_data.return_value = {"url":"www.someBuild.com"}
+        mock_data_io.url = "http://localhost:8080/job/j1/3/"
         first_build = Build(mock_data_io)
-        second_build = Build(mock_data_io)
+        mock_data_io2 = MagicMock()
+        mock_data_io2.url = "HTTP://LocalHost:8080/job/j1/3"
+        second_build = Build(mock_data_io2)
+
         self.assertEqual(second_build, first_build, "Build objects do not match when they should")
+        self.assertEqual(len(set([first_build, second_build])), 1)
+        self.assertEqual(mock_data_io.get_api_data.call_count, 0, "Comparing builds should not load any data")
+        self.assertEqual(mock_data_io2.get_api_data.call_count, 0, "Comparing builds should not load any data")
         
     def test_build_inequality(self):
         mock_data_io = MagicMock()
-        mock_data_io.get_api_data.return_value = {"url":"www.someBuild.com"}
+        mock_data_io.url = "http://localhost:8080/job/j1/3/"
         first_build = Build(mock_data_io)
         
         mock_data_io2 = MagicMock()
-        mock_data_io2.get_api_data.return_value = {"url":"www.someOtherBuild.com"}
+        mock_data_io2.url = "http://localhost:8080/job/j1/4/"
         second_build = Build(mock_data_io2)
         self.assertNotEqual(second_build, first_build, "Build objects match when they should not")
+        self.assertEqual(len(set([first_build, second_build])), 2)
+        self.assertEqual(mock_data_io.get_api_data.call_count, 0, "Comparing builds should not load any data")
         
         
 if __name__ == "__main__":
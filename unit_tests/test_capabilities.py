@@ -0,0 +1,140 @@
+import unittest
+import pytest
+from mock import MagicMock, patch
+from requests.exceptions import HTTPError
+from pyjen.utils.capabilities import Capabilities, parse_version, api_query, UNKNOWN_VERSION
+from pyjen.utils.datarequester import DataRequester
+
+URL = "http://localhost:8080/"
+
+
+def http_error(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return HTTPError(response=response)
+
+
+class capabilities_tests(unittest.TestCase):
+    def test_parse_version(self):
+        self.assertEqual(parse_version("2.60.3"), (2, 60, 3))
+        self.assertEqual(parse_version("2.89-SNAPSHOT"), (2, 89))
+        self.assertEqual(parse_version(UNKNOWN_VERSION), ())
+
+    def test_features(self):
+        caps = Capabilities("2.60.3", True)
+
+        self.assertTrue(caps.is_jenkins)
+        self.assertTrue(caps.tree_queries)
+        self.assertTrue(caps.api_json)
+        self.assertTrue(caps.progressive_text)
+        self.assertEqual(caps.to_dict(), {"version": "2.60.3", "api_json": True, "progressive_text": True,
+                                          "tree_queries": True, "crumb_required": True})
+
+    def test_unknown_server(self):
+        caps = Capabilities()
+
+        self.assertFalse(caps.is_jenkins)
+        self.assertFalse(caps.tree_queries)
+        self.assertFalse(caps.api_json)
+        self.assertFalse(caps.progressive_text)
+        self.assertFalse(caps.crumb_required)
+
+    def test_tree_queries_version(self):
+        self.assertFalse(Capabilities("1.366").tree_queries)
+        self.assertTrue(Capabilities("1.367").tree_queries)
+
+    def test_api_query(self):
+        data_io = MagicMock()
+        data_io.tree_queries = True
+        self.assertEqual(api_query(data_io, "jobs[name]", 1), "tree=jobs[name]")
+
+        data_io.tree_queries = False
+        self.assertEqual(api_query(data_io, "jobs[name]", 1), "depth=1")
+        self.assertIsNone(api_query(data_io, "lastBuild[url]"))
+
+    def test_probe(self):
+        data_io = MagicMock()
+        data_io.head.side_effect = [{"x-jenkins": "2.60.3"}, http_error(404), {}]
+
+        caps = Capabilities.probe(data_io)
+
+        self.assertEqual(caps.version, "2.60.3")
+        self.assertFalse(caps.crumb_required)
+        self.assertTrue(caps.api_json)
+        self.assertEqual([str(i) for i in data_io.head.call_args_list],
+                         ["call()", "call('/crumbIssuer/api/python')", "call('/api/json?tree=mode')"])
+
+    def test_probe_api_json(self):
+        data_io = MagicMock()
+        data_io.head.side_effect = [{"x-jenkins": "2.60.3"}, http_error(404), http_error(404)]
+        self.assertFalse(Capabilities.probe(data_io).api_json)
+
+    def test_probe_unknown_server(self):
+        data_io = MagicMock()
+        data_io.head.side_effect = [{}, http_error(404)]
+
+        caps = Capabilities.probe(data_io)
+
+        self.assertFalse(caps.api_json)
+        self.assertEqual(data_io.head.call_count, 2)
+
+    def test_probe_crumb_issuer(self):
+        data_io = MagicMock()
+        data_io.head.side_effect = [{"x-jenkins": "2.60.3"}, {}, {}]
+        self.assertTrue(Capabilities.probe(data_io).crumb_required)
+
+        data_io.head.side_effect = [{"x-jenkins": "2.60.3"}, http_error(403), {}]
+        self.assertTrue(Capabilities.probe(data_io).crumb_required)
+
+
+class data_requester_capabilities_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+
+    def tearDown(self):
+        DataRequester.clear()
+
+    def test_cached_per_host(self):
+        caps = Capabilities("2.60.3")
+        DataRequester.set_capabilities(URL, caps)
+
+        self.assertIs(DataRequester.get_capabilities(URL + "job/a/"), caps)
+        self.assertIsNone(DataRequester.get_capabilities("http://otherhost:8080/"))
+
+        DataRequester.set_capabilities(URL, None)
+        self.assertIsNone(DataRequester.get_capabilities(URL))
+
+    def test_tree_queries(self):
+        d = DataRequester(URL, None, None)
+        self.assertTrue(d.tree_queries)
+
+        DataRequester.set_capabilities(URL, Capabilities("1.366"))
+        self.assertFalse(d.tree_queries)
+
+        DataRequester.set_capabilities(URL, Capabilities("2.60.3"))
+        self.assertTrue(d.tree_queries)
+
+    def test_progressive_text(self):
+        d = DataRequester(URL, None, None)
+        self.assertTrue(d.progressive_text)
+
+        DataRequester.set_capabilities(URL, Capabilities())
+        self.assertFalse(d.progressive_text)
+
+        DataRequester.set_capabilities(URL, Capabilities("2.60.3"))
+        self.assertTrue(d.progressive_text)
+
+    def test_head(self):
+        with patch("pyjen.utils.datarequester.requests") as mock_requests:
+            mock_requests.head.return_value.status_code = 200
+            mock_requests.head.return_value.headers = {"x-jenkins": "2.60.3"}
+
+            headers = DataRequester(URL, None, None).head("/api/python")
+
+        self.assertEqual(headers, {"x-jenkins": "2.60.3"})
+        mock_requests.head.assert_called_once_with(URL + "api/python", auth=None, allow_redirects=True)
+        self.assertEqual(mock_requests.get.call_count, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
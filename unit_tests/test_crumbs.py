@@ -0,0 +1,154 @@
+import unittest
+import pytest
+from mock import MagicMock, patch
+from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel
+from pyjen.jenkins import Jenkins
+from pyjen.utils.capabilities import Capabilities
+from pyjen.utils.datarequester import DataRequester
+
+ROOT_URL = "http://localhost:8080/jenkins/"
+URL = ROOT_URL + "job/job1/"
+
+
+def make_response(status_code, text=""):
+    retval = MagicMock()
+    retval.status_code = status_code
+    retval.text = text
+    retval.content = text.encode("utf-8")
+    retval.headers = {}
+    return retval
+
+
+def crumb_response(crumb):
+    return make_response(200, repr({"crumb": crumb, "crumbRequestField": "Jenkins-Crumb"}))
+
+
+class crumb_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        patcher = patch("pyjen.utils.datarequester.requests")
+        self.addCleanup(patcher.stop)
+        self.mock_requests = patcher.start()
+        self.mock_requests.post.return_value = make_response(200)
+        self.mock_session = self.mock_requests.Session.return_value
+        self.mock_session.post.return_value = make_response(200)
+
+    def tearDown(self):
+        DataRequester.clear()
+
+    def test_crumb_reused(self):
+        DataRequester.set_capabilities(ROOT_URL, Capabilities("2.60.3", True, ROOT_URL))
+        self.mock_session.get.return_value = crumb_response("abc")
+
+        DataRequester(URL, None, None).post("/disable")
+        DataRequester(ROOT_URL + "job/job2", None, None).post("/config.xml", {"data": "<a/>", "headers": {"a": "b"}})
+
+        self.mock_session.get.assert_called_once_with(ROOT_URL + "crumbIssuer/api/python", auth=None)
+        self.assertEqual(self.mock_session.post.call_args_list[0][1]["headers"], {"Jenkins-Crumb": "abc"})
+        self.assertEqual(self.mock_session.post.call_args_list[1][1]["headers"], {"Jenkins-Crumb": "abc", "a": "b"})
+        # The crumb is only valid within the web session it was issued to
+        self.assertEqual(self.mock_requests.Session.call_count, 1)
+        self.assertEqual(self.mock_requests.get.call_count, 0)
+        self.assertEqual(self.mock_requests.post.call_count, 0)
+
+    def test_crumbs_per_user(self):
+        DataRequester.set_capabilities(ROOT_URL, Capabilities("2.60.3", True, ROOT_URL))
+        sessions = {}
+
+        def new_session():
+            retval = MagicMock()
+            retval.get.return_value = crumb_response("crumb" + str(len(sessions)))
+            retval.post.return_value = make_response(200)
+            sessions[len(sessions)] = retval
+            return retval
+        self.mock_requests.Session.side_effect = new_session
+
+        DataRequester(URL, "user1", "pass1").post("/disable")
+        DataRequester(URL, "user2", "pass2").post("/disable")
+        DataRequester(URL, "user1", "pass1").post("/enable")
+
+        self.assertEqual(len(sessions), 2)
+        self.assertEqual(sessions[0].get.call_count, 1)
+        self.assertEqual(sessions[1].get.call_count, 1)
+        self.assertEqual([i[1]["headers"]["Jenkins-Crumb"] for i in sessions[0].post.call_args_list],
+                         ["crumb0", "crumb0"])
+        self.assertEqual([i[1]["auth"] for i in sessions[0].post.call_args_list],
+                         [("user1", "pass1"), ("user1", "pass1")])
+        self.assertEqual(sessions[1].post.call_args[1]["headers"]["Jenkins-Crumb"], "crumb1")
+        self.assertEqual(sessions[1].post.call_args[1]["auth"], ("user2", "pass2"))
+
+    def test_not_required(self):
+        DataRequester.set_capabilities(ROOT_URL, Capabilities("2.60.3", False, ROOT_URL))
+
+        DataRequester(URL, None, None).post("/disable")
+
+        self.assertEqual(self.mock_requests.get.call_count, 0)
+        self.mock_requests.post.assert_called_once_with(URL + "disable", auth=None)
+        self.assertEqual(self.mock_requests.Session.call_count, 0)
+
+    def test_expired_crumb_refreshed(self):
+        DataRequester.set_capabilities(ROOT_URL, Capabilities("2.60.3", True, ROOT_URL))
+        self.mock_session.get.side_effect = [crumb_response("old"), crumb_response("new")]
+        self.mock_session.post.side_effect = [make_response(403), make_response(200), make_response(200)]
+
+        DataRequester(URL, None, None).post("/disable")
+        DataRequester(URL, None, None).post("/enable")
+
+        self.assertEqual(self.mock_session.get.call_count, 2)
+        self.assertEqual([i[1]["headers"]["Jenkins-Crumb"] for i in self.mock_session.post.call_args_list],
+                         ["old", "new", "new"])
+
+    def test_forbidden_without_crumb_issuer(self):
+        self.mock_session.get.return_value = make_response(404)
+        self.mock_requests.post.return_value = make_response(403)
+        self.mock_requests.post.return_value.raise_for_status.side_effect = RuntimeError("forbidden")
+
+        self.assertRaises(RuntimeError, DataRequester(URL, None, None).post, "/disable")
+        self.assertEqual(self.mock_requests.post.call_count, 1)
+        self.mock_session.get.assert_called_once_with("http://localhost:8080/crumbIssuer/api/python", auth=None)
+
+
+class fake_jenkins_crumb_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        self.server = FakeJenkinsServer(JenkinsModel(num_jobs=5, builds_per_job=1), crumb="abc")
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.jenkins = Jenkins(DataRequester(self.server.url, None, None))
+
+    def tearDown(self):
+        DataRequester.clear()
+
+    def crumb_requests(self):
+        return [i for i in self.server.requests if i[0] == "GET" and i[1].startswith("/crumbIssuer")]
+
+    def test_bulk_operation_uses_one_crumb(self):
+        self.assertTrue(self.jenkins.capabilities.crumb_required)
+        for name in self.jenkins.all_job_names:
+            self.jenkins.find_job(name).disable()
+
+        self.assertEqual(len(self.crumb_requests()), 1)
+        self.assertTrue(all(i["color"] == "disabled" for i in self.server.model.jobs.values()))
+
+    def test_crumb_bound_to_session(self):
+        self.assertTrue(self.jenkins.capabilities.crumb_required)
+        self.jenkins.find_job("job00000").disable()
+
+        self.assertEqual(len(self.crumb_requests()), 1)
+        self.assertEqual(self.server.model.jobs["job00000"]["color"], "disabled")
+        self.assertFalse(any(i[0] == "POST" and i[1].endswith("/disable") for i in self.server.requests[:-1]),
+                         "The crumb should have been accepted on the first attempt")
+
+    def test_expired_crumb(self):
+        self.jenkins.capabilities  # pylint: disable=W0104
+        job = self.jenkins.find_job("job00000")
+        job.disable()
+        self.server.crumb = "def"
+        job.enable()
+
+        self.assertEqual(len(self.crumb_requests()), 2)
+        self.assertEqual(self.server.model.jobs["job00000"]["color"], "blue")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
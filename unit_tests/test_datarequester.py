@@ -0,0 +1,185 @@
+import unittest
+import time
+import threading
+import pytest
+from mock import MagicMock, PropertyMock, patch
+from requests.exceptions import HTTPError
+from pyjen.utils.datarequester import DataRequester, TextStream, _SingleFlight
+
+URL = "http://localhost:8080/job/job1/"
+
+
+class single_flight_tests(unittest.TestCase):
+    def test_sequential_calls_not_shared(self):
+        sf = _SingleFlight()
+
+        self.assertEqual(sf.do("key", lambda: 1), (1, False))
+        self.assertEqual(sf.do("key", lambda: 2), (2, False))
+        self.assertEqual(sf.coalesced, 0)
+
+    def test_error_propagates(self):
+        sf = _SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        self.assertRaises(ValueError, sf.do, "key", fail)
+        # A failed call must not leave the key marked as in progress
+        self.assertEqual(sf.do("key", lambda: 3), (3, False))
+
+
+class coalescing_tests(unittest.TestCase):
+    def test_concurrent_api_requests_share_one_get(self):
+        release = threading.Event()
+        started = threading.Event()
+        response = MagicMock()
+        response.status_code = 200
+        response.text = "{'name': 'job1'}"
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return response
+
+        num_threads = 5
+        results = []
+        before = DataRequester.coalesced_request_count()
+        with patch("pyjen.utils.datarequester.requests") as mock_requests:
+            mock_requests.get.side_effect = slow_get
+
+            def worker():
+                results.append(DataRequester(URL, None, None).get_api_data())
+
+            leader = threading.Thread(target=worker)
+            leader.start()
+            followers = [threading.Thread(target=worker) for _ in range(num_threads - 1)]
+            try:
+                self.assertTrue(started.wait(5), "Timed out waiting for the first request to start")
+                for cur_thread in followers:
+                    cur_thread.start()
+                deadline = time.time() + 5
+                while DataRequester.coalesced_request_count() - before < num_threads - 1:
+                    self.assertLess(time.time(), deadline, "Timed out waiting for requests to be coalesced")
+                    time.sleep(0.01)
+            finally:
+                release.set()
+                for cur_thread in [leader] + followers:
+                    if cur_thread.ident is not None:
+                        cur_thread.join(5)
+                        self.assertFalse(cur_thread.is_alive())
+
+        self.assertEqual(mock_requests.get.call_count, 1)
+        self.assertEqual(len(results), num_threads)
+        for cur_result in results:
+            self.assertEqual(cur_result, {'name': 'job1'})
+        self.assertEqual(DataRequester.coalesced_request_count() - before, num_threads - 1)
+
+
+    def test_requests_not_shared_between_users(self):
+        release = threading.Event()
+        response = MagicMock()
+        response.status_code = 200
+        response.text = "{'jobs': []}"
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return response
+
+        credentials = [("user1", "pass1"), ("user1", "pass1"), ("user2", "pass2"), (None, None)]
+        results = {}
+        before = DataRequester.coalesced_request_count()
+        with patch("pyjen.utils.datarequester.requests") as mock_requests:
+            mock_requests.get.side_effect = slow_get
+
+            def worker(index):
+                results[index] = DataRequester(URL, *credentials[index]).get_api_data()
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(credentials))]
+            try:
+                for cur_thread in threads:
+                    cur_thread.start()
+                # One request is sent for each distinct set of credentials
+                deadline = time.time() + 5
+                while mock_requests.get.call_count < 3 or DataRequester.coalesced_request_count() - before < 1:
+                    self.assertLess(time.time(), deadline, "Timed out waiting for requests to be sent")
+                    time.sleep(0.01)
+            finally:
+                release.set()
+                for cur_thread in threads:
+                    if cur_thread.ident is not None:
+                        cur_thread.join(5)
+                        self.assertFalse(cur_thread.is_alive())
+
+        self.assertEqual(mock_requests.get.call_count, 3)
+        self.assertEqual(DataRequester.coalesced_request_count() - before, 1)
+        self.assertEqual(results[0], results[1])
+        self.assertIsNot(results[0], results[1], "Callers sharing a request must get their own copy of the data")
+
+
+class streaming_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        patcher = patch("pyjen.utils.datarequester.requests")
+        self.addCleanup(patcher.stop)
+        self.mock_requests = patcher.start()
+        self.response = self.mock_requests.get.return_value
+        self.response.status_code = 200
+        self.response.encoding = "utf-8"
+        self.response.headers = {"Content-Length": "42"}
+
+    def test_multibyte_characters_split_across_chunks(self):
+        data = u"caf\u00e9 \u2603\n".encode("utf-8")
+        self.response.iter_content.return_value = [data[i:i + 1] for i in range(len(data))]
+
+        text = u"".join(DataRequester(URL, None, None).stream_text("/consoleText"))
+
+        self.assertEqual(text, u"caf\u00e9 \u2603\n")
+        self.mock_requests.get.assert_called_once_with(URL + "consoleText", auth=None, stream=True)
+        self.response.close.assert_called_once_with()
+
+    def test_content_not_read_before_streaming(self):
+        events = []
+        DataRequester.add_observer(events.append)
+        try:
+            stream = DataRequester(URL, None, None).stream_text()
+        finally:
+            DataRequester.remove_observer(events.append)
+
+        self.assertIsInstance(stream, TextStream)
+        self.assertEqual(stream.headers, {"Content-Length": "42"})
+        self.assertEqual(events, [], "Streamed requests should be reported once the stream is closed")
+        self.assertEqual(self.response.iter_content.call_count, 0)
+
+    def test_decompressed_size_reported(self):
+        # The server reports the size of the compressed body, which must not be used
+        self.response.headers = {"Content-Length": "10", "Content-Encoding": "gzip"}
+        self.response.iter_content.return_value = [b"a" * 30, b"b" * 20]
+        self.response.content = b"a" * 30 + b"b" * 20
+        events = []
+        DataRequester.add_observer(events.append)
+        try:
+            requester = DataRequester(URL, None, None)
+            self.assertEqual(len(u"".join(requester.stream_text())), 50)
+            requester.get_text("/api/python")
+        finally:
+            DataRequester.remove_observer(events.append)
+
+        self.assertEqual([i.bytes for i in events], [50, 50])
+
+    def test_error_status(self):
+        self.response.status_code = 404
+        self.response.raise_for_status.side_effect = HTTPError()
+
+        self.assertRaises(HTTPError, DataRequester(URL, None, None).stream_text)
+        self.response.close.assert_called_once_with()
+
+    def test_text_decoded_once(self):
+        self.response.headers = {}
+        type(self.response).text = text_property = PropertyMock(return_value="{'a': 1}")
+
+        self.assertEqual(DataRequester(URL, None, None).get_api_data(), {'a': 1})
+        self.assertEqual(text_property.call_count, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
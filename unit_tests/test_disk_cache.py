@@ -0,0 +1,135 @@
+import unittest
+import os
+import shutil
+import tempfile
+import pytest
+from mock import MagicMock, patch
+from pyjen.utils.diskcache import DiskCache, CachePolicy
+from pyjen.utils.datarequester import DataRequester
+
+BUILD_URL = "http://localhost:8080/job/job1/12/"
+
+
+class cache_policy_tests(unittest.TestCase):
+    def test_build_url(self):
+        self.assertEqual(CachePolicy.build_url(BUILD_URL + "consoleText"), BUILD_URL)
+        self.assertEqual(CachePolicy.build_url("http://localhost:8080/job/f/job/j/3/api/python"),
+                         "http://localhost:8080/job/f/job/j/3/")
+        self.assertIsNone(CachePolicy.build_url("http://localhost:8080/job/job1/api/python"))
+        self.assertIsNone(CachePolicy.build_url("http://localhost:8080/job/job1/lastBuild/api/python"))
+
+    def test_finished_build(self):
+        cache = MagicMock()
+        p = CachePolicy()
+
+        self.assertTrue(p.is_permanent(BUILD_URL + "api/python", "{'building': False, 'number': 12}", cache))
+        self.assertTrue(p.is_permanent(BUILD_URL + "api/json", '{"building":false}', cache))
+        self.assertFalse(p.is_permanent(BUILD_URL + "api/python", "{'building': True}", cache))
+        self.assertFalse(p.is_permanent(BUILD_URL + "api/python?tree=number", "{'number': 12}", cache))
+        self.assertFalse(p.is_permanent(BUILD_URL + "api/python", "not python", cache))
+
+    def test_running_build_with_finished_runs(self):
+        p = CachePolicy()
+        python_data = "{'building': True, 'runs': [{'building': False, 'number': 12}], 'number': 12}"
+        json_data = '{"runs": [{"building": false}], "building": true}'
+
+        self.assertFalse(p.is_permanent(BUILD_URL + "api/python?depth=1", python_data, MagicMock()))
+        self.assertFalse(p.is_permanent(BUILD_URL + "api/json?depth=1", json_data, MagicMock()))
+        self.assertTrue(p.is_permanent(BUILD_URL + "api/json?depth=1", json_data.replace("true", "false"),
+                                       MagicMock()))
+
+    def test_non_build_url(self):
+        p = CachePolicy()
+
+        self.assertFalse(p.is_permanent("http://localhost:8080/job/job1/api/python", "{'building': False}",
+                                        MagicMock()))
+
+
+class disk_cache_tests(unittest.TestCase):
+    def setUp(self):
+        self.temp_folder = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.temp_folder, "cache.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_folder)
+
+    def test_permanent_entry(self):
+        cache = DiskCache(self.cache_file)
+        cache.put("http://fake/a", u"some data é", permanent=True)
+
+        self.assertEqual(cache.get("http://fake/a"), u"some data é")
+        self.assertIsNone(cache.get("http://fake/b"))
+
+    def test_persistence(self):
+        cache = DiskCache(self.cache_file)
+        cache.put("http://fake/a", "some data", permanent=True)
+        cache.close()
+
+        cache = DiskCache(self.cache_file)
+        self.assertEqual(cache.get("http://fake/a"), "some data")
+
+    def test_transient_entries_not_stored_by_default(self):
+        cache = DiskCache(self.cache_file)
+        cache.put("http://fake/a", "some data")
+
+        self.assertEqual(len(cache), 0)
+
+    def test_expired_entry(self):
+        cache = DiskCache(self.cache_file)
+        cache.put("http://fake/a", "some data", ttl=-1)
+
+        self.assertIsNone(cache.get("http://fake/a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = DiskCache(self.cache_file)
+        cache.put("http://fake/a", "a" * 1000, permanent=True)
+        size_of_one = cache.size
+        cache = DiskCache(self.cache_file, max_size=size_of_one * 2)
+        cache.put("http://fake/b", "b" * 1000, permanent=True)
+        cache.get("http://fake/a")
+        cache.put("http://fake/c", "c" * 1000, permanent=True)
+
+        self.assertIsNotNone(cache.get("http://fake/a"))
+        self.assertIsNone(cache.get("http://fake/b"))
+        self.assertIsNotNone(cache.get("http://fake/c"))
+
+    def test_store_finished_build(self):
+        cache = DiskCache(self.cache_file)
+        cache.store(BUILD_URL + "consoleText", "output")
+        self.assertIsNone(cache.get(BUILD_URL + "consoleText"))
+
+        cache.store(BUILD_URL + "api/python", "{'building': False}")
+        cache.store(BUILD_URL + "consoleText", "output")
+
+        self.assertTrue(cache.is_finished_build(BUILD_URL))
+        self.assertEqual(cache.get(BUILD_URL + "consoleText"), "output")
+
+    def test_clear(self):
+        cache = DiskCache(self.cache_file)
+        cache.store(BUILD_URL + "api/python", "{'building': False}")
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertFalse(cache.is_finished_build(BUILD_URL))
+
+    def test_data_requester_integration(self):
+        cache = DiskCache(self.cache_file)
+        DataRequester.set_disk_cache(cache)
+        try:
+            with patch("pyjen.utils.datarequester.requests") as mock_requests:
+                mock_requests.get.return_value.status_code = 200
+                mock_requests.get.return_value.text = "{'building': False, 'number': 12}"
+
+                d = DataRequester(BUILD_URL, None, None)
+                first = d.get_api_data()
+                second = d.get_api_data()
+
+            self.assertEqual(first, second)
+            self.assertEqual(mock_requests.get.call_count, 1)
+        finally:
+            DataRequester.set_disk_cache(None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,120 @@
+import unittest
+import json
+import pytest
+import requests
+from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel, parse_tree, render, JobEntity
+from pyjen.jenkins import Jenkins
+from pyjen.utils.datarequester import DataRequester
+
+
+class tree_tests(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_tree("name,jobs[name,builds[number]{0,5}],views{2}"),
+                         {"name": (None, None),
+                          "jobs": ({"name": (None, None), "builds": ({"number": (None, None)}, (0, 5))}, None),
+                          "views": (None, (2, 3))})
+
+    def test_render_projection(self):
+        job = JobEntity(_class="job", name="a", url="u", color="blue", builds=[{"number": 2}, {"number": 1}])
+        data = {"jobs": [job], "other": 1}
+
+        self.assertEqual(render(data), {"jobs": [{"_class": "job", "name": "a", "url": "u", "color": "blue"}],
+                                        "other": 1})
+        self.assertEqual(render(data, parse_tree("jobs[builds[number]{0,1}]")),
+                         {"jobs": [{"_class": "job", "builds": [{"number": 2}]}]})
+
+
+class fake_jenkins_tests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeJenkinsServer(JenkinsModel(num_jobs=20, builds_per_job=3, num_views=2, num_nodes=2))
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        DataRequester.clear()
+        self.server.reset_requests()
+        self.jenkins = Jenkins(DataRequester(self.server.url, None, None))
+
+    def test_api_data(self):
+        self.assertEqual(len(self.jenkins.all_job_names), 20)
+        self.assertEqual(self.jenkins.nodes[0].name, "master")
+        self.assertEqual(len(self.jenkins.nodes), 3)
+
+    def test_json_tree(self):
+        text = requests.get(self.server.url + "job/job00000/api/json?tree=builds[number]").text
+
+        self.assertEqual(json.loads(text), {"_class": "hudson.model.FreeStyleProject",
+                                            "builds": [{"_class": "hudson.model.FreeStyleBuild", "number": 3},
+                                                       {"_class": "hudson.model.FreeStyleBuild", "number": 2},
+                                                       {"_class": "hudson.model.FreeStyleBuild", "number": 1}]})
+
+    def test_job_and_build(self):
+        job = self.jenkins.find_job("job00001")
+        build = job.last_build
+
+        self.assertEqual(job.name, "job00001")
+        self.assertEqual(build.number, 3)
+        self.assertIn("Started by user admin", build.console_output)
+
+    def test_view_jobs(self):
+        view = self.jenkins.find_view("view1")
+
+        self.assertEqual(len(view.jobs), 10)
+
+    def test_post_operations(self):
+        job = self.jenkins.find_job("job00002")
+        job.disable()
+        DataRequester.clear()
+        self.assertTrue(job.is_disabled)
+        job.enable()
+        DataRequester.clear()
+        self.assertFalse(job.is_disabled)
+
+    def test_progressive_text(self):
+        url = self.server.url + "job/job00003/1/logText/progressiveText"
+        full = requests.get(url)
+        partial = requests.get(url + "?start=10")
+
+        self.assertEqual(full.headers["X-Text-Size"], str(len(full.text)))
+        self.assertEqual(partial.text, full.text[10:])
+
+    def test_compressed_responses(self):
+        url = self.server.url + "job/job00003/1/consoleText"
+        compressed = requests.get(url, headers={"Accept-Encoding": "gzip"})
+        plain = requests.get(url, headers={"Accept-Encoding": "identity"})
+
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(compressed.text, plain.text)
+        self.assertLess(int(compressed.headers["Content-Length"]), len(plain.content))
+
+    def test_streamed_console_output(self):
+        build = self.jenkins.find_job("job00004").last_build
+
+        self.assertEqual("".join(build.iter_console_output()), build.console_output)
+
+    def test_capabilities(self):
+        caps = self.jenkins.capabilities
+
+        self.assertEqual(caps.version, "2.60.3")
+        self.assertFalse(caps.crumb_required)
+        self.assertTrue(caps.api_json)
+        self.assertEqual([i[0] for i in self.server.requests], ["HEAD", "HEAD", "HEAD"])
+
+    def test_not_found(self):
+        self.assertEqual(requests.get(self.server.url + "job/missing/api/python").status_code, 404)
+
+    def test_injected_failures(self):
+        self.server.fail_next(2)
+        statuses = [requests.get(self.server.url + "api/python").status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [503, 503, 200])
+        self.assertEqual(len(self.server.requests), 3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,189 @@
+import unittest
+from pyjen.fleet import Fleet, FLEET_TREE
+from mock import MagicMock
+import pytest
+
+
+class fleet_tests(unittest.TestCase):
+    def setUp(self):
+        self.computer_url = "http://localhost:8080/computer/"
+        computers = []
+        computers.append({"displayName": "master", "offline": False, "idle": False,
+                          "offlineCauseReason": "", "assignedLabels": [{"name": "master"}],
+                          "executors": [{"idle": False}, {"idle": True}]})
+        computers.append({"displayName": "agent1", "offline": True, "idle": True,
+                          "offlineCauseReason": "Patching", "assignedLabels": [{"name": "linux"}],
+                          "executors": [{"idle": True}]})
+        computers.append({"displayName": "agent2", "offline": True, "idle": True,
+                          "offlineCauseReason": None, "assignedLabels": [{"name": "linux"}],
+                          "executors": [{"idle": True}, {"idle": True}]})
+
+        self.mock_data_io = MagicMock()
+        self.mock_data_io.url = self.computer_url
+        self.mock_data_io.get_api_data.return_value = {"busyExecutors": 1, "totalExecutors": 5,
+                                                       "computer": computers}
+
+    def test_single_request(self):
+        f = Fleet(self.mock_data_io)
+        f.total_executors
+        f.offline_nodes
+        f.executor_counts
+        for n in f.nodes:
+            n.name
+            n.is_idle
+            n.is_offline
+
+        self.mock_data_io.get_api_data.assert_called_once_with(query_params="tree=" + FLEET_TREE)
+        for cur_clone in self.mock_data_io.clone.return_value.mock_calls:
+            self.assertNotIn("get_api_data", str(cur_clone))
+
+    def test_refresh(self):
+        f = Fleet(self.mock_data_io)
+        f.total_executors
+        f.refresh()
+        f.total_executors
+
+        self.assertEqual(self.mock_data_io.get_api_data.call_count, 2)
+
+    def test_executor_totals(self):
+        f = Fleet(self.mock_data_io)
+
+        self.assertEqual(f.total_executors, 5)
+        self.assertEqual(f.busy_executors, 1)
+        self.assertEqual(f.idle_executors, 4)
+
+    def test_executor_counts(self):
+        f = Fleet(self.mock_data_io)
+        counts = f.executor_counts
+
+        self.assertEqual(counts["master"], (1, 2))
+        self.assertEqual(counts["agent1"], (0, 1))
+        self.assertEqual(counts["agent2"], (0, 2))
+
+    def test_node_states(self):
+        f = Fleet(self.mock_data_io)
+
+        self.assertEqual(f.node_names, ["master", "agent1", "agent2"])
+        self.assertEqual(f.busy_nodes, ["master"])
+        self.assertEqual(f.idle_nodes, ["agent1", "agent2"])
+        self.assertEqual(f.offline_nodes, ["agent1", "agent2"])
+
+    def test_offline_reasons(self):
+        f = Fleet(self.mock_data_io)
+
+        self.assertEqual(f.offline_reasons, {"agent1": "Patching", "agent2": ""})
+
+    def test_labels(self):
+        f = Fleet(self.mock_data_io)
+
+        self.assertEqual(f.labels, {"master": ["master"], "linux": ["agent1", "agent2"]})
+
+    def test_node_urls(self):
+        f = Fleet(self.mock_data_io)
+        nodes = f.nodes
+
+        self.assertEqual(len(nodes), 3)
+        self.mock_data_io.clone.assert_any_call("http://localhost:8080/computer/(master)")
+        self.mock_data_io.clone.assert_any_call("http://localhost:8080/computer/agent1")
+
+
+class fleet_batch_tests(unittest.TestCase):
+    def setUp(self):
+        self.computer_url = "http://localhost:8080/computer"
+        self.node_states = {"agent1": {"temporarilyOffline": False, "idle": False},
+                            "agent2": {"temporarilyOffline": True, "idle": True},
+                            "agent3": {"temporarilyOffline": False, "idle": True}}
+        self.node_data_io = {}
+        for name in self.node_states:
+            self.node_data_io[self.computer_url + "/" + name] = MagicMock()
+
+        self.mock_data_io = MagicMock()
+        self.mock_data_io.url = self.computer_url
+        self.mock_data_io.get_api_data.side_effect = self.mock_get_api_data
+        self.mock_data_io.clone.side_effect = lambda url: self.node_data_io[url]
+
+    def mock_get_api_data(self, query_params=None):
+        computers = []
+        for name in sorted(self.node_states):
+            computers.append({"displayName": name,
+                              "offline": self.node_states[name]["temporarilyOffline"],
+                              "temporarilyOffline": self.node_states[name]["temporarilyOffline"],
+                              "idle": self.node_states[name]["idle"]})
+        # Simulate builds on busy nodes completing between polls
+        self.node_states["agent1"]["idle"] = True
+        return {"computer": computers}
+
+    def test_take_offline(self):
+        f = Fleet(self.mock_data_io)
+        toggled = f.take_offline(["agent1", "agent2"], "Maintenance")
+
+        self.assertEqual(toggled, ["agent1"])
+        self.node_data_io[self.computer_url + "/agent1"].post.assert_called_once_with(
+            "/toggleOffline?offlineMessage=Maintenance")
+        self.assertEqual(self.node_data_io[self.computer_url + "/agent2"].post.call_count, 0)
+
+    def test_bring_online(self):
+        f = Fleet(self.mock_data_io)
+        toggled = f.bring_online(["agent1", "agent2"])
+
+        self.assertEqual(toggled, ["agent2"])
+        self.node_data_io[self.computer_url + "/agent2"].post.assert_called_once_with("/toggleOffline")
+
+    def test_iter_idle(self):
+        f = Fleet(self.mock_data_io)
+        idle_nodes = list(f.iter_idle(["agent1", "agent3"], poll_interval=0))
+
+        self.assertEqual(idle_nodes, ["agent3", "agent1"])
+        self.assertEqual(self.mock_data_io.get_api_data.call_count, 2)
+
+    def test_wait_for_idle_timeout(self):
+        self.node_states["agent1"]["idle"] = False
+        self.mock_data_io.get_api_data.side_effect = None
+        self.mock_data_io.get_api_data.return_value = {"computer": [{"displayName": "agent1", "idle": False}]}
+        f = Fleet(self.mock_data_io)
+        result = f.wait_for_idle(["agent1"], max_timeout=0)
+
+        self.assertEqual(result, {"agent1": False})
+
+    def test_iter_idle_unknown_node(self):
+        f = Fleet(self.mock_data_io)
+
+        with self.assertRaises(ValueError):
+            list(f.iter_idle(["agent1", "agent4"], poll_interval=0))
+        self.assertRaises(ValueError, f.wait_for_idle, ["agent4"], poll_interval=0)
+
+    def test_unknown_node_not_toggled(self):
+        f = Fleet(self.mock_data_io)
+
+        self.assertRaises(ValueError, f.take_offline, ["agent1", "agent4"])
+        self.assertRaises(ValueError, f.bring_online, ["agent2", "agent4"])
+        self.assertRaises(ValueError, f.drain, ["agent3", "agent4"], poll_interval=0)
+        for node_data_io in self.node_data_io.values():
+            self.assertEqual(node_data_io.post.call_count, 0)
+
+    def test_iter_idle_removed_node(self):
+        self.node_states["agent2"]["idle"] = False
+        original = self.mock_get_api_data
+
+        def remove_agent2(query_params=None):
+            retval = original(query_params)
+            self.node_states.pop("agent2", None)
+            return retval
+        self.mock_data_io.get_api_data.side_effect = remove_agent2
+        f = Fleet(self.mock_data_io)
+        result = f.wait_for_idle(["agent1", "agent2"], poll_interval=0)
+
+        self.assertEqual(result, {"agent1": True, "agent2": False})
+        self.assertEqual(self.mock_data_io.get_api_data.call_count, 2)
+
+    def test_drain(self):
+        f = Fleet(self.mock_data_io)
+        result = f.drain(["agent1", "agent3"], poll_interval=0)
+
+        self.assertEqual(result, {"agent1": True, "agent3": True})
+        self.assertEqual(self.node_data_io[self.computer_url + "/agent1"].post.call_count, 1)
+        self.assertEqual(self.node_data_io[self.computer_url + "/agent3"].post.call_count, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
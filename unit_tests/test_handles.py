@@ -0,0 +1,151 @@
+import unittest
+import pytest
+from mock import MagicMock
+from pyjen.handles import JobHandle, BuildHandle
+from pyjen.build import Build
+from pyjen.job import Job
+
+
+class job_handle_tests(unittest.TestCase):
+    def test_lazy_upgrade(self):
+        mock_job_data_io = MagicMock()
+        mock_job_data_io.config_xml = "<project><disabled>true</disabled></project>"
+        mock_job_data_io.get_api_data.return_value = {"name": "j1", "color": "disabled"}
+        mock_data_io = MagicMock()
+        mock_data_io.clone.return_value = mock_job_data_io
+
+        h = JobHandle(mock_data_io, None, "j1", "http://fake/job/j1/")
+        self.assertEqual(h.name, "j1")
+        self.assertEqual(h.url, "http://fake/job/j1/")
+        self.assertEqual(mock_data_io.clone.call_count, 0)
+
+        self.assertTrue(h.is_disabled)
+        self.assertEqual(h.job.type, "project")
+        mock_data_io.clone.assert_called_once_with("http://fake/job/j1/")
+
+    def test_unknown_name(self):
+        mock_job_data_io = MagicMock()
+        mock_job_data_io.config_xml = "<project></project>"
+        mock_job_data_io.get_api_data.return_value = {"name": "j1"}
+        mock_data_io = MagicMock()
+        mock_data_io.clone.return_value = mock_job_data_io
+
+        h = JobHandle(mock_data_io, None, None, "http://fake/job/j1/")
+        self.assertEqual(h.name, "j1")
+        self.assertEqual(h.name, "j1")
+        self.assertEqual(mock_data_io.clone.call_count, 1)
+
+    def test_equality(self):
+        h1 = JobHandle(None, None, "j1", "http://fake/job/j1/")
+        h2 = JobHandle(None, None, "j1", "http://fake/job/j1")
+        h3 = JobHandle(None, None, "j2", "http://fake/job/j2/")
+
+        self.assertEqual(h1, h2)
+        self.assertNotEqual(h1, h3)
+        self.assertEqual(len(set([h1, h2, h3])), 2)
+
+    def test_equality_with_jobs(self):
+        mock_data_io = MagicMock()
+        mock_data_io.url = "http://FAKE:80/view/all/job/j1"
+        j1 = Job._create(mock_data_io, None, "j1")
+        h1 = JobHandle(None, None, "j1", "http://fake/job/j1/")
+        h2 = JobHandle(None, None, "j2", "http://fake/job/j2/")
+
+        self.assertTrue(h1 == j1)
+        self.assertTrue(j1 == h1)
+        self.assertFalse(h1 != j1)
+        self.assertFalse(j1 != h1)
+        self.assertNotEqual(h2, j1)
+        self.assertNotEqual(j1, h2)
+        self.assertEqual(hash(h1), hash(j1))
+        self.assertEqual(len(set([h1, j1, h2])), 2)
+        self.assertNotEqual(h1, "http://fake/job/j1/")
+
+    def test_equality_with_encoded_names(self):
+        mock_data_io = MagicMock()
+        mock_data_io.url = "http://fake/job/my job"
+        j1 = Job._create(mock_data_io, None, "my job")
+        h1 = JobHandle(None, None, "my job", "http://fake/job/my%20job/")
+
+        self.assertEqual(h1, j1)
+        self.assertEqual(j1, h1)
+        self.assertEqual(hash(h1), hash(j1))
+
+    def test_set_attribute(self):
+        mock_job_data_io = MagicMock()
+        mock_job_data_io.config_xml = "<project></project>"
+        mock_data_io = MagicMock()
+        mock_data_io.clone.return_value = mock_job_data_io
+
+        h = JobHandle(mock_data_io, None, "j1", "http://fake/job/j1/")
+        h.config_xml = "<project><disabled>true</disabled></project>"
+
+        self.assertIsNotNone(h._job)
+        self.assertEqual(mock_job_data_io.config_xml, "<project><disabled>true</disabled></project>")
+        self.assertFalse(hasattr(h, "__dict__"))
+
+    def test_slots(self):
+        h = JobHandle(None, None, "j1", "http://fake/job/j1/")
+        self.assertFalse(hasattr(h, "__dict__"))
+
+
+class build_handle_tests(unittest.TestCase):
+    def test_lazy_upgrade(self):
+        mock_build_data_io = MagicMock()
+        mock_build_data_io.get_api_data.return_value = {"building": True}
+        mock_data_io = MagicMock()
+        mock_data_io.clone.return_value = mock_build_data_io
+
+        h = BuildHandle(mock_data_io, "http://fake/job/j1/3/", 3)
+        self.assertEqual(h.number, 3)
+        self.assertEqual(mock_data_io.clone.call_count, 0)
+
+        self.assertTrue(h.is_building)
+        mock_data_io.clone.assert_called_once_with("http://fake/job/j1/3/")
+
+    def test_unknown_number(self):
+        mock_build_data_io = MagicMock()
+        mock_build_data_io.get_api_data.return_value = {"number": 3}
+        mock_data_io = MagicMock()
+        mock_data_io.clone.return_value = mock_build_data_io
+
+        h = BuildHandle(mock_data_io, "http://fake/job/j1/lastBuild/")
+        self.assertEqual(h.number, 3)
+
+    def test_equality(self):
+        h1 = BuildHandle(None, "http://fake/job/j1/3/", 3)
+        h2 = BuildHandle(None, "http://FAKE/job/j1/3", 3)
+        h3 = BuildHandle(None, "http://fake/job/j1/4/", 4)
+
+        self.assertEqual(h1, h2)
+        self.assertNotEqual(h1, h3)
+        self.assertEqual(len(set([h1, h2, h3])), 2)
+        self.assertFalse(hasattr(h1, "__dict__"))
+
+    def test_equality_with_builds(self):
+        mock_data_io = MagicMock()
+        mock_data_io.url = "http://fake/job/j1/3"
+        b = Build(mock_data_io)
+        h1 = BuildHandle(None, "http://fake/job/j1/3/", 3)
+        h2 = BuildHandle(None, "http://fake/job/j1/4/", 4)
+
+        self.assertTrue(h1 == b)
+        self.assertTrue(b == h1)
+        self.assertFalse(h1 != b)
+        self.assertFalse(b != h1)
+        self.assertNotEqual(h2, b)
+        self.assertEqual(hash(h1), hash(b))
+        self.assertIn(b, [h2, h1])
+
+    def test_set_attribute(self):
+        build = MagicMock()
+        h = BuildHandle(None, "http://fake/job/j1/3/", 3)
+        h._build = build
+        h.description = "Release candidate"
+
+        self.assertEqual(build.description, "Release candidate")
+        self.assertEqual(h._build, build)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,128 @@
+import unittest
+import pytest
+from mock import MagicMock, patch
+from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel
+from pyjen.jenkins import Jenkins
+from pyjen.utils.datarequester import DataRequester
+from pyjen import history
+from pyjen.history import BuildHistory, result_code, RESULT_SUCCESS, RESULT_FAILURE, RESULT_ABORTED, \
+    RESULT_BUILDING, RESULT_NOT_BUILT
+
+S, F = RESULT_SUCCESS, RESULT_FAILURE
+
+# Builds of job 'a', most recent first, as reported by Jenkins
+JOB_A = [(8, 7000, 50, RESULT_ABORTED), (7, 6000, 0, RESULT_BUILDING), (6, 5000, 500, F), (5, 4000, 400, S),
+         (4, 3000, 300, S), (3, 2000, 200, F), (2, 1000, 100, F), (1, 0, 100, S)]
+JOB_B = [(2, 1500, 1000, S), (1, 500, 1000, F)]
+
+
+def make_history():
+    retval = BuildHistory()
+    for number, timestamp, duration, result in JOB_A:
+        retval.append("a", number, timestamp, duration, result)
+    for number, timestamp, duration, result in JOB_B:
+        retval.append("b", number, timestamp, duration, result)
+    return retval
+
+
+class build_history_tests(unittest.TestCase):
+    """Tests for the aggregations, using NumPy if it is installed"""
+
+    def test_result_code(self):
+        self.assertEqual(result_code("SUCCESS"), RESULT_SUCCESS)
+        self.assertEqual(result_code(None, True), RESULT_BUILDING)
+        self.assertEqual(result_code(None), RESULT_NOT_BUILT)
+
+    def test_columns(self):
+        h = make_history()
+
+        self.assertEqual(len(h), 10)
+        self.assertEqual(h.jobs, ["a", "b"])
+        self.assertEqual(list(h.column("number"))[:3], [8, 7, 6])
+        self.assertEqual(list(h.column("job")), [0] * 8 + [1] * 2)
+
+    def test_success_rate(self):
+        h = make_history()
+
+        self.assertEqual(h.success_rate(), 0.5)
+        self.assertEqual(h.success_rate("b"), 0.5)
+        self.assertIsNone(h.success_rate("missing"))
+
+    def test_bucket_counts(self):
+        h = make_history()
+
+        self.assertEqual(h.bucket_counts(2), [(0, 4, 2, 2), (2000, 2, 1, 1), (4000, 2, 1, 1), (6000, 2, 0, 0)])
+        self.assertEqual(h.windowed_success_rate(2), [(0, 0.5), (2000, 0.5), (4000, 0.5), (6000, None)])
+        self.assertEqual(BuildHistory().bucket_counts(2), [])
+
+    def test_duration_quantiles(self):
+        h = make_history()
+
+        self.assertEqual(h.duration_quantiles((0, 50, 100), "a"), {0: 100, 50: 250, 100: 500})
+        self.assertEqual(h.duration_quantiles((50,), "missing"), {50: None})
+
+    def test_flakiness(self):
+        h = make_history()
+
+        self.assertAlmostEqual(h.flakiness("a"), 0.6)
+        self.assertEqual(h.flakiness("b"), 1.0)
+        self.assertAlmostEqual(h.flakiness(), 4 / 6.0)
+        self.assertIsNone(BuildHistory().flakiness())
+
+    def test_mttr(self):
+        h = make_history()
+
+        self.assertEqual(h.mttr("a"), 2300)
+        self.assertEqual(h.mttr("b"), 2000)
+        self.assertEqual(h.mttr(), 2150)
+
+        h = BuildHistory()
+        h.append("c", 1, 0, 10, F)
+        self.assertIsNone(h.mttr())
+        self.assertIsNone(BuildHistory().mttr())
+
+    def test_add_job_paged(self):
+        job = MagicMock()
+        job.name = "a"
+        builds = [{"number": i[0], "timestamp": i[1], "duration": i[2], "building": i[3] == RESULT_BUILDING,
+                   "result": {S: "SUCCESS", F: "FAILURE", RESULT_ABORTED: "ABORTED"}.get(i[3])} for i in JOB_A]
+        job.builds_summary.side_effect = lambda count, start: builds[start:start + count]
+
+        h = BuildHistory()
+        self.assertEqual(h.add_job(job, page_size=3), 8)
+        self.assertEqual([i[0] for i in job.builds_summary.call_args_list], [(3, 0), (3, 3), (3, 6)])
+        self.assertEqual(h.mttr(), 2300)
+
+        job.builds_summary.reset_mock()
+        self.assertEqual(BuildHistory().add_job(job, max_builds=4, page_size=3), 4)
+        self.assertEqual([i[0] for i in job.builds_summary.call_args_list], [(3, 0), (1, 3)])
+
+
+class build_history_fallback_tests(build_history_tests):
+    """Repeats the tests using the pure Python implementation used when NumPy is not installed"""
+
+    def setUp(self):
+        patcher = patch.object(history, "numpy", None)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+
+class build_history_fake_jenkins_tests(unittest.TestCase):
+    def test_from_jobs(self):
+        DataRequester.clear()
+        with FakeJenkinsServer(JenkinsModel(num_jobs=2, builds_per_job=25)) as server:
+            jenkins = Jenkins(DataRequester(server.url, None, None))
+            jobs = [jenkins.find_job("job00000"), jenkins.find_job("job00001")]
+            server.reset_requests()
+
+            h = BuildHistory.from_jobs(jobs, page_size=10)
+            requests = server.requests
+
+        self.assertEqual(len(h), 50)
+        self.assertEqual(sorted(h.jobs), ["job00000", "job00001"])
+        # Three pages of builds per job
+        self.assertEqual(len([i for i in requests if "allBuilds" in i[1]]), 6)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -1,38 +1,44 @@
 import unittest
 from pyjen.jenkins import Jenkins
+from pyjen.utils.datarequester import DataRequester
 from pyjen.exceptions import InvalidParameterError
 from mock import MagicMock
 import pytest
 
 class jenkins_misc_tests(unittest.TestCase):
     """Tests for remaining utility methods of the Jenkins class not tested by other cases"""
+    def setUp(self):
+        DataRequester.clear()
+
     def test_get_version(self):
         expected_version = "1.2.3"
         
         mock_data_io = MagicMock()
-        mock_data_io.get_headers.return_value = {'x-jenkins':expected_version}
+        mock_data_io.url = "http://localhost:8080/"
+        mock_data_io.head.return_value = {'x-jenkins':expected_version}
         
         j = Jenkins(mock_data_io)
 
         self.assertEqual(expected_version, j.version)
-        self.assertEqual("call('/api/python')", str(mock_data_io.get_headers.call_args), 
-                         "get_version method should have attempted to load HTTP header info from the api/python URL")
-        self.assertEqual(mock_data_io.get_headers.call_count, 1, 
-                                "get_headers method should have been called one time")
+        self.assertEqual(expected_version, j.version)
+        self.assertEqual("call()", str(mock_data_io.head.call_args_list[0]),
+                         "get_version method should have attempted to load HTTP header info from the root URL")
+        self.assertEqual(mock_data_io.get_headers.call_count, 0,
+                         "get_version method should not download the content of any page")
+        self.assertEqual(mock_data_io.head.call_count, 3,
+                         "Server capabilities should only be probed once")
         
     def test_get_unknown_version(self):
         expected_version = "Unknown"
         
         mock_data_io = MagicMock()
-        mock_data_io.get_headers.return_value = {}
+        mock_data_io.url = "http://localhost:8080/"
+        mock_data_io.head.return_value = {}
         
         j = Jenkins(mock_data_io)
 
         self.assertEqual(expected_version, j.version)
-        self.assertEqual("call('/api/python')", str(mock_data_io.get_headers.call_args), 
-                         "get_version method should have attempted to load HTTP header info from the api/python URL")
-        self.assertEqual(mock_data_io.get_headers.call_count, 1, 
-                                "get_headers method should have been called one time")
+        self.assertFalse(j.capabilities.tree_queries)
         
     def test_prepare_shutdown(self):
         mock_data_io = MagicMock()
@@ -129,6 +135,32 @@ class jenkins_job_tests(unittest.TestCase):
 
         self.assertEqual(job.name, expected_name)
 
+    def test_jobs_summary(self):
+        mock_data_io = MagicMock()
+        mock_data_io.get_api_data.return_value = {'jobs': [
+            {'name': self.job1_name, 'url': self.job1_url, 'color': 'blue_anime', 'inQueue': True,
+             'lastBuild': {'number': 3}, 'lastCompletedBuild': {'number': 2}},
+            {'name': self.job2_name, 'url': self.job2_url, 'color': 'notbuilt',
+             'lastBuild': None, 'lastCompletedBuild': None}]}
+
+        j = Jenkins(mock_data_io)
+        summary = j.jobs_summary()
+
+        self.assertEqual(summary[0], {'name': self.job1_name, 'url': self.job1_url, 'color': 'blue_anime',
+                                      'inQueue': True, 'lastBuild': 3, 'lastCompletedBuild': 2})
+        self.assertIsNone(summary[1]['lastBuild'])
+        self.assertIn("tree=jobs[", mock_data_io.get_api_data.call_args[1]['query_params'])
+
+    def test_partial_job(self):
+        mock_data_io = MagicMock()
+
+        j = Jenkins(mock_data_io)
+        job = j.partial_job(self.job1_url, self.job1_name)
+
+        self.assertEqual(job.name, self.job1_name)
+        mock_data_io.clone.assert_called_once_with(self.job1_url)
+        self.assertEqual(mock_data_io.clone.return_value.get_text.call_count, 0)
+
 class jenkins_view_tests(unittest.TestCase):
     """Unit tests for the view-related methods of the Jenkins class"""
     
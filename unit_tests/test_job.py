@@ -1,5 +1,6 @@
 import unittest
 from pyjen.job import Job
+from pyjen.handles import BuildHandle
 from mock import MagicMock, PropertyMock
 import pytest
 from datetime import datetime
@@ -21,9 +22,26 @@ class job_misc_tests(unittest.TestCase):
         actual_name = j.name
 
         self.assertEqual(expected_name, actual_name)
-        self.assertEqual(mock_data_io.get_api_data.call_count, 1, 
+        self.assertEqual(mock_data_io.get_api_data.call_count, 1,
                                 "get_api_data method should have been called one time")
 
+    def test_equality(self):
+        mock_data_io = MagicMock()
+        mock_data_io.url = "http://localhost:8080/job/MyJob1/"
+        mock_data_io2 = MagicMock()
+        mock_data_io2.url = "http://LOCALHOST:8080/job/MyJob1"
+        mock_data_io3 = MagicMock()
+        mock_data_io3.url = "http://localhost:8080/job/MyJob2/"
+
+        j1 = vJob(mock_data_io, None)
+        j2 = vJob(mock_data_io2, None)
+        j3 = vJob(mock_data_io3, None)
+
+        self.assertEqual(j1, j2)
+        self.assertNotEqual(j1, j3)
+        self.assertEqual(len(set([j1, j2, j3])), 2)
+        self.assertEqual(mock_data_io.get_api_data.call_count, 0, "Comparing jobs should not load any data")
+
     def test_start_build(self):
         mock_data_io = MagicMock()
         
@@ -374,6 +392,56 @@ class job_build_methods_tests(unittest.TestCase):
         self.assertEqual(len(builds), 1, "Job should have returned a single build")
         self.assertEqual(builds[0].number, expected_build_number)
         
+    def test_builds_summary(self):
+        mock_data_io = MagicMock()
+        mock_data_io.get_api_data.return_value = {"allBuilds": [
+            {"_class": "hudson.model.FreeStyleBuild", "number": 2, "url": "http://localhost:8080/job/j1/2/",
+             "result": None, "timestamp": 2000, "duration": 0, "building": True, "description": None},
+            {"number": 1, "url": "http://localhost:8080/job/j1/1/", "result": "SUCCESS", "timestamp": 1000,
+             "duration": 500, "building": False, "description": "first"}]}
+
+        j = vJob(mock_data_io, None)
+        summary = j.builds_summary(2)
+
+        mock_data_io.get_api_data.assert_called_once_with(
+            query_params="tree=allBuilds[number,url,result,timestamp,duration,building,description]{0,2}")
+        self.assertEqual([i["number"] for i in summary], [2, 1])
+        self.assertNotIn("_class", summary[0])
+        self.assertTrue(summary[0]["building"])
+        self.assertEqual(summary[1]["description"], "first")
+        self.assertEqual(mock_data_io.clone.call_count, 0)
+
+    def test_builds_summary_without_tree_queries(self):
+        mock_data_io = MagicMock()
+        mock_data_io.tree_queries = False
+        mock_data_io.get_api_data.return_value = {"builds": [
+            {"number": i, "url": "http://localhost:8080/job/j1/{0}/".format(i), "result": "SUCCESS",
+             "timestamp": i * 1000, "duration": 500, "building": False, "description": None} for i in (3, 2, 1)]}
+
+        j = vJob(mock_data_io, None)
+        summary = j.builds_summary(2, 1)
+
+        mock_data_io.get_api_data.assert_called_once_with(query_params="depth=1")
+        self.assertEqual([i["number"] for i in summary], [2, 1])
+
+    def test_permalinks(self):
+        mock_data_io = MagicMock()
+        mock_data_io.get_api_data.return_value = {
+            "lastBuild": {"number": 3, "url": "http://localhost:8080/job/j1/3/"},
+            "lastSuccessfulBuild": {"number": 2, "url": "http://localhost:8080/job/j1/2/"},
+            "lastFailedBuild": None}
+
+        j = vJob(mock_data_io, None)
+        links = j.permalinks
+
+        self.assertEqual(mock_data_io.get_api_data.call_count, 1)
+        self.assertIsInstance(links["lastBuild"], BuildHandle)
+        self.assertEqual(links["lastBuild"].number, 3)
+        self.assertEqual(links["lastSuccessfulBuild"].url, "http://localhost:8080/job/j1/2/")
+        self.assertIsNone(links["lastFailedBuild"])
+        self.assertIsNone(links["lastUnstableBuild"])
+        self.assertEqual(mock_data_io.clone.call_count, 0, "No builds should have been loaded")
+
     def test_get_last_good_build_none(self):
         mock_data_io = MagicMock()
         mock_data_io.get_api_data.return_value = {"lastSuccessfulBuild": None}
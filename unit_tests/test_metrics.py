@@ -0,0 +1,111 @@
+import unittest
+import pytest
+from mock import MagicMock, patch
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.metrics import url_template, Histogram, RequestEvent, RequestMetrics, CACHE_HIT
+
+
+class url_template_tests(unittest.TestCase):
+    def test_job_and_build(self):
+        self.assertEqual(url_template("http://jenkins:8080/job/app/job/lib/12/api/python?tree=result"),
+                         "/job/{job}/job/{job}/{build}/api/python")
+
+    def test_view_job(self):
+        self.assertEqual(url_template("http://jenkins/view/all/job/app/api/python"),
+                         "/view/{view}/job/{job}/api/python")
+
+    def test_node_and_user(self):
+        self.assertEqual(url_template("http://jenkins/computer/(master)/api/python"), "/computer/{node}/api/python")
+        self.assertEqual(url_template("http://jenkins/user/bob/api/python"), "/user/{user}/api/python")
+
+    def test_root(self):
+        self.assertEqual(url_template("http://jenkins/api/python?tree=jobs[name]"), "/api/python")
+        self.assertEqual(url_template("http://jenkins"), "/")
+
+
+class histogram_tests(unittest.TestCase):
+    def test_buckets(self):
+        h = Histogram((1, 2, 3))
+        for value in (0.5, 1, 1.5, 2.5, 10):
+            h.add(value)
+
+        self.assertEqual(h.counts, [2, 1, 1, 1])
+        self.assertEqual(h.count, 5)
+        self.assertEqual(h.max, 10)
+        self.assertAlmostEqual(h.mean(), 3.1)
+
+    def test_percentile(self):
+        h = Histogram((1, 2, 3))
+        self.assertIsNone(h.percentile(50))
+        for value in (0.5, 0.6, 0.7, 2.5):
+            h.add(value)
+
+        self.assertEqual(h.percentile(50), 1)
+        self.assertEqual(h.percentile(100), 2.5)
+
+
+class request_metrics_tests(unittest.TestCase):
+    def test_aggregation(self):
+        m = RequestMetrics()
+        m(RequestEvent("GET", "http://jenkins/job/a/api/python", status=200, num_bytes=100, latency=0.2))
+        m(RequestEvent("GET", "http://jenkins/job/b/api/python", status=404, num_bytes=10, latency=0.1))
+        m(RequestEvent("GET", "http://jenkins/job/b/api/python", cache=CACHE_HIT))
+        m(RequestEvent("POST", "http://jenkins/job/a/build", status=200))
+
+        stats = m.endpoints["/job/{job}/api/python"]
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.errors, 1)
+        self.assertEqual(stats.total_bytes, 110)
+        self.assertEqual(stats.cache_hits, 1)
+        self.assertEqual(stats.cache_misses, 2)
+        self.assertEqual(stats.latency.count, 2)
+        self.assertEqual(m.request_count, 4)
+        self.assertEqual(m.network_request_count, 3)
+        self.assertEqual(m.to_dict()["/job/{job}/build"]["methods"], {"POST": 1})
+
+        m.reset()
+        self.assertEqual(m.request_count, 0)
+
+
+class observer_tests(unittest.TestCase):
+    def test_events_reported(self):
+        events = []
+        DataRequester.add_observer(events.append)
+        try:
+            with patch("pyjen.utils.datarequester.requests") as mock_requests:
+                mock_requests.get.return_value.status_code = 200
+                mock_requests.get.return_value.text = "{'name': 'job1'}"
+                mock_requests.get.return_value.content = b"{'name': 'job1'}"
+                mock_requests.post.return_value.status_code = 200
+
+                d = DataRequester("http://localhost:8080/job/job1", None, None)
+                d.get_api_data()
+                d.post("/build")
+        finally:
+            DataRequester.remove_observer(events.append)
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0].method, "GET")
+        self.assertEqual(events[0].url_template, "/job/{job}/api/python")
+        self.assertEqual(events[0].status, 200)
+        self.assertEqual(events[0].bytes, 16)
+        self.assertFalse(events[0].cache_hit)
+        self.assertEqual(events[1].method, "POST")
+
+    def test_failing_observer_ignored(self):
+        observer = MagicMock(side_effect=ValueError("boom"))
+        DataRequester.add_observer(observer)
+        try:
+            with patch("pyjen.utils.datarequester.requests") as mock_requests:
+                mock_requests.get.return_value.status_code = 200
+                mock_requests.get.return_value.text = "{}"
+
+                self.assertEqual(DataRequester("http://localhost:8080", None, None).get_api_data(), {})
+        finally:
+            DataRequester.remove_observer(observer)
+
+        self.assertEqual(observer.call_count, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
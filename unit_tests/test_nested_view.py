@@ -0,0 +1,99 @@
+import unittest
+import pytest
+from mock import MagicMock
+from pyjen.plugins.nestedview import NestedView
+from pyjen.handles import ViewHandle
+
+NESTED_CLASS = "hudson.plugins.nested_view.NestedView"
+LIST_CLASS = "hudson.model.ListView"
+
+
+class nested_view_tree_tests(unittest.TestCase):
+    def setUp(self):
+        self.view_tree = {'views': [
+            {'name': 'list1', 'url': 'http://fake/view/top/view/list1/', '_class': LIST_CLASS},
+            {'name': 'nested1', 'url': 'http://fake/view/top/view/nested1/', '_class': NESTED_CLASS,
+             'views': [
+                 {'name': 'list2', 'url': 'http://fake/view/top/view/nested1/view/list2/', '_class': LIST_CLASS},
+                 {'name': 'nested2', 'url': 'http://fake/view/top/view/nested1/view/nested2/',
+                  '_class': NESTED_CLASS, 'views': []}]}]}
+        self.mock_data_io = MagicMock()
+        self.mock_data_io.get_api_data.return_value = self.view_tree
+
+    def test_view_tree(self):
+        v = NestedView(self.mock_data_io, None)
+        views = v.view_tree()
+
+        self.assertEqual([i.name for i in views], ['list1', 'nested1'])
+        self.assertIsNone(views[0].children)
+        self.assertEqual([i.name for i in views[1].children], ['list2', 'nested2'])
+        self.assertEqual(views[1].type, NestedView.type)
+        self.assertEqual(views[0].type, "hudson.model.ListView")
+
+    def test_view_tree_query(self):
+        v = NestedView(self.mock_data_io, None)
+        v.view_tree(2)
+
+        self.mock_data_io.get_api_data.assert_called_once_with(
+            query_params="tree=views[name,url,_class,views[name,url,_class]]")
+
+    def test_view_tree_query_without_tree_queries(self):
+        self.mock_data_io.tree_queries = False
+        v = NestedView(self.mock_data_io, None)
+        v.view_tree(2)
+
+        self.mock_data_io.get_api_data.assert_called_once_with(query_params="depth=1")
+
+    def test_all_views_single_request(self):
+        v = NestedView(self.mock_data_io, None)
+        views = v.all_views
+
+        self.assertEqual([i.name for i in views], ['list2', 'nested2', 'list1', 'nested1'])
+        self.assertEqual(self.mock_data_io.get_api_data.call_count, 1)
+        self.assertEqual(self.mock_data_io.clone.call_count, 0,
+                         "No view configurations should have been loaded")
+
+    def test_all_views_beyond_max_depth(self):
+        # the deepest nested view is reported without any children
+        del self.view_tree['views'][1]['views'][1]['views']
+        sub_view_data_io = MagicMock()
+        sub_view_data_io.get_api_data.return_value = {'views': [
+            {'name': 'list3', 'url': 'http://fake/view/top/view/nested1/view/nested2/view/list3/',
+             '_class': LIST_CLASS}]}
+        self.mock_data_io.clone.return_value = sub_view_data_io
+
+        v = NestedView(self.mock_data_io, None)
+        views = v.all_views
+
+        self.assertEqual([i.name for i in views], ['list3', 'list2', 'nested2', 'list1', 'nested1'])
+        self.mock_data_io.clone.assert_called_once_with('http://fake/view/top/view/nested1/view/nested2/')
+
+
+class view_handle_tests(unittest.TestCase):
+    def test_lazy_load(self):
+        mock_view_data_io = MagicMock()
+        mock_view_data_io.config_xml = "<hudson.model.ListView/>"
+        mock_view_data_io.get_api_data.return_value = {'jobs': [{'name': 'j1'}]}
+        mock_data_io = MagicMock()
+        mock_data_io.clone.return_value = mock_view_data_io
+
+        h = ViewHandle(mock_data_io, None, "list1", "http://fake/view/list1/", LIST_CLASS)
+        self.assertEqual(h.name, "list1")
+        self.assertEqual(mock_data_io.clone.call_count, 0)
+
+        self.assertEqual(h.job_names, ['j1'])
+        self.assertEqual(h.view.type, "hudson.model.ListView")
+        mock_data_io.clone.assert_called_once_with("http://fake/view/list1/")
+
+    def test_equality(self):
+        h1 = ViewHandle(None, None, "list1", "http://fake/view/list1/")
+        h2 = ViewHandle(None, None, "list1", "http://fake/view/list1/")
+        h3 = ViewHandle(None, None, "list2", "http://fake/view/list2/")
+
+        self.assertEqual(h1, h2)
+        self.assertNotEqual(h1, h3)
+        self.assertEqual(len(set([h1, h2, h3])), 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -18,6 +18,27 @@ class node_misc_tests(unittest.TestCase):
         self.assertEqual(expected_name, actual_name)
         self.assertEqual(mock_data_io.get_api_data.call_count, 1, 
                                 "get_api_data method should have been called one time")
+    def test_preloaded_data(self):
+        mock_data_io = MagicMock()
+
+        n = Node(mock_data_io, {'displayName': "node1", 'offline': True, 'idle': False})
+
+        self.assertEqual(n.name, "node1")
+        self.assertTrue(n.is_offline)
+        self.assertFalse(n.is_idle)
+        self.assertEqual(mock_data_io.get_api_data.call_count, 0,
+                         "Pre-loaded node should not have requested data from the server")
+
+    def test_refresh_preloaded_data(self):
+        mock_data_io = MagicMock()
+        mock_data_io.get_api_data.return_value = {'idle': True}
+
+        n = Node(mock_data_io, {'idle': False})
+        n.refresh()
+
+        self.assertTrue(n.is_idle)
+        self.assertEqual(mock_data_io.get_api_data.call_count, 1)
+
     def test_is_offline(self):
         mock_data_io = MagicMock()
         mock_data_io.get_api_data.return_value = {'offline':True}
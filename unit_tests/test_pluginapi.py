@@ -1,4 +1,5 @@
 from pyjen.utils.pluginapi import *
+import xml.etree.ElementTree as ElementTree
 import unittest
 import pytest
 
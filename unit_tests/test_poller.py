@@ -0,0 +1,148 @@
+import unittest
+import pytest
+from mock import MagicMock
+from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel
+from pyjen.jenkins import Jenkins
+from pyjen.utils.datarequester import DataRequester
+from pyjen.poller import Poller, Snapshot, Event, JOB_ADDED, JOB_REMOVED, BUILD_STARTED, BUILD_FINISHED, \
+    COLOR_CHANGED, JOB_QUEUED, NODE_ADDED, NODE_REMOVED, NODE_OFFLINE, NODE_ONLINE
+
+
+def make_job(name, last_build=1, last_completed=1, color="blue", in_queue=False):
+    return {"name": name, "url": "http://localhost:8080/job/" + name + "/", "color": color, "inQueue": in_queue,
+            "lastBuild": last_build, "lastCompletedBuild": last_completed}
+
+
+def make_node(offline=False, reason=""):
+    return {"offline": offline, "reason": reason}
+
+
+class snapshot_tests(unittest.TestCase):
+    def test_no_changes(self):
+        old = Snapshot([make_job("a")], {"n1": make_node()})
+        new = Snapshot([make_job("a")], {"n1": make_node()})
+
+        self.assertEqual(old.diff(new), [])
+
+    def test_job_changes(self):
+        old = Snapshot([make_job("a"), make_job("b"), make_job("c")])
+        new = Snapshot([make_job("a", 2, 1, "blue_anime"), make_job("c", in_queue=True), make_job("d")])
+
+        events = old.diff(new)
+
+        self.assertEqual(len(events), 5)
+        self.assertIn(Event(JOB_REMOVED, "b", old="http://localhost:8080/job/b/"), events)
+        self.assertIn(Event(JOB_ADDED, "d", new="http://localhost:8080/job/d/"), events)
+        self.assertIn(Event(BUILD_STARTED, "a", 1, 2), events)
+        self.assertIn(Event(COLOR_CHANGED, "a", "blue", "blue_anime"), events)
+        self.assertIn(Event(JOB_QUEUED, "c", False, True), events)
+        self.assertEqual(events[0].kind, JOB_REMOVED)
+
+    def test_build_finished(self):
+        old = Snapshot([make_job("a", 2, 1, "blue_anime")])
+        new = Snapshot([make_job("a", 2, 2, "red")])
+
+        events = old.diff(new)
+
+        self.assertEqual(events, [Event(BUILD_FINISHED, "a", 1, 2), Event(COLOR_CHANGED, "a", "blue_anime", "red")])
+        self.assertEqual(events[0].snapshot["color"], "red")
+
+    def test_deleted_builds(self):
+        old = Snapshot([make_job("a", 3, 3), make_job("b", 1, 1), make_job("c", None, None)])
+        new = Snapshot([make_job("a", 2, 2), make_job("b", None, None), make_job("c", 1, None)])
+
+        self.assertEqual(old.diff(new), [Event(BUILD_STARTED, "c", None, 1)])
+
+    def test_event_hash(self):
+        events = set([Event(BUILD_STARTED, "a", 1, 2), Event(BUILD_STARTED, "a", 1, 2, {"color": "blue"}),
+                      Event(BUILD_FINISHED, "a", 1, 2)])
+
+        self.assertEqual(len(events), 2)
+        self.assertIn(Event(BUILD_FINISHED, "a", 1, 2), events)
+
+    def test_node_changes(self):
+        old = Snapshot([], {"n1": make_node(), "n2": make_node(True, "broken"), "n3": make_node()})
+        new = Snapshot([], {"n1": make_node(True, "maintenance"), "n2": make_node(), "n4": make_node()})
+
+        events = old.diff(new)
+
+        self.assertEqual(len(events), 4)
+        self.assertIn(Event(NODE_OFFLINE, "n1", None, "maintenance"), events)
+        self.assertIn(Event(NODE_ONLINE, "n2", "broken", None), events)
+        self.assertIn(Event(NODE_REMOVED, "n3"), events)
+        self.assertIn(Event(NODE_ADDED, "n4"), events)
+
+    def test_nodes_not_tracked(self):
+        old = Snapshot([], {"n1": make_node()})
+        new = Snapshot([])
+
+        self.assertEqual(old.diff(new), [])
+
+
+class poller_tests(unittest.TestCase):
+    def setUp(self):
+        self.jenkins = MagicMock()
+        self.jenkins.jobs_summary.return_value = [make_job("a")]
+
+    def test_first_poll_has_no_events(self):
+        poller = Poller(self.jenkins, include_nodes=False)
+        callback = MagicMock()
+        poller.subscribe(callback)
+
+        self.assertEqual(poller.poll(), [])
+        callback.assert_not_called()
+        self.assertIn("a", poller.snapshot.jobs)
+
+    def test_subscribers(self):
+        poller = Poller(self.jenkins, include_nodes=False)
+        all_events = MagicMock()
+        finished_only = MagicMock()
+        failing = MagicMock(side_effect=Exception("Subscriber failed"))
+        poller.subscribe(failing)
+        poller.subscribe(all_events)
+        poller.subscribe(finished_only, [BUILD_FINISHED])
+        poller.poll()
+
+        self.jenkins.jobs_summary.return_value = [make_job("a", 2, 1)]
+        events = poller.poll()
+
+        self.assertEqual(events, [Event(BUILD_STARTED, "a", 1, 2)])
+        all_events.assert_called_once_with(events[0])
+        finished_only.assert_not_called()
+
+        poller.unsubscribe(all_events)
+        self.jenkins.jobs_summary.return_value = [make_job("a", 2, 2)]
+        poller.poll()
+        self.assertEqual(all_events.call_count, 1)
+        finished_only.assert_called_once_with(Event(BUILD_FINISHED, "a", 1, 2))
+
+
+class poller_fake_jenkins_tests(unittest.TestCase):
+    def test_poll(self):
+        DataRequester.clear()
+        model = JenkinsModel(num_jobs=3, builds_per_job=2, num_nodes=2)
+        for name in model.job_order:
+            for cur_build in model.jobs[name]["builds"]:
+                cur_build["building"] = False
+                cur_build["result"] = "SUCCESS"
+            model._update_job(model.jobs[name])
+        with FakeJenkinsServer(model) as server:
+            poller = Poller(Jenkins(DataRequester(server.url, None, None)))
+            self.assertEqual(poller.poll(), [])
+
+            model.start_build("job00001")
+            model.delete_job("job00002")
+            model.toggle_offline("agent0", "maintenance")
+            server.reset_requests()
+            events = poller.poll()
+
+            # One request for the jobs and one for the nodes
+            self.assertEqual(len(server.requests), 2)
+            self.assertIn(Event(BUILD_STARTED, "job00001", 2, 3), events)
+            self.assertIn(Event(BUILD_FINISHED, "job00001", 2, 3), events)
+            self.assertIn(Event(JOB_REMOVED, "job00002", old=model.url + "job/job00002/"), events)
+            self.assertIn(Event(NODE_OFFLINE, "agent0", None, "maintenance"), events)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
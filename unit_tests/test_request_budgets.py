@@ -0,0 +1,173 @@
+"""Regression tests asserting the number of HTTP requests issued by key PyJen operations
+
+Each test runs an operation against a simulated Jenkins master and fails if the operation
+issues more requests than its budget allows, which guards against changes that introduce
+one request per item in a collection.
+"""
+import unittest
+import pytest
+from mock import MagicMock, patch
+from pyjen.jenkins import Jenkins
+from pyjen.job import Job
+from pyjen.plugins.listview import ListView
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.metrics import RequestBudget
+from pyjen.exceptions import RequestBudgetExceeded
+
+ROOT_URL = "http://localhost:8080/"
+NUM_ITEMS = 10
+
+
+def fake_jenkins_responses():
+    """Generates the responses of a Jenkins master with several jobs, builds and nodes
+
+    :returns: mapping of URLs to response text
+    :rtype: :class:`dict`
+    """
+    responses = {}
+    jobs = []
+    for i in range(NUM_ITEMS):
+        job_url = ROOT_URL + "job/job{0}/".format(i)
+        jobs.append({"name": "job{0}".format(i), "url": job_url})
+        responses[job_url + "config.xml"] = "<project/>"
+    responses[ROOT_URL + "view/all/api/python"] = repr({"name": "all", "jobs": jobs})
+
+    builds = [{"number": i, "url": ROOT_URL + "job/job0/{0}/".format(i)} for i in range(NUM_ITEMS)]
+    responses[ROOT_URL + "job/job0/api/python"] = repr({"name": "job0", "builds": builds, "allBuilds": builds,
+                                                        "lastBuild": builds[0], "lastSuccessfulBuild": builds[1]})
+
+    computers = [{"displayName": "agent{0}".format(i), "offline": False, "idle": True,
+                  "assignedLabels": [], "executors": [{"idle": True}]} for i in range(NUM_ITEMS)]
+    fleet = {"busyExecutors": 0, "totalExecutors": NUM_ITEMS, "computer": computers}
+    responses[ROOT_URL + "computer/api/python"] = repr(fleet)
+    return responses
+
+
+class request_budget_regression_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        responses = fake_jenkins_responses()
+
+        def fake_get(url, **kwargs):
+            url = url.split("?", 1)[0]
+            retval = MagicMock()
+            retval.status_code = 200
+            retval.text = responses[url]
+            retval.content = responses[url].encode("utf-8")
+            return retval
+
+        patcher = patch("pyjen.utils.datarequester.requests")
+        self.addCleanup(patcher.stop)
+        mock_requests = patcher.start()
+        mock_requests.get.side_effect = fake_get
+
+        self.jenkins = Jenkins(DataRequester(ROOT_URL, None, None))
+
+    def test_jenkins_nodes(self):
+        with RequestBudget(max_requests=1, endpoint_limits={"/computer/api/python": 1}):
+            nodes = self.jenkins.nodes
+            names = [i.name for i in nodes]
+            offline = [i.is_offline for i in nodes]
+
+        self.assertEqual(len(names), NUM_ITEMS)
+        self.assertEqual(offline, [False] * NUM_ITEMS)
+
+    def test_job_recent_builds(self):
+        job = Job._create(DataRequester(ROOT_URL + "job/job0", None, None), self.jenkins, "job0")
+        with RequestBudget(max_requests=1):
+            builds = job.recent_builds
+
+        self.assertEqual(len(builds), NUM_ITEMS)
+
+    def test_job_builds_summary(self):
+        job = Job._create(DataRequester(ROOT_URL + "job/job0", None, None), self.jenkins, "job0")
+        with RequestBudget(max_requests=1):
+            summary = job.builds_summary(NUM_ITEMS)
+            numbers = [i["number"] for i in summary]
+
+        self.assertEqual(numbers, list(range(NUM_ITEMS)))
+
+    def test_job_permalinks(self):
+        job = Job._create(DataRequester(ROOT_URL + "job/job0", None, None), self.jenkins, "job0")
+        with RequestBudget(max_requests=1):
+            links = job.permalinks
+
+        self.assertIsNotNone(links["lastBuild"])
+        self.assertIsNone(links["lastFailedBuild"])
+
+    def test_view_jobs(self):
+        view = ListView(DataRequester(ROOT_URL + "view/all", None, None), self.jenkins)
+        # Jobs are returned as handles, so only the job list is loaded
+        with RequestBudget(max_requests=1, endpoint_limits={"/view/{view}/api/python": 1}):
+            jobs = view.jobs
+            names = [i.name for i in jobs]
+
+        self.assertEqual(len(names), NUM_ITEMS)
+
+
+class request_budget_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        patcher = patch("pyjen.utils.datarequester.requests")
+        self.addCleanup(patcher.stop)
+        self.mock_requests = patcher.start()
+        self.mock_requests.get.return_value.status_code = 200
+        self.mock_requests.get.return_value.text = "{}"
+
+    def test_within_budget(self):
+        with RequestBudget(max_requests=2) as budget:
+            DataRequester(ROOT_URL, None, None).get_api_data()
+            DataRequester(ROOT_URL + "job/a", None, None).get_api_data()
+
+        self.assertEqual(budget.request_count, 2)
+        self.assertEqual(budget.by_endpoint, {"/api/python": 1, "/job/{job}/api/python": 1})
+
+    def test_total_exceeded(self):
+        def run():
+            with RequestBudget(max_requests=1):
+                for i in range(3):
+                    DataRequester(ROOT_URL + "job/j" + str(i), None, None).get_api_data()
+
+        with self.assertRaises(RequestBudgetExceeded) as ctx:
+            run()
+        self.assertEqual(ctx.exception.request_count, 2)
+        self.assertEqual(ctx.exception.limit, 1)
+        self.assertIsNone(ctx.exception.endpoint)
+        self.assertIn("/job/{job}/api/python: 2", str(ctx.exception))
+        self.assertEqual(self.mock_requests.get.call_count, 2,
+                         "No requests should be sent once the budget has been exceeded")
+
+    def test_endpoint_exceeded(self):
+        def run():
+            with RequestBudget(endpoint_limits={"/job/{job}/api/python": 1}):
+                DataRequester(ROOT_URL, None, None).get_api_data()
+                DataRequester(ROOT_URL + "job/a", None, None).get_api_data()
+                DataRequester(ROOT_URL + "job/b", None, None).get_api_data()
+
+        with self.assertRaises(RequestBudgetExceeded) as ctx:
+            run()
+        self.assertEqual(ctx.exception.endpoint, "/job/{job}/api/python")
+        self.assertEqual(ctx.exception.request_count, 2)
+        self.assertEqual(self.mock_requests.get.call_count, 3)
+
+    def test_exceeded_while_caught(self):
+        with self.assertRaises(RequestBudgetExceeded):
+            with RequestBudget(max_requests=1) as budget:
+                DataRequester(ROOT_URL, None, None).get_api_data()
+                try:
+                    DataRequester(ROOT_URL + "job/a", None, None).get_api_data()
+                except RequestBudgetExceeded:
+                    pass
+
+        self.assertEqual(budget.request_count, 2)
+
+    def test_observer_removed(self):
+        with RequestBudget() as budget:
+            pass
+        DataRequester(ROOT_URL, None, None).get_api_data()
+
+        self.assertEqual(budget.request_count, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,170 @@
+import unittest
+import pytest
+import requests
+from mock import MagicMock, patch
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.retry import RetryPolicy, CircuitBreaker, CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN
+from pyjen.exceptions import CircuitOpenError
+
+URL = "http://localhost:8080/job/job1/"
+
+
+def make_response(status_code, text="{}", headers=None):
+    retval = MagicMock()
+    retval.status_code = status_code
+    retval.text = text
+    retval.content = text.encode("utf-8")
+    retval.headers = headers or {}
+    return retval
+
+
+class retry_policy_tests(unittest.TestCase):
+    def test_idempotency(self):
+        p = RetryPolicy()
+
+        self.assertTrue(p.is_idempotent("GET", URL + "api/python"))
+        self.assertTrue(p.is_idempotent("POST", URL + "config.xml"))
+        self.assertTrue(p.is_idempotent("POST", URL + "disable"))
+        self.assertFalse(p.is_idempotent("POST", URL + "build"))
+        self.assertFalse(p.is_idempotent("POST", "http://localhost:8080/computer/a/toggleOffline?offlineMessage=x"))
+
+    def test_backoff(self):
+        p = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+        self.assertEqual([p.backoff(i) for i in range(5)], [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        p = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for i in range(20):
+            self.assertTrue(0 <= p.backoff(3) <= 5)
+
+    def test_next_delay(self):
+        p = RetryPolicy(max_retries=2, backoff_factor=1, jitter=False, max_elapsed=10)
+
+        self.assertEqual(p.next_delay(0, "GET", URL, 0, response=make_response(503)), 1)
+        self.assertIsNone(p.next_delay(0, "GET", URL, 0, response=make_response(404)))
+        self.assertIsNone(p.next_delay(2, "GET", URL, 0, response=make_response(503)))
+        self.assertIsNone(p.next_delay(0, "POST", URL + "build", 0, response=make_response(503)))
+        self.assertIsNone(p.next_delay(1, "GET", URL, 9, response=make_response(503)))
+        self.assertEqual(p.next_delay(0, "GET", URL, 0, response=make_response(503, headers={"Retry-After": "3"})), 3)
+
+    def test_next_delay_errors(self):
+        p = RetryPolicy(backoff_factor=1, jitter=False)
+
+        self.assertEqual(p.next_delay(0, "GET", URL, 0, error=requests.exceptions.ConnectionError()), 1)
+        self.assertIsNone(p.next_delay(0, "POST", URL + "build", 0, error=requests.exceptions.ReadTimeout()))
+        self.assertEqual(p.next_delay(0, "POST", URL + "build", 0, error=requests.exceptions.ConnectTimeout()), 1)
+        self.assertIsNone(p.next_delay(0, "GET", URL, 0, error=requests.exceptions.InvalidURL()))
+
+
+class circuit_breaker_tests(unittest.TestCase):
+    def test_open_after_failures(self):
+        b = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        b.record_failure("a")
+        self.assertTrue(b.allow("a"))
+        b.record_failure("a")
+
+        self.assertEqual(b.state("a"), CIRCUIT_OPEN)
+        self.assertFalse(b.allow("a"))
+        self.assertTrue(b.allow("b"))
+
+    def test_half_open_trial(self):
+        b = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        b.record_failure("a")
+
+        self.assertEqual(b.state("a"), CIRCUIT_HALF_OPEN)
+        self.assertTrue(b.allow("a"))
+        # only one trial request at a time
+        self.assertFalse(b.allow("a"))
+        b.record_success("a")
+        self.assertEqual(b.state("a"), CIRCUIT_CLOSED)
+
+    def test_is_failure(self):
+        self.assertTrue(CircuitBreaker.is_failure(response=make_response(502)))
+        self.assertFalse(CircuitBreaker.is_failure(response=make_response(404)))
+        self.assertTrue(CircuitBreaker.is_failure(error=requests.exceptions.ConnectionError()))
+
+
+class data_requester_retry_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        self.policy = RetryPolicy(max_retries=3, jitter=False)
+        self.policy.sleep = MagicMock()
+        DataRequester.set_retry_policy(self.policy)
+        patcher = patch("pyjen.utils.datarequester.requests")
+        self.addCleanup(patcher.stop)
+        self.mock_requests = patcher.start()
+
+    def tearDown(self):
+        DataRequester.set_retry_policy(None)
+        DataRequester.set_circuit_breaker(None)
+
+    def test_transient_failure_retried(self):
+        self.mock_requests.get.side_effect = [make_response(503), make_response(502), make_response(200, "{'a': 1}")]
+        events = []
+        DataRequester.add_observer(events.append)
+        try:
+            self.assertEqual(DataRequester(URL, None, None).get_api_data(), {'a': 1})
+        finally:
+            DataRequester.remove_observer(events.append)
+
+        self.assertEqual(self.mock_requests.get.call_count, 3)
+        self.assertEqual(self.policy.sleep.call_count, 2)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].retries, 2)
+
+    def test_discarded_responses_closed(self):
+        responses = [make_response(503), make_response(200, "data")]
+        self.mock_requests.get.side_effect = responses
+
+        stream = DataRequester(URL, None, None).stream_text()
+        self.assertEqual(responses[0].close.call_count, 1)
+        self.assertEqual(responses[1].close.call_count, 0)
+        stream.close()
+
+    def test_connection_error_retried(self):
+        self.mock_requests.get.side_effect = [requests.exceptions.ConnectionError(), make_response(200, "{}")]
+
+        self.assertEqual(DataRequester(URL, None, None).get_api_data(), {})
+        self.assertEqual(self.mock_requests.get.call_count, 2)
+
+    def test_non_idempotent_post_not_retried(self):
+        self.mock_requests.post.return_value = make_response(503)
+        self.mock_requests.post.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError()
+
+        self.assertRaises(requests.exceptions.HTTPError, DataRequester(URL, None, None).post, "/build")
+        self.assertEqual(self.mock_requests.post.call_count, 1)
+
+    def test_idempotent_post_retried(self):
+        self.mock_requests.post.side_effect = [make_response(503), make_response(200)]
+
+        DataRequester(URL, None, None).post("/disable")
+        self.assertEqual(self.mock_requests.post.call_count, 2)
+
+    def test_circuit_breaker(self):
+        DataRequester.set_retry_policy(None)
+        DataRequester.set_circuit_breaker(CircuitBreaker(failure_threshold=1, reset_timeout=60))
+        self.mock_requests.get.side_effect = requests.exceptions.ConnectionError()
+        d = DataRequester(URL, None, None)
+
+        self.assertRaises(requests.exceptions.ConnectionError, d.get_api_data)
+        self.assertRaises(CircuitOpenError, d.get_text, "/config.xml")
+        self.assertEqual(self.mock_requests.get.call_count, 1)
+
+    def test_unexpected_error_ends_trial(self):
+        DataRequester.set_retry_policy(None)
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        DataRequester.set_circuit_breaker(breaker)
+        self.mock_requests.get.side_effect = [requests.exceptions.ConnectionError(), ValueError("boom"),
+                                              make_response(200, "{}")]
+        d = DataRequester(URL, None, None)
+
+        self.assertRaises(requests.exceptions.ConnectionError, d.get_api_data)
+        self.assertRaises(ValueError, d.get_api_data)
+        self.assertEqual(d.get_api_data(), {})
+        self.assertEqual(breaker.state("localhost:8080"), CIRCUIT_CLOSED)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,22 @@
+import unittest
+import pytest
+from pyjen.utils.stats import percentile
+
+
+class percentile_tests(unittest.TestCase):
+    def test_interpolation(self):
+        values = [10, 20, 30, 40]
+
+        self.assertEqual(percentile(values, 0), 10)
+        self.assertEqual(percentile(values, 50), 25)
+        self.assertEqual(percentile(values, 100), 40)
+
+    def test_single_value(self):
+        self.assertEqual(percentile([7], 90), 7)
+
+    def test_no_values(self):
+        self.assertIsNone(percentile([], 50))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
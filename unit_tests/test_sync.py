@@ -0,0 +1,164 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pytest
+from mock import MagicMock
+from benchmarks.fake_jenkins import FakeJenkinsServer, JenkinsModel
+from pyjen.jenkins import Jenkins
+from pyjen.utils.datarequester import DataRequester
+from pyjen.sync import BuildSync, SyncState
+
+
+def make_build(number, building=False):
+    return {"number": number, "building": building, "result": None if building else "SUCCESS"}
+
+
+def make_job(name, builds):
+    """Creates a mock job whose builds_summary method pages through a list of builds, most recent first"""
+    job = MagicMock()
+    job.name = name
+    job.builds_summary.side_effect = lambda count, start: builds[start:start + count]
+    return job
+
+
+class sync_state_tests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def test_persistence(self):
+        path = os.path.join(self.folder, "sync.db")
+        state = SyncState(path)
+        self.assertEqual(state.load("a"), (None, set()))
+        state.save("a", 10, set([9, 10]))
+        state.save("b", 0, set())
+        state.close()
+
+        state = SyncState(path)
+        self.assertEqual(state.load("a"), (10, set([9, 10])))
+        self.assertEqual(state.job_names, set(["a", "b"]))
+
+        state.forget("a")
+        self.assertEqual(state.load("a"), (None, set()))
+        self.assertEqual(state.job_names, set(["b"]))
+        state.close()
+
+
+class build_sync_tests(unittest.TestCase):
+    def test_first_sync_pages_all_builds(self):
+        builds = [make_build(i) for i in range(7, 0, -1)]
+        job = make_job("a", builds)
+        sync = BuildSync(MagicMock(), page_size=3)
+
+        result = sync.sync_job(job)
+
+        self.assertEqual([i["number"] for i in result], list(range(1, 8)))
+        self.assertEqual([i[0] for i in job.builds_summary.call_args_list], [(3, 0), (3, 3), (3, 6)])
+        self.assertEqual(sync.state.load("a"), (7, set()))
+
+    def test_initial_builds_limit(self):
+        job = make_job("a", [make_build(i) for i in range(7, 0, -1)])
+        sync = BuildSync(MagicMock(), page_size=3, initial_builds=4)
+
+        result = sync.sync_job(job)
+
+        self.assertEqual([i["number"] for i in result], [4, 5, 6, 7])
+        self.assertEqual([i[0] for i in job.builds_summary.call_args_list], [(3, 0), (1, 3)])
+
+    def test_only_new_builds_loaded(self):
+        builds = [make_build(i) for i in range(5, 0, -1)]
+        sync = BuildSync(MagicMock())
+        sync.sync_job(make_job("a", builds))
+
+        builds.insert(0, make_build(6))
+        builds.insert(0, make_build(7))
+        job = make_job("a", builds)
+        result = sync.sync_job(job, last_build=7)
+
+        self.assertEqual([i["number"] for i in result], [6, 7])
+        # The range covers the new builds and the previous high-water mark only
+        job.builds_summary.assert_called_once_with(3, 0)
+
+    def test_running_builds_reported_when_finished(self):
+        builds = [make_build(3, True), make_build(2, True), make_build(1)]
+        sync = BuildSync(MagicMock())
+
+        result = sync.sync_job(make_job("a", builds))
+        self.assertEqual([i["number"] for i in result], [1, 2, 3])
+        self.assertEqual(sync.state.load("a"), (3, set([2, 3])))
+
+        builds = [make_build(4, True), make_build(3, True), make_build(2), make_build(1)]
+        job = make_job("a", builds)
+        result = sync.sync_job(job, last_build=4)
+        self.assertEqual([(i["number"], i["building"]) for i in result], [(2, False), (4, True)])
+        self.assertEqual(sync.state.load("a"), (4, set([3, 4])))
+        job.builds_summary.assert_called_once_with(3, 0)
+
+    def test_deleted_pending_build_dropped(self):
+        sync = BuildSync(MagicMock())
+        sync.sync_job(make_job("a", [make_build(3), make_build(2, True), make_build(1)]))
+
+        result = sync.sync_job(make_job("a", [make_build(3), make_build(1)]), last_build=3)
+
+        self.assertEqual(result, [])
+        self.assertEqual(sync.state.load("a"), (3, set()))
+
+    def test_job_without_builds(self):
+        sync = BuildSync(MagicMock())
+
+        self.assertEqual(sync.sync_job(make_job("a", [])), [])
+        self.assertEqual(sync.state.load("a"), (0, set()))
+
+    def test_sync_skips_unchanged_jobs(self):
+        jobs = {"a": make_job("a", [make_build(2), make_build(1)]), "b": make_job("b", [make_build(1)])}
+        jenkins = MagicMock()
+        jenkins.partial_job.side_effect = lambda url, name: jobs[name]
+        jenkins.jobs_summary.return_value = [
+            {"name": "a", "url": "a_url", "lastBuild": 2},
+            {"name": "b", "url": "b_url", "lastBuild": 1}]
+        sync = BuildSync(jenkins)
+
+        result = sync.sync()
+        self.assertEqual(sorted(result), ["a", "b"])
+
+        jenkins.partial_job.reset_mock()
+        jenkins.jobs_summary.return_value = [{"name": "b", "url": "b_url", "lastBuild": 1}]
+        self.assertEqual(sync.sync(), {})
+        jenkins.partial_job.assert_not_called()
+        # Records of deleted jobs are discarded
+        self.assertEqual(sync.state.job_names, set(["b"]))
+
+
+class build_sync_fake_jenkins_tests(unittest.TestCase):
+    def test_sync(self):
+        DataRequester.clear()
+        model = JenkinsModel(num_jobs=5, builds_per_job=3)
+        for name in model.job_order:
+            for cur_build in model.jobs[name]["builds"]:
+                cur_build["building"] = False
+                cur_build["result"] = "SUCCESS"
+            model._update_job(model.jobs[name])
+
+        with FakeJenkinsServer(model) as server:
+            sync = BuildSync(Jenkins(DataRequester(server.url, None, None)))
+            result = sync.sync()
+            self.assertEqual(len(result), 5)
+            self.assertEqual([i["number"] for i in result["job00000"]], [1, 2, 3])
+
+            # Nothing has changed, so only the list of jobs is loaded
+            server.reset_requests()
+            self.assertEqual(sync.sync(), {})
+            self.assertEqual(len(server.requests), 1)
+
+            # Only the job with a new build is queried
+            model.start_build("job00002")
+            server.reset_requests()
+            result = sync.sync()
+            self.assertEqual(list(result), ["job00002"])
+            self.assertEqual([i["number"] for i in result["job00002"]], [4])
+            self.assertEqual(len(server.requests), 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,185 @@
+import unittest
+import pytest
+import threading
+import time
+from mock import MagicMock, patch
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.throttle import TokenBucket, Throttle, request_kind, READ_REQUESTS, WRITE_REQUESTS
+
+URL = "http://localhost:8080/job/job1/"
+
+
+class fake_clock(object):
+    """Replaces the time module used by the throttle, advancing time when sleeping"""
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class token_bucket_tests(unittest.TestCase):
+    def setUp(self):
+        self.clock = fake_clock()
+        patcher = patch("pyjen.utils.throttle.time", self.clock)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def test_burst_not_delayed(self):
+        bucket = TokenBucket(rate=2, burst=3)
+
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_rate_limited(self):
+        bucket = TokenBucket(rate=2, burst=1)
+        bucket.acquire()
+
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+    def test_refill(self):
+        bucket = TokenBucket(rate=1, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.clock.now += 10
+
+        # The bucket never holds more than the burst size
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+
+    def test_default_burst(self):
+        self.assertEqual(TokenBucket(rate=5).burst, 5)
+        self.assertEqual(TokenBucket(rate=0.1).burst, 1)
+
+    def test_invalid_parameters(self):
+        self.assertRaises(ValueError, TokenBucket, 0)
+        self.assertRaises(ValueError, TokenBucket, 1, 0)
+
+
+class throttle_tests(unittest.TestCase):
+    def test_request_kind(self):
+        self.assertEqual(request_kind("GET"), READ_REQUESTS)
+        self.assertEqual(request_kind("head"), READ_REQUESTS)
+        self.assertEqual(request_kind("POST"), WRITE_REQUESTS)
+
+    def test_unlimited(self):
+        throttle = Throttle()
+        for _ in range(10):
+            self.assertEqual(throttle.acquire("GET"), 0.0)
+            throttle.release("GET")
+
+        self.assertEqual(throttle.throttled_count, 0)
+        self.assertEqual(throttle.stats()[READ_REQUESTS]["requests"], 10)
+        self.assertEqual(throttle.stats()[READ_REQUESTS]["in_flight"], 0)
+
+    def test_separate_limits(self):
+        clock = fake_clock()
+        with patch("pyjen.utils.throttle.time", clock):
+            throttle = Throttle(get_rate=10, get_burst=10, post_rate=1, post_burst=1)
+            throttle.acquire("POST")
+            throttle.release("POST")
+            throttle.acquire("GET")
+            throttle.release("GET")
+            throttle.acquire("POST")
+            throttle.release("POST")
+
+        stats = throttle.stats()
+        self.assertEqual(stats[READ_REQUESTS]["throttled"], 0)
+        self.assertEqual(stats[WRITE_REQUESTS]["requests"], 2)
+        self.assertEqual(stats[WRITE_REQUESTS]["throttled"], 1)
+        self.assertAlmostEqual(stats[WRITE_REQUESTS]["throttled_time"], 1.0)
+        self.assertEqual(throttle.throttled_count, 1)
+        self.assertAlmostEqual(throttle.throttled_time, 1.0)
+
+    def test_max_in_flight(self):
+        throttle = Throttle(max_in_flight_gets=1)
+        throttle.acquire("GET")
+        acquired = threading.Event()
+
+        def worker():
+            throttle.acquire("GET")
+            acquired.set()
+            throttle.release("GET")
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        # Mutating requests are limited independently
+        throttle.acquire("POST")
+        throttle.release("POST")
+
+        throttle.release("GET")
+        thread.join(5)
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(throttle.stats()[READ_REQUESTS]["throttled"], 1)
+        self.assertGreater(throttle.stats()[READ_REQUESTS]["throttled_time"], 0)
+        self.assertEqual(throttle.stats()[WRITE_REQUESTS]["throttled"], 0)
+
+    def test_reset_stats(self):
+        throttle = Throttle(max_in_flight_gets=2)
+        throttle.acquire("GET")
+        throttle.reset_stats()
+
+        self.assertEqual(throttle.stats()[READ_REQUESTS]["requests"], 0)
+        self.assertEqual(throttle.stats()[READ_REQUESTS]["in_flight"], 1)
+
+
+class data_requester_throttle_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        patcher = patch("pyjen.utils.datarequester.requests")
+        self.addCleanup(patcher.stop)
+        self.mock_requests = patcher.start()
+        self.mock_requests.get.return_value.status_code = 200
+        self.mock_requests.get.return_value.text = "{}"
+        self.mock_requests.post.return_value.status_code = 200
+
+    def tearDown(self):
+        DataRequester.set_throttle(URL, None)
+
+    def test_set_throttle_per_host(self):
+        throttle = Throttle()
+        DataRequester.set_throttle("http://localhost:8080", throttle)
+
+        self.assertIs(DataRequester.get_throttle(URL), throttle)
+        self.assertIsNone(DataRequester.get_throttle("http://otherhost:8080/"))
+
+    def test_requests_throttled(self):
+        throttle = MagicMock()
+        DataRequester.set_throttle(URL, throttle)
+
+        DataRequester(URL, None, None).get_api_data()
+        DataRequester(URL, None, None).post("/build")
+
+        self.assertEqual(throttle.acquire.call_args_list, [(("GET",),), (("POST",),)])
+        self.assertEqual(throttle.release.call_args_list, [(("GET",),), (("POST",),)])
+
+    def test_released_on_error(self):
+        throttle = Throttle(max_in_flight_gets=1)
+        DataRequester.set_throttle(URL, throttle)
+        self.mock_requests.get.side_effect = RuntimeError()
+
+        self.assertRaises(RuntimeError, DataRequester(URL, None, None).get_api_data)
+        self.assertEqual(throttle.stats()[READ_REQUESTS]["in_flight"], 0)
+
+    def test_other_hosts_not_throttled(self):
+        throttle = MagicMock()
+        DataRequester.set_throttle("http://otherhost:8080", throttle)
+        try:
+            DataRequester(URL, None, None).get_api_data()
+        finally:
+            DataRequester.set_throttle("http://otherhost:8080", None)
+
+        self.assertEqual(throttle.acquire.call_count, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
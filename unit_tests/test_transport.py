@@ -0,0 +1,110 @@
+import unittest
+import os
+import shutil
+import tempfile
+import pytest
+from mock import MagicMock
+from requests.exceptions import HTTPError
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.transport import Cassette, RecordingTransport, ReplayTransport, Response, request_key
+from pyjen.exceptions import InteractionNotRecordedError
+
+URL = "http://localhost:8080/job/job1/"
+
+
+def make_response(text, status_code=200):
+    retval = MagicMock()
+    retval.status_code = status_code
+    retval.headers = {"X-Jenkins": "2.60"}
+    retval.text = text
+    retval.content = text.encode("utf-8")
+    return retval
+
+
+class transport_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+        self.temp_folder = tempfile.mkdtemp()
+        self.cassette_file = os.path.join(self.temp_folder, "test.cassette")
+
+    def tearDown(self):
+        DataRequester.set_transport(None)
+        shutil.rmtree(self.temp_folder)
+
+    def test_request_key(self):
+        self.assertEqual(request_key("get", URL), "GET " + URL)
+        self.assertEqual(request_key("POST", URL, {"b": 1, "a": 2}), 'POST ' + URL + ' {"a": 2, "b": 1}')
+        self.assertNotEqual(request_key("POST", URL, data="<a/>"), request_key("POST", URL, data="<b/>"))
+        self.assertEqual(request_key("POST", URL, data={"x": 1, "y": 2}), request_key("POST", URL, data={"y": 2, "x": 1}))
+
+    def test_response_iter_content(self):
+        response = Response(URL, 200, {}, b"abcdefg")
+
+        self.assertEqual(list(response.iter_content(3)), [b"abc", b"def", b"g"])
+        self.assertEqual(response.text, "abcdefg")
+
+    def test_playback_order(self):
+        cassette = Cassette(self.cassette_file)
+        cassette.record("GET a", make_response("first"))
+        cassette.record("GET a", make_response("second"))
+
+        self.assertEqual(cassette.play("GET a", "a").text, "first")
+        self.assertEqual(cassette.play("GET a", "a").text, "second")
+        # the last response is repeated once the others have been used
+        self.assertEqual(cassette.play("GET a", "a").text, "second")
+        self.assertIsNone(cassette.play("GET b", "b"))
+
+        cassette.rewind()
+        self.assertEqual(cassette.play("GET a", "a").text, "first")
+
+    def test_persistence(self):
+        cassette = Cassette(self.cassette_file)
+        cassette.record("GET a", make_response("data", 404))
+        cassette.set_metadata("host", "jenkins")
+        cassette.close()
+
+        cassette = Cassette(self.cassette_file)
+        response = cassette.play("GET a", "a")
+        self.assertEqual(len(cassette), 1)
+        self.assertEqual(cassette.get_metadata("host"), "jenkins")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.headers["x-jenkins"], "2.60")
+        self.assertRaises(HTTPError, response.raise_for_status)
+
+    def test_record_then_replay(self):
+        inner = MagicMock()
+        inner.send.return_value = make_response("{'name': 'job1'}")
+        cassette = Cassette(self.cassette_file)
+
+        DataRequester.set_transport(RecordingTransport(cassette, inner))
+        recorded = DataRequester(URL, None, None).get_api_data()
+        inner.send.assert_called_once_with("GET", URL + "api/python", auth=None)
+
+        DataRequester.set_transport(ReplayTransport(cassette))
+        replayed = DataRequester(URL, None, None).get_api_data()
+
+        self.assertEqual(recorded, {'name': 'job1'})
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(inner.send.call_count, 1)
+
+    def test_replay_missing(self):
+        DataRequester.set_transport(ReplayTransport(Cassette(self.cassette_file)))
+
+        self.assertRaises(InteractionNotRecordedError, DataRequester(URL, None, None).get_api_data)
+
+    def test_clone_preserves_settings(self):
+        d = DataRequester(URL, "user", "pass")
+        c = d.clone("http://localhost:8080/job/job2")
+
+        self.assertEqual(c.url, "http://localhost:8080/job/job2/")
+        self.assertEqual(c.credentials, ("user", "pass"))
+        self.assertEqual(d.url, URL)
+
+    def test_response(self):
+        r = Response("a", 200, {}, b"text")
+        r.raise_for_status()
+        self.assertEqual(r.text, "text")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
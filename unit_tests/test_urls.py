@@ -0,0 +1,106 @@
+import unittest
+import pytest
+from mock import MagicMock
+from pyjen.utils.urls import canonical_url, canonical_host, join_url, identity_url
+from pyjen.utils.datarequester import DataRequester
+from pyjen.utils.capabilities import Capabilities
+
+
+class canonical_url_tests(unittest.TestCase):
+    def test_trailing_slash(self):
+        self.assertEqual(canonical_url("http://localhost:8080"), "http://localhost:8080/")
+        self.assertEqual(canonical_url("http://localhost:8080/job/j1"), "http://localhost:8080/job/j1/")
+        self.assertEqual(canonical_url("http://localhost:8080/job/j1//"), "http://localhost:8080/job/j1/")
+
+    def test_host_and_port(self):
+        self.assertEqual(canonical_url("HTTP://LocalHost:80/job/J1/"), "http://localhost/job/J1/")
+        self.assertEqual(canonical_url("https://jenkins:443/"), "https://jenkins/")
+        self.assertEqual(canonical_url("https://jenkins:8443/"), "https://jenkins:8443/")
+        self.assertEqual(canonical_url("http://[::1]:80/"), "http://[::1]/")
+
+    def test_view_relative_jobs(self):
+        self.assertEqual(canonical_url("http://jenkins/view/all/job/j1/"), "http://jenkins/job/j1/")
+        self.assertEqual(canonical_url("http://jenkins/view/a/view/b/job/j1/3/"), "http://jenkins/job/j1/3/")
+        self.assertEqual(canonical_url("http://jenkins/job/folder/view/v/job/j1"), "http://jenkins/job/folder/job/j1/")
+        # Views themselves are left untouched
+        self.assertEqual(canonical_url("http://jenkins/view/a/view/b/"), "http://jenkins/view/a/view/b/")
+        self.assertEqual(canonical_url("http://jenkins/view/job/"), "http://jenkins/view/job/")
+
+    def test_percent_encoding(self):
+        self.assertEqual(canonical_url("http://jenkins/job/my job"), "http://jenkins/job/my%20job/")
+        self.assertEqual(canonical_url("http://jenkins/job/my%20job/"), "http://jenkins/job/my%20job/")
+        self.assertEqual(canonical_url(u"http://jenkins/job/caf\u00e9/"), "http://jenkins/job/caf%C3%A9/")
+        self.assertEqual(canonical_url("http://jenkins/job/caf%c3%a9/"), "http://jenkins/job/caf%C3%A9/")
+        self.assertEqual(canonical_url("http://jenkins/computer/(master)/"), "http://jenkins/computer/(master)/")
+        self.assertEqual(canonical_url("http://jenkins/job/a%2Fb/"), "http://jenkins/job/a%2Fb/")
+
+    def test_query_and_fragment(self):
+        self.assertEqual(canonical_url("http://jenkins/job/j1/api/python?tree=name#top"),
+                         "http://jenkins/job/j1/api/python?tree=name")
+
+    def test_canonical_host(self):
+        self.assertEqual(canonical_host("HTTP://Jenkins:80/job/j1/"), "jenkins")
+        self.assertEqual(canonical_host("https://Jenkins:8443"), "jenkins:8443")
+
+    def test_identity_url(self):
+        self.assertEqual(identity_url("HTTP://Jenkins/view/all/job/j1/"), "http://jenkins/job/j1")
+
+    def test_join_url(self):
+        self.assertEqual(join_url("http://jenkins/job/j1/", "/config.xml"), "http://jenkins/job/j1/config.xml")
+        self.assertEqual(join_url("http://jenkins/job/j1", "api/python"), "http://jenkins/job/j1/api/python")
+        self.assertEqual(join_url("http://jenkins/job/j1/"), "http://jenkins/job/j1/")
+        self.assertEqual(join_url("http://jenkins/", "job/my job"), "http://jenkins/job/my%20job")
+        self.assertEqual(join_url("http://jenkins/", u"user/j\u00f6rg"), "http://jenkins/user/j%C3%B6rg")
+        self.assertEqual(join_url("http://jenkins/computer/n1/", "/toggleOffline?offlineMessage=a%20b"),
+                         "http://jenkins/computer/n1/toggleOffline?offlineMessage=a%20b")
+
+    def test_identity_with_encoded_names(self):
+        self.assertEqual(identity_url("http://jenkins/job/my job/"), identity_url("http://jenkins/job/my%20job"))
+        self.assertEqual(identity_url(join_url("http://jenkins/", u"job/caf\u00e9")),
+                         identity_url("http://jenkins/job/caf%C3%A9/"))
+
+    def test_requesters_use_canonical_urls(self):
+        requester = DataRequester("HTTP://Jenkins:80/view/all/job/j1", None, None)
+        self.assertEqual(requester.url, "http://jenkins/job/j1/")
+        self.assertEqual(requester.clone("http://jenkins/view/v2/job/j1/").url, requester.url)
+
+
+class per_host_state_tests(unittest.TestCase):
+    def setUp(self):
+        DataRequester.clear()
+
+    def tearDown(self):
+        DataRequester.clear()
+        DataRequester.set_throttle("http://jenkins/", None)
+
+    def test_capabilities_shared_by_all_urls(self):
+        caps = Capabilities("2.60.3")
+        DataRequester.set_capabilities("http://Jenkins:80/", caps)
+
+        self.assertIs(DataRequester.get_capabilities("http://jenkins/job/j1/"), caps)
+        self.assertIs(DataRequester.get_capabilities("HTTP://JENKINS/view/all/"), caps)
+        self.assertIsNone(DataRequester.get_capabilities("http://jenkins:8080/"))
+
+    def test_throttle_shared_by_all_urls(self):
+        throttle = MagicMock()
+        DataRequester.set_throttle("http://Jenkins:80/", throttle)
+
+        self.assertIs(DataRequester.get_throttle("http://jenkins/job/j1/"), throttle)
+        DataRequester.set_throttle("http://JENKINS", None)
+        self.assertIsNone(DataRequester.get_throttle("http://Jenkins:80/"))
+
+    def test_crumb_shared_by_all_urls(self):
+        DataRequester.set_capabilities("http://Jenkins:80/", Capabilities("2.60.3", True))
+        requester = DataRequester("http://jenkins/job/j1/", None, None)
+        requester._send = MagicMock()
+        requester._send.return_value.status_code = 200
+        requester._send.return_value.text = repr({"crumbRequestField": "Jenkins-Crumb", "crumb": "abc"})
+
+        self.assertEqual(requester._get_crumb("http://Jenkins:80/job/j1/disable"), ("Jenkins-Crumb", "abc"))
+        self.assertEqual(requester._get_crumb("http://jenkins/job/j2/disable"), ("Jenkins-Crumb", "abc"))
+        self.assertEqual(requester._send.call_count, 1)
+        self.assertEqual(requester._send.call_args[0][1], "http://jenkins/crumbIssuer/api/python")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -1,5 +1,6 @@
 from pyjen.utils.user_params import JenkinsConfigParser
 from pyjen.exceptions import InvalidUserParamsError
+from pyjen.utils.throttle import READ_REQUESTS, WRITE_REQUESTS
 import unittest
 import pytest
 import os
@@ -95,6 +96,40 @@ class JenkisConfigParser_tests(unittest.TestCase):
         test_obj.readfp(sample_config)
         
         self.assertRaises(InvalidUserParamsError, test_obj.get_credentials, test_url)
+
+    def test_get_throttle_undefined(self):
+        sample_config=StringIO("[http://localhost:8080]\n" +
+                               "username=jdoe\n" +
+                               "password=Password123\n")
+        test_obj = JenkinsConfigParser()
+        test_obj.readfp(sample_config)
+
+        self.assertEqual(test_obj.get_throttle("http://localhost:8080"), None)
+        self.assertEqual(test_obj.get_throttle("http://otherhost:8080"), None)
+
+    def test_get_throttle(self):
+        sample_config=StringIO("[http://localhost:8080]\n" +
+                               "get_rate=2.5\n" +
+                               "max_in_flight_gets=4\n" +
+                               "post_rate=1\n" +
+                               "max_in_flight_posts=\n")
+        test_obj = JenkinsConfigParser()
+        test_obj.readfp(sample_config)
+
+        throttle = test_obj.get_throttle("http://localhost:8080/job/a")
+        limits = throttle._limits
+        self.assertEqual(limits[READ_REQUESTS].bucket.rate, 2.5)
+        self.assertEqual(limits[READ_REQUESTS].max_in_flight, 4)
+        self.assertEqual(limits[WRITE_REQUESTS].bucket.rate, 1.0)
+        self.assertEqual(limits[WRITE_REQUESTS].slots, None)
+
+    def test_get_throttle_invalid(self):
+        for option in ("get_rate=fast", "max_in_flight_posts=0"):
+            sample_config=StringIO("[http://localhost:8080]\n" + option + "\n")
+            test_obj = JenkinsConfigParser()
+            test_obj.readfp(sample_config)
+
+            self.assertRaises(InvalidUserParamsError, test_obj.get_throttle, "http://localhost:8080")
         
     
 if __name__ == "__main__":
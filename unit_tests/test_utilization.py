@@ -0,0 +1,127 @@
+import unittest
+import json
+import pytest
+from six import StringIO
+from mock import MagicMock, PropertyMock
+from pyjen.utilization import RingBuffer, UtilizationSeries, UtilizationSampler
+
+
+class ring_buffer_tests(unittest.TestCase):
+    def test_partial_buffer(self):
+        b = RingBuffer(5)
+        b.append(1)
+        b.append(2)
+
+        self.assertEqual(len(b), 2)
+        self.assertEqual(b.to_list(), [1, 2])
+
+    def test_wrap_around(self):
+        b = RingBuffer(3, "l")
+        for i in range(5):
+            b.append(i)
+
+        self.assertEqual(len(b), 3)
+        self.assertEqual(b.to_list(), [2, 3, 4])
+        self.assertEqual(list(b), [2, 3, 4])
+
+
+class utilization_series_tests(unittest.TestCase):
+    def setUp(self):
+        self.series = UtilizationSeries(10)
+        for busy, total in [(0, 4), (1, 4), (2, 4), (4, 4), (0, 0)]:
+            self.series.append(busy, total)
+
+    def test_ratios(self):
+        self.assertEqual(self.series.ratios, [0, 0.25, 0.5, 1, None])
+
+    def test_mean(self):
+        self.assertAlmostEqual(self.series.mean(), 0.4375)
+
+    def test_percentile(self):
+        self.assertEqual(self.series.percentile(0), 0)
+        self.assertEqual(self.series.percentile(50), 0.375)
+        self.assertEqual(self.series.percentile(100), 1)
+
+    def test_rolling_average(self):
+        self.assertEqual(self.series.rolling_average(2), [0, 0.125, 0.375, 0.75, 1])
+
+    def test_empty_series(self):
+        s = UtilizationSeries(10)
+
+        self.assertIsNone(s.mean())
+        self.assertIsNone(s.percentile(90))
+
+    def test_padding(self):
+        s = UtilizationSeries(3, 5)
+
+        self.assertEqual(s.busy, [0, 0, 0])
+        self.assertEqual(s.total, [0, 0, 0])
+
+
+class utilization_sampler_tests(unittest.TestCase):
+    def setUp(self):
+        self.mock_fleet = MagicMock()
+        self.executor_counts = PropertyMock(side_effect=[
+            {"master": (1, 2), "agent1": (0, 2)},
+            {"master": (2, 2), "agent1": (1, 2), "agent2": (1, 1)}])
+        type(self.mock_fleet).executor_counts = self.executor_counts
+        type(self.mock_fleet).labels = PropertyMock(side_effect=[
+            {"linux": ["master", "agent1"]},
+            {"linux": ["master", "agent1", "agent2"]}])
+
+    def test_sample(self):
+        s = UtilizationSampler(self.mock_fleet)
+        s.sample()
+        s.sample()
+
+        self.assertEqual(self.mock_fleet.refresh.call_count, 2)
+        self.assertEqual(len(s.timestamps), 2)
+        self.assertEqual(s.fleet.busy, [1, 4])
+        self.assertEqual(s.fleet.total, [4, 5])
+        self.assertEqual(s.nodes["master"].ratios, [0.5, 1])
+        self.assertEqual(s.nodes["agent2"].ratios, [None, 1])
+        self.assertEqual(s.labels["linux"].busy, [1, 4])
+
+    def test_offline_nodes_excluded(self):
+        type(self.mock_fleet).offline_nodes = PropertyMock(side_effect=[["agent1"], ["agent2"]])
+        s = UtilizationSampler(self.mock_fleet)
+        s.sample()
+        s.sample()
+
+        self.assertEqual(s.fleet.busy, [1, 3])
+        self.assertEqual(s.fleet.total, [2, 4])
+        self.assertEqual(s.nodes["agent1"].total, [0, 2])
+        self.assertEqual(s.nodes["agent2"].ratios, [None, None])
+        self.assertEqual(s.labels["linux"].total, [2, 4])
+
+    def test_run(self):
+        s = UtilizationSampler(self.mock_fleet, interval=0)
+        s.run(2)
+
+        self.assertEqual(len(s.timestamps), 2)
+
+    def test_to_json(self):
+        s = UtilizationSampler(self.mock_fleet)
+        s.record(self.mock_fleet, 100)
+        s.record(self.mock_fleet, 160)
+        data = json.loads(s.to_json())
+
+        self.assertEqual(data["timestamps"], [100, 160])
+        self.assertEqual(data["nodes"]["agent1"], {"busy": [0, 1], "total": [2, 2]})
+        self.assertEqual(data["labels"]["linux"]["total"], [4, 5])
+
+    def test_to_csv(self):
+        s = UtilizationSampler(self.mock_fleet)
+        s.record(self.mock_fleet, 100)
+        out = StringIO()
+        s.to_csv(out)
+        rows = out.getvalue().splitlines()
+
+        self.assertEqual(rows[0], "timestamp,kind,name,busy,total")
+        self.assertIn("100.0,node,master,1,2", rows)
+        self.assertIn("100.0,label,linux,1,4", rows)
+        self.assertIn("100.0,fleet,,1,4", rows)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -1,4 +1,5 @@
 from pyjen.view import View
+from pyjen.handles import ViewHandle
 import unittest
 import pytest
 from mock import MagicMock, PropertyMock
@@ -22,6 +23,25 @@ class view_tests(unittest.TestCase):
         self.assertEqual(mock_data_io.get_api_data.call_count, 1, 
                                 "get_api_data method should have been called one time")
 
+    def test_equality_with_view_handles(self):
+        mock_data_io = MagicMock()
+        mock_data_io.url = "http://FAKE:80/view/my view"
+        v1 = vView(mock_data_io, None)
+        other_data_io = MagicMock()
+        other_data_io.url = "http://fake/view/v2/"
+        v2 = vView(other_data_io, None)
+        h1 = ViewHandle(None, None, "my view", "http://fake/view/my%20view/")
+
+        self.assertTrue(v1 == h1)
+        self.assertTrue(h1 == v1)
+        self.assertFalse(v1 != h1)
+        self.assertFalse(h1 != v1)
+        self.assertNotEqual(v2, h1)
+        self.assertNotEqual(h1, v2)
+        self.assertEqual(hash(v1), hash(h1))
+        self.assertEqual(len(set([v1, h1, v2])), 2)
+        self.assertNotEqual(v1, "http://fake/view/my%20view/")
+
     def test_supported_types(self):
         actual_types = View.supported_types()
 
@@ -218,15 +238,60 @@ class view_tests(unittest.TestCase):
         self.assertEquals(result['unstable_jobs_count'], 1)
         self.assertEquals(v.job_count, 5)
         
-        for broken_job in result['broken_jobs']:
-            self.assertIn(broken_job.url, ['http://fake/job/b', 'http://fake/job/e'])
-        
-        for unstable_job in result['unstable_jobs']:
-            self.assertIn(unstable_job.url, ['http://fake/job/c'])
-            
-        for disabled_job in result['disabled_jobs']:
-            self.assertIn(disabled_job.url, ['http://fake/job/d'])
+        self.assertEqual(result['broken_jobs'], ['b', 'e'])
+        self.assertEqual(result['unstable_jobs'], ['c'])
+        self.assertEqual(result['disabled_jobs'], ['d'])
+        self.assertEqual(mock_data_io.clone.call_count, 0,
+                         "view metrics should not need to create any job objects")
+
+    def test_view_metrics_aggregates(self):
+        mock_data_io = MagicMock()
+        jobs = []
+        jobs.append({'name': 'a', 'color': 'blue_anime',
+                     'healthReport': [{'score': 100}, {'score': 80}],
+                     'lastBuild': {'number': 5, 'duration': 0, 'result': None, 'timestamp': 5000},
+                     'lastCompletedBuild': {'number': 4, 'duration': 2000},
+                     'lastSuccessfulBuild': {'number': 4}})
+        jobs.append({'name': 'b', 'color': 'red',
+                     'healthReport': [{'score': 20}],
+                     'lastBuild': {'number': 9, 'duration': 3000, 'result': 'FAILURE', 'timestamp': 4000},
+                     'lastCompletedBuild': {'number': 9, 'duration': 3000},
+                     'lastSuccessfulBuild': {'number': 6}})
+        jobs.append({'name': 'c', 'color': 'red_anime',
+                     'healthReport': [],
+                     'lastBuild': {'number': 2, 'duration': 1000, 'result': 'FAILURE', 'timestamp': 1000},
+                     'lastCompletedBuild': {'number': 2, 'duration': 1000},
+                     'lastSuccessfulBuild': None})
+        jobs.append({'name': 'd', 'color': 'notbuilt', 'healthReport': [],
+                     'lastBuild': None, 'lastCompletedBuild': None, 'lastSuccessfulBuild': None})
+        mock_data_io.get_api_data.return_value = {'jobs': jobs}
+
+        v = vView(mock_data_io, None)
+        result = v.view_metrics()
+
+        self.assertEqual(mock_data_io.get_api_data.call_count, 1)
+        self.assertEqual(result['job_count'], 4)
+        self.assertEqual(result['broken_jobs'], ['b', 'c'])
+        self.assertEqual(result['building_jobs'], ['a', 'c'])
+        self.assertEqual(result['not_built_jobs'], ['d'])
+        self.assertEqual(result['average_health_score'], 50)
+        self.assertEqual(result['min_health_score'], 20)
+        self.assertEqual(result['average_build_duration'], 2000)
+        self.assertEqual(result['max_build_duration'], 3000)
+        self.assertEqual(result['last_build_timestamp'], 5000)
+        self.assertEqual(result['failure_gaps'], {'b': 3, 'c': 2})
+        self.assertEqual(result['longest_failure_gap'], 3)
+
+    def test_view_metrics_without_color(self):
+        mock_data_io = MagicMock()
+        mock_data_io.get_api_data.return_value = {'jobs': [{'name': 'a', 'color': None}, {'name': 'b'}]}
+
+        v = vView(mock_data_io, None)
+        result = v.view_metrics()
 
+        self.assertEqual(result['job_count'], 2)
+        self.assertEqual(result['building_jobs'], [])
+        self.assertEqual(result['failure_gaps'], {})
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
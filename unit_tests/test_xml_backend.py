@@ -0,0 +1,98 @@
+import unittest
+import pytest
+from pyjen.utils import xmlbackend
+from pyjen.utils.jobxml import JobXML
+from pyjen.exceptions import InvalidParameterError
+
+
+class xml_backend_tests(unittest.TestCase):
+    def test_available_backends(self):
+        self.assertIn(xmlbackend.BACKEND_ELEMENTTREE, xmlbackend.available_backends())
+        self.assertIn(xmlbackend.get_backend(), xmlbackend.available_backends())
+
+    def test_set_invalid_backend(self):
+        self.assertRaises(InvalidParameterError, xmlbackend.set_backend, "NotABackend")
+
+
+class _backend_tests(object):
+    """Tests run once for every XML backend available in the current environment"""
+    backend = None
+
+    def setUp(self):
+        self._original_backend = xmlbackend.get_backend()
+        xmlbackend.set_backend(self.backend)
+        self.test_config = """<?xml version='1.0' encoding='UTF-8'?>
+        <project plugin="sample@1.0">
+          <actions/>
+          <description>Sample job</description>
+          <scm class="hudson.scm.NullSCM"/>
+          <assignedNode>linux</assignedNode>
+          <builders>
+            <hudson.tasks.Shell>
+              <command>echo hello</command>
+            </hudson.tasks.Shell>
+          </builders>
+          <publishers/>
+        </project>
+        """
+
+    def tearDown(self):
+        xmlbackend.set_backend(self._original_backend)
+
+    def test_active_backend(self):
+        self.assertEqual(xmlbackend.get_backend(), self.backend)
+
+    def test_round_trip(self):
+        root = xmlbackend.fromstring(self.test_config)
+        node = xmlbackend.SubElement(root, "customWorkspace")
+        node.text = "some/path"
+        actual = xmlbackend.tostring(root)
+
+        self.assertIn("<customWorkspace>some/path</customWorkspace>", actual)
+        self.assertIn("<command>echo hello</command>", actual)
+
+    def test_parse_root(self):
+        root = xmlbackend.parse_root(self.test_config)
+
+        self.assertEqual(root.tag, "project")
+        self.assertEqual(root.attrib["plugin"], "sample@1.0")
+
+    def test_parse_root_bytes(self):
+        root = xmlbackend.parse_root(self.test_config.strip().encode("utf-8"))
+
+        self.assertEqual(root.tag, "project")
+
+    def test_extract_elements(self):
+        root = xmlbackend.extract_elements(self.test_config, ["scm", "assignedNode"])
+
+        children = [child.tag for child in root]
+        self.assertEqual(children, ["scm", "assignedNode"])
+        self.assertEqual(root.find("scm").attrib["class"], "hudson.scm.NullSCM")
+        self.assertEqual(root.find("assignedNode").text, "linux")
+
+    def test_extract_missing_element(self):
+        root = xmlbackend.extract_elements(self.test_config, ["customWorkspace", "builders"])
+
+        self.assertIsNone(root.find("customWorkspace"))
+        self.assertEqual(root.find("builders/hudson.tasks.Shell/command").text, "echo hello")
+
+    def test_partial_job_xml(self):
+        j = JobXML.partial(self.test_config, ["assignedNode"])
+
+        self.assertEqual(j.assigned_node, "linux")
+        self.assertEqual(j.custom_workspace, "")
+
+    def test_partial_job_xml_export(self):
+        j = JobXML.partial(self.test_config, ["assignedNode"])
+
+        with self.assertRaises(AssertionError):
+            j.XML
+
+
+for _backend_name in xmlbackend.available_backends():
+    _class_name = "xml_backend_{0}_tests".format(_backend_name)
+    globals()[_class_name] = type(_class_name, (_backend_tests, unittest.TestCase), {"backend": _backend_name})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])